@@ -5,3 +5,6 @@ class ProgramCategoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.category'
     verbose_name = 'Categories'
+
+    def ready(self):
+        import apps.category.receivers
@@ -1,6 +1,7 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from . import models
+from ..search.services import SearchService
 
 """
  ============================================================== 
@@ -13,3 +14,23 @@ from . import models
 def create_category_notification(sender, instance, created, **kwargs):
     pass
 
+
+
+"""
+ ==============================================================
+     Django Receiver for Search
+ ==============================================================
+"""
+
+
+@receiver(post_save, sender=models.Category)
+def receiver_category_saved(sender, instance, created, **kwargs):
+    """
+    Keep the category name in the autocomplete table while it is active.
+    """
+    SearchService.index_category(instance)
+
+
+@receiver(post_delete, sender=models.Category)
+def receiver_category_deleted(sender, instance, **kwargs):
+    SearchService.remove_category(instance.id)
@@ -1,4 +1,4 @@
-import threading
+from contextvars import ContextVar
 
 import pytz
 from django.conf import settings
@@ -10,7 +10,13 @@ from django.utils.functional import SimpleLazyObject
 from rest_framework.request import Request
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
-thread_locals = threading.local()
+# Request being served in the current context; a ContextVar stays correct
+# under ASGI, where one thread serves many requests and one request may hop threads.
+current_request: ContextVar = ContextVar("current_request", default=None)
+
+
+def get_current_request():
+    return current_request.get()
 
 
 def get_user_jwt(request):
@@ -81,11 +87,15 @@ class TimezoneMiddleware(MiddlewareMixin):
 
 class RequestMiddleware(MiddlewareMixin):
     """
-    Middleware to set the request in the thread-local variable
+    Middleware to set the request in the `current_request` context variable
     """
 
     def process_request(self, request):
-        thread_locals.request = request
+        current_request.set(request)
+
+    def process_response(self, request, response):
+        current_request.set(None)
+        return response
 
 
 class ForceDefaultLanguagePrefixMiddleware:
@@ -0,0 +1,19 @@
+# Generated by Django 4.1.4 on 2026-10-18 14:30
+
+import apps.search.modelfields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('episode', '0005_episode_normalized_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='episode',
+            name='plain_body',
+            field=apps.search.modelfields.PlainTextField(blank=True, default='', editable=False),
+        ),
+    ]
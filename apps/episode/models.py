@@ -6,6 +6,7 @@ from ..core.utils import slug
 from ..core.utils.slug import slugify
 from ..program import EpisodeMediaTypeChoices
 from ..program import modelfields as program_modelfields
+from ..search import markup, modelfields as search_modelfields, normalization
 
 from ..tag import models as tag_models
 from ..tag import modelfields as tag_modelfields
@@ -31,6 +32,11 @@ class Episode(core_models.CommonModel, core_models.TrackedModel,core_models.Acti
     seo_description = models.CharField(max_length=512, blank=True)
 
     tags = tag_modelfields.TagsField(blank=True)
+    search_vector = search_modelfields.SearchVectorField()
+    search_title = search_modelfields.NormalizedTextField()
+    search_summary = search_modelfields.NormalizedTextField()
+    search_body = search_modelfields.NormalizedTextField()
+    plain_body = search_modelfields.PlainTextField()
 
     objects = managers.BaseEpisodeManager()
 
@@ -44,6 +50,14 @@ class Episode(core_models.CommonModel, core_models.TrackedModel,core_models.Acti
     def save(self, *args, **kwargs):
         if not self.slug and self.title:
             self.slug = slug.slugify(self, 'title')
+        update_fields = normalization.normalize_fields(
+            self, normalization.EPISODE_PLAIN_FIELDS, kwargs.get('update_fields'), transform=markup.strip_markup
+        )
+        update_fields = normalization.normalize_fields(
+            self, normalization.EPISODE_NORMALIZED_FIELDS, update_fields
+        )
+        if update_fields is not None:
+            kwargs['update_fields'] = update_fields
         super().save(*args, **kwargs)
 
 
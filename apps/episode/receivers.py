@@ -20,15 +20,12 @@ def receiver_episode_saved(sender, instance: models.Episode, created, **kwargs):
     """
     Whenever an episode is created or updated:
       - Recompute program.episodes_count
-      - Update search index (or remove if not active/published)
+      - Update search index (or remove if not active/published), after commit
     """
     program = instance.program
     _recompute_program_episodes_count(program)
 
-    if instance.is_active and instance.is_published:
-        SearchService.index_episode(instance)
-    else:
-        SearchService.remove_episode(instance.id)
+    SearchService.schedule_episode(instance.id)
 
 
 @receiver(post_delete, sender=models.Episode)
@@ -36,8 +33,8 @@ def receiver_episode_deleted(sender, instance: models.Episode, **kwargs):
     """
     When an episode is hard-deleted:
       - Recompute program.episodes_count
-      - Remove from search index
+      - Remove from search index (after commit)
     """
     program = instance.program
     _recompute_program_episodes_count(program)
-    SearchService.remove_episode(instance.id)
\ No newline at end of file
+    SearchService.schedule_episode(instance.id)
\ No newline at end of file
@@ -2,6 +2,8 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters as rest_filters
 
 from ...core import viewsets, mixins as core_mixins
+from ...program import SearchEntityChoices
+from ...search.related import get_related
 from .. import models, serializers, permissions, filters
 
 
@@ -44,7 +46,8 @@ class PublicEpisodeViewSet(viewsets.ReadOnlyModelViewSet):
 
     def retrieve(self, request, *args, **kwargs):
         """
-        Add previous/next episode ids for UX.
+        Add previous/next episode ids for UX, and the precomputed
+        related episodes/programs (see `apps.search.related`).
         """
         response = super().retrieve(request, *args, **kwargs)
         episode = self.get_object()
@@ -56,5 +59,6 @@ class PublicEpisodeViewSet(viewsets.ReadOnlyModelViewSet):
         data = response.data
         data['previous_episode_id'] = getattr(prev_episode, 'id', None)
         data['next_episode_id'] = getattr(next_episode, 'id', None)
+        data['related_episodes'], data['related_programs'] = get_related(SearchEntityChoices.EPISODE, episode.pk)
         response.data = data
         return response
\ No newline at end of file
@@ -0,0 +1,76 @@
+from ..core.app_settings import AppSettings
+
+
+class AppSettings(AppSettings):
+    """
+    This class is used to return values from the project's settings file.
+    If this value does not exist, a default value is assigned.
+    """
+
+    @property
+    def IMPORTER_SYSTEM_USERNAME(self):
+        """
+        User background imports run as; the oldest active admin when not set.
+        """
+        return self._setting("IMPORTER_SYSTEM_USERNAME", None)
+
+    @property
+    def IMPORTER_YOUTUBE_SOURCE_CODE(self):
+        """
+        Code of the ContentSource (system "youtube") videos found by external search are imported under.
+        Its `config` may set `category_id` (required to create channel programs),
+        `language`, `program_type` and `publish`.
+        """
+        return self._setting("IMPORTER_YOUTUBE_SOURCE_CODE", "youtube")
+
+    @property
+    def IMPORTER_BULK_CHUNK_SIZE(self):
+        """
+        Programs plus episodes validated and written together (one transaction) by the bulk import.
+        """
+        return self._setting("IMPORTER_BULK_CHUNK_SIZE", 500)
+
+    @property
+    def IMPORTER_JOB_MAX_FAILURES(self):
+        """
+        Failed row reports kept on an ImportJob; further failures are only counted.
+        """
+        return self._setting("IMPORTER_JOB_MAX_FAILURES", 1000)
+
+    @property
+    def IMPORTER_RSS_WORKERS(self):
+        """
+        RSS sources polled at the same time (threads of the poller).
+        """
+        return self._setting("IMPORTER_RSS_WORKERS", 4)
+
+    @property
+    def IMPORTER_RSS_TIMEOUT(self):
+        """
+        Connect/read timeout, in seconds, of a feed request.
+        """
+        return self._setting("IMPORTER_RSS_TIMEOUT", 30)
+
+    @property
+    def IMPORTER_YOUTUBE_WORKERS(self):
+        """
+        YouTube sources walked at the same time (see `apps.importer.youtube`).
+        """
+        return self._setting("IMPORTER_YOUTUBE_WORKERS", 2)
+
+    @property
+    def IMPORTER_YOUTUBE_RATE_LIMIT(self):
+        """
+        SerpApi listing calls per second, all YouTube sources together (0: no limit).
+        """
+        return self._setting("IMPORTER_YOUTUBE_RATE_LIMIT", 1.0)
+
+    @property
+    def IMPORTER_YOUTUBE_MAX_PAGES(self):
+        """
+        Listing pages walked per source and run; the next run resumes from the stored page token.
+        """
+        return self._setting("IMPORTER_YOUTUBE_MAX_PAGES", 20)
+
+
+app_settings = AppSettings()
@@ -0,0 +1,574 @@
+# apps/importer/bulk.py
+import codecs
+import json
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from django.db import DatabaseError, transaction
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.text import slugify as django_slugify
+
+from . import models, serializers
+from .app_settings import app_settings
+from ..category import models as category_models
+from ..category.permissions import CategoryAccessPolicy
+from ..core.utils.slug import random_string
+from ..episode.models import Episode
+from ..program.models import Program
+from ..search import markup, normalization
+from ..search.services import SearchService
+from ..tag.models import Tag
+from .services import is_unchanged, payload_hash
+
+logger = logging.getLogger(__name__)
+
+CREATED = "created"
+UPDATED = "updated"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+PROGRAM = models.ImportRecord.PROGRAM
+EPISODE = models.ImportRecord.EPISODE
+
+# Keys of a row that are not Program/Episode fields (flat rows).
+PROGRAM_META_KEYS = {"source_code", "source", "external_id", "program", "episodes"}
+EPISODE_META_KEYS = {"external_id", "episode"}
+
+WRITE_BATCH_SIZE = 500
+
+REQUIRED = "This field is required."
+
+
+class RowError(NamedTuple):
+    """
+    A row of the input that could not even be parsed.
+    """
+    error: str
+
+
+def iter_ndjson(lines: Iterable) -> Iterator[Any]:
+    """
+    Rows of an NDJSON stream, one JSON document per line, blank lines skipped.
+    Lines that are not valid JSON come out as RowError, so they are reported
+    instead of failing the whole import.
+    """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            yield RowError(f"Invalid JSON: {exc}")
+
+
+def truncated(exc: ValueError, buffer: str) -> bool:
+    """
+    Whether a decoding error may come from an element that goes on past the
+    end of `buffer` (an open string, or a literal or number cut short).
+    """
+    if not isinstance(exc, json.JSONDecodeError):
+        return True
+    return exc.pos >= len(buffer) - 10 or exc.msg.startswith("Unterminated string")
+
+
+def iter_json_array(stream, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Elements of a JSON array read from a binary `stream` one at a time, so
+    only the element being decoded (plus one chunk) is held in memory.
+    Anything that is not a well-formed array stops the rows with a RowError.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer, position, eof = "", 0, False
+    expected = "["
+
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        if eof:
+            return False
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + utf8.decode(chunk or b"", final=eof)
+        position = 0
+        return True
+
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if position >= len(buffer):
+            if fill():
+                continue
+            yield RowError("Invalid JSON: unexpected end of the array.")
+            return
+
+        char = buffer[position]
+        if expected == "[":
+            if char != "[":
+                yield RowError("Invalid JSON: expected an array of rows.")
+                return
+            position += 1
+            expected = "value or ]"
+        elif char == "]" and expected != "value":
+            return
+        elif expected == ", or ]":
+            if char != ",":
+                yield RowError("Invalid JSON: expected ',' or ']' between rows.")
+                return
+            position += 1
+            expected = "value"
+        else:
+            try:
+                row, end = decoder.raw_decode(buffer, position)
+            except ValueError as exc:
+                # Only an element cut by the end of the buffer is worth more input: a
+                # syntax error further up is reported now, not after reading the rest.
+                if truncated(exc, buffer) and fill():
+                    continue
+                yield RowError(f"Invalid JSON: {exc}")
+                return
+            # A number may go on in the next chunk ("12" + "3", "1" + ".5"): decode it again with more input.
+            cut = end >= len(buffer) or (isinstance(row, (int, float)) and buffer[end] in ".eE")
+            if cut and fill():
+                continue
+            position = end
+            expected = ", or ]"
+            yield row
+
+
+class Entry:
+    """
+    One program or episode of the input on its way through a chunk.
+    """
+
+    def __init__(self, row: int, entity_type: str, source_code, external_id, data, parent: "Entry" = None):
+        self.row = row
+        self.entity_type = entity_type
+        self.source_code = source_code
+        self.external_id = None if external_id in (None, "") else str(external_id)
+        self.data = data
+        self.parent = parent
+        self.source: Optional[models.ContentSource] = None
+        self.record: Optional[models.ImportRecord] = None
+        self.instance = None
+        self.validated: Optional[Dict[str, Any]] = None
+        self.tags: Optional[List] = None
+        self.payload_hash = ""
+        self.errors: Optional[Dict[str, Any]] = None
+        self.status: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.errors is None
+
+    @property
+    def pending(self) -> bool:
+        """
+        Valid so far and still to be written (not failed nor skipped).
+        """
+        return self.ok and self.status != SKIPPED
+
+    def fail(self, errors: Dict[str, Any]) -> None:
+        self.errors = errors
+        self.status = FAILED
+
+    def report(self) -> Dict[str, Any]:
+        report = {
+            "row": self.row,
+            "entity_type": self.entity_type,
+            "external_id": self.external_id,
+            "status": self.status if self.ok else FAILED,
+            "id": str(self.instance.pk) if self.ok and self.instance is not None else None,
+        }
+        if not self.ok:
+            report["errors"] = self.errors
+        return report
+
+
+def summarize(reports: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    counts = Counter(report["status"] for report in reports)
+    return {status: counts.get(status, 0) for status in (CREATED, UPDATED, SKIPPED, FAILED)}
+
+
+def imported_episode_numbers(source: models.ContentSource) -> Dict[str, int]:
+    """
+    Episode number of every episode imported from `source`, by external id.
+    Importers resend them so the payload (and its hash) of a known episode stays the same.
+    """
+    return dict(
+        models.ImportRecord.objects.filter(source=source, entity_type=EPISODE, episode__isnull=False)
+        .values_list("external_id", "episode__episode_number")
+    )
+
+
+def assign_slugs(model, objects: List) -> None:
+    """
+    Unique slugs for new rows, checked against the table in one query
+    (`core.utils.slug.slugify` costs one query per row).
+    """
+    bases = [django_slugify(obj.title or "", allow_unicode=True)[:240] or random_string() for obj in objects]
+    taken = set(model.objects.filter(slug__in=set(bases)).values_list("slug", flat=True))
+    for obj, base in zip(objects, bases):
+        slug = base
+        while slug in taken:
+            slug = f"{base}-{random_string()}"
+        taken.add(slug)
+        obj.slug = slug
+
+
+def fill_search_columns(instance, normalized_fields: Dict[str, str], plain_fields: Dict[str, str]) -> None:
+    # What Program.save()/Episode.save() do, since bulk writes skip save().
+    normalization.normalize_fields(instance, plain_fields, transform=markup.strip_markup)
+    normalization.normalize_fields(instance, normalized_fields)
+
+
+class BulkImporter:
+    """
+    Set-based import of programs with nested episodes.
+
+    Rows are processed in chunks of about IMPORTER_BULK_CHUNK_SIZE entities
+    (a program and each of its episodes count one):
+
+    - the ImportRecords of the whole chunk are read with one query per
+      entity type, then the linked programs and episodes with one in_bulk each;
+    - rows whose payload hash matches their record's (see
+      `services.payload_hash`) are reported skipped and go no further;
+    - every other row is validated in memory (`BulkProgramSerializer`,
+      `BulkEpisodeSerializer`); categories and tags are checked for the
+      whole chunk at once;
+    - valid rows are written with chunked bulk_create/bulk_update in one
+      transaction per chunk, followed by their records, tags, the
+      episodes_count of the programs touched and the search index updates
+      that save() and the signal receivers would otherwise do row by row.
+
+    A failing row never stops the import: it is reported with its errors,
+    and the episodes of a failed program fail with it.
+    """
+
+    def __init__(self, request, source_code: Optional[str] = None, chunk_size: Optional[int] = None):
+        self.request = request
+        self.user = request.user
+        self.source_code = source_code
+        self.chunk_size = chunk_size or app_settings.IMPORTER_BULK_CHUNK_SIZE
+        self._sources: Dict[str, models.ContentSource] = {}
+
+    def chunks(self, rows: Iterable[Any], start: int = 1) -> Iterator[List[Tuple[int, Any]]]:
+        """
+        `rows` numbered from `start`, grouped in chunks of about `chunk_size` entities.
+        """
+        chunk: List[Tuple[int, Any]] = []
+        size = 0
+        for number, row in enumerate(rows, start=start):
+            chunk.append((number, row))
+            episodes = row.get("episodes") if isinstance(row, dict) else None
+            size += 1 + (len(episodes) if isinstance(episodes, list) else 0)
+            if size >= self.chunk_size:
+                yield chunk
+                chunk, size = [], 0
+        if chunk:
+            yield chunk
+
+    def run(self, rows: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Import `rows` (program rows, see `parse`) and yield the report of every
+        program and episode, in input order, chunk after chunk.
+        """
+        for chunk in self.chunks(rows):
+            yield from self.import_chunk(chunk)
+
+    def import_chunk(self, rows: List[Tuple[int, Any]]) -> List[Dict[str, Any]]:
+        entries = self.parse(rows)
+        self.resolve_sources(entries)
+        self.load_existing(entries, PROGRAM, Program)
+        self.load_existing(entries, EPISODE, Episode)
+        self.skip_unchanged(entries)
+        self.validate(entries)
+        self.write([entry for entry in entries if entry.pending])
+        return [entry.report() for entry in entries]
+
+    def parse(self, rows: List[Tuple[int, Any]]) -> List[Entry]:
+        """
+        A row is a program, nested under "program" or as flat fields, with
+        its "source_code" (default: the importer's) and "external_id", and
+        an optional "episodes" list of episodes shaped the same way.
+        """
+        entries = []
+        seen = set()
+
+        def check_ids(entry: Entry) -> Dict[str, List[str]]:
+            errors = {}
+            if not entry.source_code:
+                errors["source_code"] = [REQUIRED]
+            elif len(str(entry.source_code)) > 50:
+                errors["source_code"] = ["Ensure this field has no more than 50 characters."]
+            if not entry.external_id:
+                errors["external_id"] = [REQUIRED]
+            elif len(entry.external_id) > 255:
+                errors["external_id"] = ["Ensure this field has no more than 255 characters."]
+            elif (entry.source_code, entry.entity_type, entry.external_id) in seen:
+                errors["external_id"] = ["Duplicated in the same chunk of the import."]
+            seen.add((entry.source_code, entry.entity_type, entry.external_id))
+            return errors
+
+        for number, row in rows:
+            if isinstance(row, RowError) or not isinstance(row, dict):
+                entry = Entry(number, PROGRAM, None, None, {})
+                entry.fail({"row": [row.error if isinstance(row, RowError) else "Expected a JSON object."]})
+                entries.append(entry)
+                continue
+
+            source_code = row.get("source_code") or row.get("source") or self.source_code
+            if isinstance(row.get("program"), dict):
+                data = row["program"]
+            else:
+                data = {key: value for key, value in row.items() if key not in PROGRAM_META_KEYS}
+            program = Entry(number, PROGRAM, source_code, row.get("external_id"), data)
+            errors = check_ids(program)
+
+            episodes = row.get("episodes") or []
+            if not isinstance(episodes, list):
+                errors["episodes"] = ["Expected a list of episodes."]
+                episodes = []
+            if errors:
+                program.fail(errors)
+            entries.append(program)
+
+            for item in episodes:
+                if not isinstance(item, dict):
+                    episode = Entry(number, EPISODE, source_code, None, {}, parent=program)
+                    episode.fail({"episode": ["Expected a JSON object."]})
+                    entries.append(episode)
+                    continue
+                if isinstance(item.get("episode"), dict):
+                    data = item["episode"]
+                else:
+                    data = {key: value for key, value in item.items() if key not in EPISODE_META_KEYS}
+                episode = Entry(number, EPISODE, source_code, item.get("external_id"), data, parent=program)
+                errors = check_ids(episode)
+                if errors:
+                    episode.fail(errors)
+                entries.append(episode)
+
+        return entries
+
+    def resolve_sources(self, entries: List[Entry]) -> None:
+        codes = {entry.source_code for entry in entries if entry.ok} - set(self._sources)
+        if codes:
+            models.ContentSource.objects.bulk_create(
+                [models.ContentSource(code=code, name=code, system="other") for code in codes],
+                ignore_conflicts=True,
+            )
+            self._sources.update(
+                (source.code, source) for source in models.ContentSource.objects.filter(code__in=codes)
+            )
+        for entry in entries:
+            if entry.ok:
+                entry.source = self._sources[entry.source_code]
+
+    def load_existing(self, entries: List[Entry], entity_type: str, model) -> None:
+        """
+        Attach the ImportRecord and the linked object of every entry of `entity_type`.
+        """
+        entries = [entry for entry in entries if entry.ok and entry.entity_type == entity_type]
+        if not entries:
+            return
+
+        records = models.ImportRecord.objects.filter(
+            entity_type=entity_type,
+            source__in={entry.source.pk for entry in entries},
+            external_id__in={entry.external_id for entry in entries},
+        )
+        by_key = {(record.source_id, record.external_id): record for record in records}
+        field = f"{entity_type}_id"
+        instances = model.objects.in_bulk([getattr(record, field) for record in by_key.values() if getattr(record, field)])
+
+        for entry in entries:
+            entry.record = by_key.get((entry.source.pk, entry.external_id))
+            if entry.record is not None:
+                entry.instance = instances.get(getattr(entry.record, field))
+
+    def skip_unchanged(self, entries: List[Entry]) -> None:
+        """
+        Hash the payloads (an episode's with the id of its program, as
+        `ImportService.import_episode` does) and skip the unchanged ones.
+        """
+        for entry in entries:
+            if not entry.ok:
+                continue
+            if entry.entity_type == PROGRAM:
+                entry.payload_hash = payload_hash(entry.data)
+            elif entry.parent.instance is not None:
+                entry.payload_hash = payload_hash(dict(entry.data, program=str(entry.parent.instance.pk)))
+            else:
+                # New program: hashed once it has an id, see `save_records`.
+                continue
+            if entry.record is not None and is_unchanged(entry.record, entry.entity_type, entry.payload_hash):
+                entry.status = SKIPPED
+
+    def validate(self, entries: List[Entry]) -> None:
+        for entry in entries:
+            if entry.pending and entry.entity_type == PROGRAM:
+                self.validate_entry(entry, serializers.BulkProgramSerializer)
+        for entry in entries:
+            if entry.pending and entry.entity_type == EPISODE:
+                if not entry.parent.ok:
+                    entry.fail({"program": ["The program of this row was not imported."]})
+                else:
+                    self.validate_entry(entry, serializers.BulkEpisodeSerializer)
+
+        self.check_categories([entry for entry in entries if entry.pending and entry.entity_type == PROGRAM])
+        self.check_tags([entry for entry in entries if entry.pending and entry.tags])
+        for entry in entries:
+            if entry.pending and entry.parent is not None and not entry.parent.ok:
+                entry.fail({"program": ["The program of this row was not imported."]})
+
+    def validate_entry(self, entry: Entry, serializer_class) -> None:
+        serializer = serializer_class(data=entry.data, partial=entry.instance is not None)
+        if not serializer.is_valid():
+            entry.fail(serializer.errors)
+            return
+        entry.validated = dict(serializer.validated_data)
+        entry.tags = entry.validated.pop("tags", None)
+
+    def check_categories(self, entries: List[Entry]) -> None:
+        ids = {entry.validated["category_id"] for entry in entries if "category_id" in entry.validated}
+        if not ids:
+            return
+        categories = CategoryAccessPolicy.scope_queryset(self.request, category_models.Category.objects.all())
+        allowed = set(categories.filter(pk__in=ids).values_list("pk", flat=True))
+        for entry in entries:
+            category_id = entry.validated.get("category_id")
+            if category_id is not None and category_id not in allowed:
+                entry.fail({"category_id": [f'Invalid pk "{category_id}" - object does not exist.']})
+
+    def check_tags(self, entries: List[Entry]) -> None:
+        ids = {tag for entry in entries for tag in entry.tags}
+        if not ids:
+            return
+        allowed = set(Tag.activated_objects.filter(pk__in=ids).values_list("pk", flat=True))
+        for entry in entries:
+            unknown = [str(tag) for tag in entry.tags if tag not in allowed]
+            if unknown:
+                entry.fail({"tags": [f'Invalid pk "{tag}" - object does not exist.' for tag in unknown]})
+
+    def write(self, entries: List[Entry]) -> None:
+        if not entries:
+            return
+
+        programs = [entry for entry in entries if entry.entity_type == PROGRAM]
+        episodes = [entry for entry in entries if entry.entity_type == EPISODE]
+        try:
+            with transaction.atomic():
+                self.save_objects(
+                    programs, Program,
+                    normalization.PROGRAM_NORMALIZED_FIELDS, normalization.PROGRAM_PLAIN_FIELDS,
+                )
+                for entry in episodes:
+                    entry.validated["program_id"] = entry.parent.instance.pk
+                self.save_objects(
+                    episodes, Episode,
+                    normalization.EPISODE_NORMALIZED_FIELDS, normalization.EPISODE_PLAIN_FIELDS,
+                )
+                self.save_records(entries)
+                self.save_tags(programs, Program.tags.through, "program_id")
+                self.save_tags(episodes, Episode.tags.through, "episode_id")
+                self.update_episodes_count({entry.instance.program_id for entry in episodes})
+
+                for entry in programs:
+                    SearchService.schedule_program(entry.instance.pk)
+                for entry in episodes:
+                    SearchService.schedule_episode(entry.instance.pk)
+        except DatabaseError as exc:
+            logger.exception("Bulk import chunk of %d entities rolled back.", len(entries))
+            for entry in entries:
+                entry.instance = None
+                entry.fail({"non_field_errors": [f"Database error, chunk rolled back: {exc}"]})
+
+    def save_objects(self, entries: List[Entry], model, normalized_fields, plain_fields) -> None:
+        now = timezone.now()
+        created, updated = [], []
+        update_fields = {"updated_by", "updated_at", *normalized_fields, *plain_fields}
+
+        for entry in entries:
+            if entry.instance is None:
+                entry.instance = model(created_by=self.user, **entry.validated)
+                entry.status = CREATED
+                created.append(entry.instance)
+            else:
+                for name, value in entry.validated.items():
+                    setattr(entry.instance, name, value)
+                    update_fields.add(name[:-3] if name.endswith("_id") else name)
+                entry.instance.updated_by = self.user
+                entry.instance.updated_at = now
+                entry.status = UPDATED
+                updated.append(entry.instance)
+            fill_search_columns(entry.instance, normalized_fields, plain_fields)
+
+        assign_slugs(model, created)
+        model.objects.bulk_create(created, batch_size=WRITE_BATCH_SIZE)
+        if updated:
+            model.objects.bulk_update(updated, sorted(update_fields), batch_size=WRITE_BATCH_SIZE)
+
+    def save_records(self, entries: List[Entry]) -> None:
+        now = timezone.now()
+        created, changed = [], []
+        for entry in entries:
+            field = entry.entity_type
+            record = entry.record
+            if field == EPISODE:
+                entry.payload_hash = payload_hash(dict(entry.data, program=str(entry.instance.program_id)))
+            if record is None:
+                created.append(models.ImportRecord(
+                    source=entry.source,
+                    entity_type=entry.entity_type,
+                    external_id=entry.external_id,
+                    status=models.ImportRecord.SUCCESS,
+                    payload_hash=entry.payload_hash,
+                    **{field: entry.instance},
+                ))
+            else:
+                setattr(record, field, entry.instance)
+                record.status = models.ImportRecord.SUCCESS
+                record.last_error = ""
+                record.payload_hash = entry.payload_hash
+                record.updated_at = now
+                changed.append(record)
+
+        models.ImportRecord.objects.bulk_create(created, batch_size=WRITE_BATCH_SIZE)
+        models.ImportRecord.objects.bulk_update(
+            changed,
+            ["program", "episode", "status", "last_error", "payload_hash", "updated_at"],
+            batch_size=WRITE_BATCH_SIZE,
+        )
+
+    def save_tags(self, entries: List[Entry], through, owner_field: str) -> None:
+        entries = [entry for entry in entries if entry.tags is not None]
+        if not entries:
+            return
+        updated = [entry.instance.pk for entry in entries if entry.status == UPDATED]
+        if updated:
+            through.objects.filter(**{f"{owner_field}__in": updated}).delete()
+        through.objects.bulk_create(
+            [through(**{owner_field: entry.instance.pk, "tag_id": tag}) for entry in entries for tag in entry.tags],
+            batch_size=WRITE_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+    def update_episodes_count(self, program_ids) -> None:
+        if not program_ids:
+            return
+        counts = dict(
+            Episode.objects.filter(program_id__in=program_ids, is_active=True)
+            .values("program_id")
+            .annotate(count=Count("id"))
+            .values_list("program_id", "count")
+        )
+        Program.objects.bulk_update(
+            [Program(pk=pk, episodes_count=counts.get(pk, 0)) for pk in program_ids],
+            ["episodes_count"],
+            batch_size=WRITE_BATCH_SIZE,
+        )
@@ -0,0 +1,149 @@
+# apps/importer/jobs.py
+import json
+import logging
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import models
+from .app_settings import app_settings
+from .bulk import CREATED, FAILED, SKIPPED, UPDATED, BulkImporter, iter_json_array, iter_ndjson
+from .services import system_request
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def submit_job(*, user, rows: Optional[List[Any]] = None, file=None, source_code: str = "") -> models.ImportJob:
+    """
+    Store the payload (`rows`, or an uploaded JSON array / NDJSON `file`)
+    on a new ImportJob and queue it once the job is committed.
+    """
+    from .tasks import process_import_job
+
+    total_rows = None
+    if file is None:
+        content = "\n".join(json.dumps(row, ensure_ascii=False) for row in rows)
+        file = ContentFile(content.encode("utf-8"), name="rows.ndjson")
+        total_rows = len(rows)
+
+    job = models.ImportJob(created_by=user, source_code=source_code or "", total_rows=total_rows)
+    job.payload.save(file.name or "rows.ndjson", file, save=False)
+    job.save()
+    transaction.on_commit(lambda: process_import_job.delay(str(job.pk)))
+    return job
+
+
+def cancel_job(job: models.ImportJob) -> bool:
+    """
+    Mark a pending or running job cancelled; the worker stops before its next chunk.
+    Chunks already written stay imported.
+    """
+    cancelled = models.ImportJob.objects.filter(
+        pk=job.pk, status__in=(models.ImportJob.PENDING, models.ImportJob.RUNNING)
+    ).update(status=models.ImportJob.CANCELLED, finished_at=timezone.now())
+    job.refresh_from_db()
+    return bool(cancelled)
+
+
+def is_json_array(payload) -> bool:
+    head = payload.read(1024).lstrip()
+    payload.seek(0)
+    return head.startswith(b"[")
+
+
+def read_rows(job: models.ImportJob) -> Iterator[Any]:
+    """
+    Rows of the payload, streamed: a JSON array element by element, NDJSON
+    line by line. Memory stays flat whatever the size of the payload.
+    """
+    with job.payload.open("rb") as payload:
+        if is_json_array(payload):
+            yield from iter_json_array(payload)
+        else:
+            yield from iter_ndjson(payload)
+
+
+def count_rows(job: models.ImportJob) -> int:
+    """
+    Rows of an uploaded payload (rows posted as JSON are counted at submit).
+    NDJSON lines are counted without being decoded; a JSON array is walked
+    once more by the streaming reader.
+    """
+    with job.payload.open("rb") as payload:
+        if is_json_array(payload):
+            return sum(1 for _ in iter_json_array(payload))
+        return sum(1 for line in payload if line.strip())
+
+
+def save_progress(job: models.ImportJob, chunk_rows: int, reports: Iterable[Dict[str, Any]], failures: List) -> None:
+    counts = {CREATED: 0, UPDATED: 0, SKIPPED: 0, FAILED: 0}
+    for report in reports:
+        counts[report["status"]] += 1
+        if report["status"] == FAILED and len(failures) < app_settings.IMPORTER_JOB_MAX_FAILURES:
+            failures.append(report)
+
+    jobs = models.ImportJob.objects.filter(pk=job.pk)
+    jobs.update(
+        processed_rows=F("processed_rows") + chunk_rows,
+        created_count=F("created_count") + counts[CREATED],
+        updated_count=F("updated_count") + counts[UPDATED],
+        skipped_count=F("skipped_count") + counts[SKIPPED],
+        failed_count=F("failed_count") + counts[FAILED],
+        failures=failures,
+        updated_at=timezone.now(),
+    )
+    # The chunk is committed either way; only the next one is skipped.
+    if jobs.filter(status=models.ImportJob.CANCELLED).exists():
+        raise JobCancelled()
+
+
+def finish_job(job: models.ImportJob, status: str, error: str = "") -> None:
+    models.ImportJob.objects.filter(pk=job.pk, status=models.ImportJob.RUNNING).update(
+        status=status, last_error=error, finished_at=timezone.now(), updated_at=timezone.now()
+    )
+
+
+def run_job(job_id) -> Optional[models.ImportJob]:
+    """
+    Import the payload of a job chunk by chunk (see `BulkImporter`),
+    saving the counters after every chunk. A job picked up again after a
+    worker died resumes after its `processed_rows`.
+    """
+    job = models.ImportJob.objects.select_related("created_by").filter(pk=job_id).first()
+    if job is None or job.is_finished:
+        return job
+
+    started = models.ImportJob.objects.filter(
+        pk=job.pk, status__in=(models.ImportJob.PENDING, models.ImportJob.RUNNING)
+    ).update(status=models.ImportJob.RUNNING, started_at=job.started_at or timezone.now())
+    if not started:
+        return job
+
+    try:
+        if job.total_rows is None:
+            job.total_rows = count_rows(job)
+            models.ImportJob.objects.filter(pk=job.pk).update(total_rows=job.total_rows)
+
+        importer = BulkImporter(system_request(user=job.created_by), source_code=job.source_code or None)
+        failures = list(job.failures)
+        rows = islice(read_rows(job), job.processed_rows, None)
+        for chunk in importer.chunks(rows, start=job.processed_rows + 1):
+            save_progress(job, len(chunk), importer.import_chunk(chunk), failures)
+    except JobCancelled:
+        logger.info("Import job %s cancelled.", job.pk)
+    except Exception as exc:
+        logger.exception("Import job %s failed.", job.pk)
+        finish_job(job, models.ImportJob.FAILED, error=str(exc))
+    else:
+        finish_job(job, models.ImportJob.COMPLETED)
+
+    job.refresh_from_db()
+    return job
@@ -0,0 +1,46 @@
+# Generated by Django 4.1.4 on 2026-10-18 17:05
+
+import apps.core.modelfields
+import apps.core.utils.uploads
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('importer', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', apps.core.modelfields.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', apps.core.modelfields.CreatedAtField(auto_now_add=True)),
+                ('updated_at', apps.core.modelfields.UpdatedAtField(auto_now=True)),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('running', 'running'), ('completed', 'completed'), ('failed', 'failed'), ('cancelled', 'cancelled')], default='pending', max_length=16)),
+                ('source_code', models.CharField(blank=True, max_length=50)),
+                ('payload', apps.core.modelfields.FileField(upload_to=apps.core.utils.uploads.file_folder)),
+                ('total_rows', models.PositiveIntegerField(blank=True, null=True)),
+                ('processed_rows', models.PositiveIntegerField(default=0)),
+                ('created_count', models.PositiveIntegerField(default=0)),
+                ('updated_count', models.PositiveIntegerField(default=0)),
+                ('failed_count', models.PositiveIntegerField(default=0)),
+                ('failures', models.JSONField(blank=True, default=list)),
+                ('last_error', models.TextField(blank=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', apps.core.modelfields.CreatedByField(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created_by', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', apps.core.modelfields.UpdatedByField(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated_by', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'import job',
+                'verbose_name_plural': 'import jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.1.4 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('importer', '0002_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importrecord',
+            name='payload_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='skipped_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
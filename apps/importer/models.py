@@ -1,7 +1,7 @@
 # apps/importer/models.py
 from django.db import models
 
-from ..core import _, models as core_models
+from ..core import _, models as core_models, modelfields as core_modelfields
 from ..program import models as program_models
 from ..episode import models as episode_models
 
@@ -38,6 +38,7 @@ class ImportRecord(core_models.CommonModel):
     - entity_type: "program" or "episode"
     - external_id: id in the external source (e.g. YouTube videoId, RSS guid)
     - program / episode: link to internal object, if created
+    - payload_hash: hash of the last payload imported (see `services.payload_hash`)
     """
     PROGRAM = "program"
     EPISODE = "episode"
@@ -74,6 +75,7 @@ class ImportRecord(core_models.CommonModel):
 
     status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=SUCCESS)
     last_error = models.TextField(blank=True)
+    payload_hash = models.CharField(max_length=64, blank=True)
 
     class Meta:
         unique_together = ("source", "entity_type", "external_id")
@@ -81,4 +83,58 @@ class ImportRecord(core_models.CommonModel):
         verbose_name_plural = _("importer records")
 
     def __str__(self):
-        return f"{self.source.code}:{self.entity_type}:{self.external_id}"
\ No newline at end of file
+        return f"{self.source.code}:{self.entity_type}:{self.external_id}"
+
+
+class ImportJob(core_models.CommonModel, core_models.TrackedModel):
+    """
+    A bulk import run in the background (see `apps.importer.jobs`).
+
+    - payload: the submitted rows, a JSON array or NDJSON file
+    - source_code: default source of rows without one
+    - total_rows / processed_rows: program rows in the payload / done so far
+    - created_count / updated_count / skipped_count / failed_count: programs and
+      episodes (skipped: payload unchanged since the last import)
+    - failures: reports of the failed rows (first IMPORTER_JOB_MAX_FAILURES)
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    STATUS_CHOICES = (
+        (PENDING, _("pending")),
+        (RUNNING, _("running")),
+        (COMPLETED, _("completed")),
+        (FAILED, _("failed")),
+        (CANCELLED, _("cancelled")),
+    )
+    FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=PENDING)
+    source_code = models.CharField(max_length=50, blank=True)
+    payload = core_modelfields.FileField()
+
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    failures = models.JSONField(default=list, blank=True)
+    last_error = models.TextField(blank=True)
+
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = _("import job")
+        verbose_name_plural = _("import jobs")
+
+    def __str__(self):
+        return f"{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in self.FINISHED
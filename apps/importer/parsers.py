@@ -0,0 +1,21 @@
+# apps/importer/parsers.py
+import codecs
+
+from django.conf import settings
+from rest_framework.parsers import BaseParser
+
+from .bulk import iter_ndjson
+
+
+class NDJSONParser(BaseParser):
+    """
+    Newline delimited JSON (one object per line).
+    Returns a lazy iterator of rows, so the body is decoded line by line
+    while the import runs instead of being loaded as one document.
+    """
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        return iter_ndjson(codecs.getreader(encoding)(stream))
@@ -0,0 +1,345 @@
+# apps/importer/rss.py
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+from xml.etree.ElementTree import ParseError
+
+import requests
+from defusedxml import DefusedXmlException
+from defusedxml.ElementTree import iterparse
+from django.conf import settings
+from django.db import connections
+
+from . import models
+from .app_settings import app_settings
+from .bulk import FAILED, BulkImporter, imported_episode_numbers, summarize
+from .services import system_request
+from ..program import EpisodeMediaTypeChoices, ProgramTypeChoices
+from ..search import markup
+
+logger = logging.getLogger(__name__)
+
+ITUNES = "{http://www.itunes.com/dtds/podcast-1.0.dtd}"
+CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+MEDIA = "{http://search.yahoo.com/mrss/}"
+
+NOT_MODIFIED = "not_modified"
+IMPORTED = "imported"
+
+
+class FeedChannel(NamedTuple):
+    title: str
+    description: str
+    language: str
+    image_url: str
+
+
+class FeedItem(NamedTuple):
+    guid: str
+    title: str
+    description: str
+    body: str
+    published: Optional[str]
+    media_url: str
+    media_type: str
+    duration_seconds: int
+    episode_number: Optional[int]
+    season_number: Optional[int]
+    image_url: str
+
+
+def parse_duration(value: str) -> int:
+    """
+    Seconds of an itunes:duration, "3600", "60:00" or "1:00:00".
+    """
+    seconds = 0
+    try:
+        for part in (value or "").strip().split(":"):
+            seconds = seconds * 60 + int(float(part or 0))
+    except ValueError:
+        return 0
+    return max(seconds, 0)
+
+
+def parse_int(value: str) -> Optional[int]:
+    try:
+        number = int((value or "").strip())
+    except ValueError:
+        return None
+    return number if number >= 0 else None
+
+
+def parse_date(value: str) -> Optional[str]:
+    try:
+        return parsedate_to_datetime(value.strip()).isoformat() if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def text(element, tag: str) -> str:
+    return (element.findtext(tag) or "").strip()
+
+
+def parse_item(element) -> Optional[FeedItem]:
+    enclosure = element.find("enclosure")
+    media_url = (enclosure.get("url") or "").strip() if enclosure is not None else ""
+    media_mime = (enclosure.get("type") or "") if enclosure is not None else ""
+    link = text(element, "link")
+
+    guid = text(element, "guid") or link or media_url
+    if not guid:
+        return None
+
+    image = element.find(f"{ITUNES}image")
+    thumbnail = element.find(f"{MEDIA}thumbnail")
+    image_url = ""
+    if image is not None:
+        image_url = (image.get("href") or "").strip()
+    elif thumbnail is not None:
+        image_url = (thumbnail.get("url") or "").strip()
+
+    description = text(element, "description") or text(element, f"{ITUNES}summary")
+    return FeedItem(
+        guid=guid,
+        title=text(element, "title") or text(element, f"{ITUNES}title"),
+        description=description,
+        body=text(element, f"{CONTENT}encoded") or description,
+        published=parse_date(text(element, "pubDate")),
+        media_url=media_url or link,
+        media_type=(
+            EpisodeMediaTypeChoices.VIDEO if media_mime.startswith("video/") else EpisodeMediaTypeChoices.AUDIO
+        ),
+        duration_seconds=parse_duration(text(element, f"{ITUNES}duration")),
+        episode_number=parse_int(text(element, f"{ITUNES}episode")),
+        season_number=parse_int(text(element, f"{ITUNES}season")),
+        image_url=image_url,
+    )
+
+
+def parse_feed(stream) -> Iterator[Union[FeedChannel, FeedItem]]:
+    """
+    Stream an RSS document: the FeedChannel first, then its items one by one.
+
+    Items are dropped from the tree as soon as they are read, so memory
+    stays flat whatever the size of the feed. Entities and DTDs are
+    refused (defusedxml).
+    """
+    stack: List[str] = []
+    channel_element = None
+    channel: Dict[str, str] = {"title": "", "description": "", "language": "", "image_url": ""}
+    channel_sent = False
+
+    for event, element in iterparse(stream, events=("start", "end")):
+        if event == "start":
+            stack.append(element.tag)
+            if element.tag == "channel":
+                channel_element = element
+            elif element.tag == "item" and not channel_sent:
+                channel_sent = True
+                yield FeedChannel(**channel)
+            continue
+
+        stack.pop()
+        parent = stack[-1] if stack else None
+        if element.tag == "item":
+            item = parse_item(element)
+            if item is not None:
+                yield item
+            if channel_element is not None and parent == "channel":
+                channel_element.remove(element)
+            element.clear()
+        elif parent == "channel":
+            if element.tag in ("title", "description", "language") and not channel[element.tag]:
+                channel[element.tag] = (element.text or "").strip()
+            elif element.tag == f"{ITUNES}summary" and not channel["description"]:
+                channel["description"] = (element.text or "").strip()
+            elif element.tag == f"{ITUNES}image" and element.get("href"):
+                channel["image_url"] = element.get("href").strip()
+        elif parent == "image" and element.tag == "url" and not channel["image_url"]:
+            channel["image_url"] = (element.text or "").strip()
+
+    if not channel_sent:
+        yield FeedChannel(**channel)
+
+
+def url_or_none(url: str, max_length: int) -> Optional[str]:
+    return url if url and len(url) <= max_length else None
+
+
+def feed_language(value: str, default: str) -> str:
+    languages = {code for code, _ in settings.LANGUAGES}
+    value = (value or "").strip().lower()
+    for candidate in (value, value.split("-")[0]):
+        if candidate in languages:
+            return candidate
+    return default
+
+
+class FeedPoller:
+    """
+    Poll the feed of one ContentSource(system="rss") and upsert it through
+    the BulkImporter: the channel as a Program (external_id "feed:<url>")
+    and every item as an Episode keyed by its <guid>.
+
+    `config` of the source:
+      - url: the feed (required)
+      - category_id (required to create the program), language, program_type, publish
+      - etag / last_modified: validators of the last feed imported without
+        a failed row, kept by the poller for conditional GETs (304: nothing is parsed)
+
+    Items without itunes:episode get the next numbers of the program when
+    first imported and keep them afterwards.
+    """
+
+    def __init__(self, source: models.ContentSource, request=None):
+        self.source = source
+        self.config = dict(source.config or {})
+        self.url = (self.config.get("url") or "").strip()
+        self.request = request or system_request()
+        self.importer = BulkImporter(self.request, source_code=source.code)
+
+    @property
+    def program_external_id(self) -> str:
+        return f"feed:{self.url}"[:255]
+
+    def fetch(self) -> Optional[requests.Response]:
+        headers = {"Accept": "application/rss+xml, application/xml;q=0.9, */*;q=0.8"}
+        if self.config.get("etag"):
+            headers["If-None-Match"] = self.config["etag"]
+        if self.config.get("last_modified"):
+            headers["If-Modified-Since"] = self.config["last_modified"]
+
+        response = requests.get(self.url, headers=headers, stream=True, timeout=app_settings.IMPORTER_RSS_TIMEOUT)
+        if response.status_code == 304:
+            response.close()
+            return None
+        response.raise_for_status()
+        response.raw.decode_content = True
+        return response
+
+    def existing(self):
+        """
+        Episode numbers of the guids already imported and episodes_count of the feed program.
+        """
+        numbers = imported_episode_numbers(self.source)
+        record = models.ImportRecord.objects.filter(
+            source=self.source,
+            entity_type=models.ImportRecord.PROGRAM,
+            external_id=self.program_external_id,
+            program__isnull=False,
+        ).select_related("program").first()
+        return numbers, record.program.episodes_count if record is not None else 0
+
+    def program_data(self, channel: FeedChannel) -> Dict[str, Any]:
+        description = channel.description
+        return {
+            "title": (channel.title or self.source.name)[:255],
+            "short_description": markup.strip_markup(description)[:500],
+            "long_description": description,
+            "category_id": self.config.get("category_id"),
+            "type": self.config.get("program_type", ProgramTypeChoices.PODCAST),
+            "language": feed_language(channel.language, self.config.get("language", settings.LANGUAGE_CODE)),
+            "cover_image_url": url_or_none(channel.image_url, 1000),
+            "is_published": self.config.get("publish", True),
+        }
+
+    def episode_row(self, item: FeedItem, number: int) -> Dict[str, Any]:
+        data = {
+            "title": (item.title or item.guid)[:255],
+            "short_description": markup.strip_markup(item.description)[:500],
+            "body": item.body,
+            "publish_date": item.published,
+            "duration_seconds": item.duration_seconds,
+            "season_number": item.season_number,
+            "thumbnail_url": url_or_none(item.image_url, 200),
+            "media_type": item.media_type,
+            "media_url": url_or_none(item.media_url, 1000),
+            "episode_number": number,
+            "is_published": self.config.get("publish", True),
+        }
+        return {"external_id": item.guid[:255], "episode": data}
+
+    def rows(self, entries: Iterable[Union[FeedChannel, FeedItem]]) -> Iterator[Dict[str, Any]]:
+        """
+        Program rows of the feed, each carrying a chunk worth of episodes;
+        after the first one the program payload is unchanged and skipped.
+        """
+        numbers, next_number = self.existing()
+        batch_size = max(self.importer.chunk_size - 1, 1)
+        program, episodes = None, []
+
+        for entry in entries:
+            if isinstance(entry, FeedChannel):
+                program = self.program_data(entry)
+                continue
+
+            number = entry.episode_number
+            if number is None:
+                number = numbers.get(entry.guid[:255])
+            if number is None:
+                next_number += 1
+                number = next_number
+                numbers[entry.guid[:255]] = number
+            episodes.append(self.episode_row(entry, number))
+            if len(episodes) >= batch_size:
+                yield {"external_id": self.program_external_id, "program": program, "episodes": episodes}
+                episodes = []
+
+        if program is not None:
+            yield {"external_id": self.program_external_id, "program": program, "episodes": episodes}
+
+    def save_validators(self, response: requests.Response) -> None:
+        self.config["etag"] = response.headers.get("ETag", "")
+        self.config["last_modified"] = response.headers.get("Last-Modified", "")
+        self.source.config = self.config
+        self.source.save(update_fields=["config", "updated_at"])
+
+    def poll(self) -> Dict[str, Any]:
+        result = {"source": self.source.code, "status": FAILED}
+        if not self.url:
+            result["error"] = "No feed url in the source config."
+            return result
+
+        try:
+            response = self.fetch()
+            if response is None:
+                result["status"] = NOT_MODIFIED
+                return result
+            with response:
+                reports = list(self.importer.run(self.rows(parse_feed(response.raw))))
+        except (requests.RequestException, ParseError, DefusedXmlException) as exc:
+            logger.warning("Could not poll the feed of %s: %s", self.source.code, exc)
+            result["error"] = str(exc)
+            return result
+
+        counts = summarize(reports)
+        # Validators are kept only once every row went through, so a failed
+        # poll (or a failed row) fetches the whole feed again next time.
+        if counts[FAILED] == 0:
+            self.save_validators(response)
+        result.update(status=IMPORTED, **counts)
+        return result
+
+
+def poll_source(source: models.ContentSource) -> Dict[str, Any]:
+    try:
+        return FeedPoller(source).poll()
+    finally:
+        connections.close_all()
+
+
+def poll_feeds(sources: Iterable[models.ContentSource] = None, workers: int = None) -> List[Dict[str, Any]]:
+    """
+    Poll RSS sources (every ContentSource with system "rss" by default)
+    on a pool of at most IMPORTER_RSS_WORKERS threads.
+    """
+    if sources is None:
+        sources = models.ContentSource.objects.filter(system="rss")
+    sources = list(sources)
+    if not sources:
+        return []
+
+    workers = min(workers or app_settings.IMPORTER_RSS_WORKERS, len(sources))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rss-poll") as pool:
+        return list(pool.map(poll_source, sources))
@@ -2,6 +2,9 @@
 from rest_framework import serializers
 
 from . import models
+from ..core import serializers as core_serializers
+from ..episode import models as episode_models
+from ..program import models as program_models
 
 
 class ContentSourceSerializer(serializers.ModelSerializer):
@@ -45,4 +48,80 @@ class ImportEpisodeSerializer(serializers.Serializer):
     source_code = serializers.CharField(max_length=50)
     external_id = serializers.CharField(max_length=255)
     program_id = serializers.UUIDField()
-    episode = serializers.DictField()
\ No newline at end of file
+    episode = serializers.DictField()
+
+
+class BulkProgramSerializer(core_serializers.ModelSerializer):
+    """
+    Program columns of one bulk import row, validated in memory only:
+    the category and tags of a whole chunk are checked together by
+    `apps.importer.bulk`, and slugs are generated there.
+    """
+    category_id = serializers.UUIDField()
+    tags = serializers.ListField(child=serializers.UUIDField(), required=False)
+
+    class Meta:
+        model = program_models.Program
+        fields = (
+            "title",
+            "short_description",
+            "long_description",
+            "category_id",
+            "type",
+            "language",
+            "cover_image_url",
+            "accent_color",
+            "publish_date",
+            "is_published",
+            "is_featured",
+            "tags",
+        )
+
+
+class BulkEpisodeSerializer(core_serializers.ModelSerializer):
+    """
+    Episode columns of one bulk import row; the program is the one of the enclosing row.
+    """
+    tags = serializers.ListField(child=serializers.UUIDField(), required=False)
+
+    class Meta:
+        model = episode_models.Episode
+        fields = (
+            "title",
+            "short_description",
+            "body",
+            "publish_date",
+            "duration_seconds",
+            "episode_number",
+            "season_number",
+            "thumbnail_url",
+            "media_type",
+            "media_url",
+            "is_published",
+            "is_featured",
+            "seo_title",
+            "seo_description",
+            "tags",
+        )
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.ImportJob
+        fields = (
+            "id",
+            "status",
+            "source_code",
+            "total_rows",
+            "processed_rows",
+            "created_count",
+            "updated_count",
+            "skipped_count",
+            "failed_count",
+            "failures",
+            "last_error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        )
+        read_only_fields = fields
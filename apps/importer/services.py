@@ -1,17 +1,100 @@
 # apps/importer/services.py
+import hashlib
+import json
+import unicodedata
+from typing import Any, NamedTuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
 from django.db import transaction
+from django.http import HttpRequest
+from django.utils import timezone
+from rest_framework.request import Request
 
 from . import models
-from ..program import models as program_models
+from .app_settings import app_settings
+from ..program import EpisodeMediaTypeChoices, ProgramTypeChoices, models as program_models
 from ..program.serializers import ProgramSerializer
 from ..episode import models as episode_models
 from ..episode.serializers import EpisodeSerializer
+from ..user import RoleChoices
+
+YOUTUBE_WATCH_URL = "https://www.youtube.com/watch?v={video_id}"
+
+
+class ImportResult(NamedTuple):
+    instance: Any
+    skipped: bool = False
+
+
+def normalize_payload(value):
+    if isinstance(value, dict):
+        return {str(key): normalize_payload(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_payload(item) for item in value]
+    if isinstance(value, str):
+        return unicodedata.normalize("NFC", value.strip())
+    return value
+
+
+def payload_hash(payload) -> str:
+    """
+    SHA-256 of the payload as canonical JSON (sorted keys, trimmed NFC
+    strings): the same content always gets the same hash, whatever the
+    key order or the whitespace around values the source sends.
+    """
+    canonical = json.dumps(
+        normalize_payload(payload), sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def is_unchanged(record, field: str, digest: str) -> bool:
+    """
+    Whether `record` already imported this exact payload successfully.
+    """
+    return (
+        getattr(record, f"{field}_id") is not None
+        and record.status == models.ImportRecord.SUCCESS
+        and record.payload_hash == digest
+    )
+
+
+def get_system_user():
+    """
+    User background imports are saved as (IMPORTER_SYSTEM_USERNAME, else the oldest active admin).
+    """
+    User = get_user_model()
+    if app_settings.IMPORTER_SYSTEM_USERNAME:
+        return User.objects.get(username=app_settings.IMPORTER_SYSTEM_USERNAME)
+
+    for user in User.objects.filter(role=RoleChoices.ADMIN, is_active=True).order_by("created_at")[:10]:
+        if user.is_admin:
+            return user
+    raise ImproperlyConfigured("Background imports need IMPORTER_SYSTEM_USERNAME or an active admin user.")
+
+
+def system_request(user=None) -> Request:
+    """
+    Request handed to the serializers when importing outside of a request
+    (tasks, commands): access policies and scoped fields see the system user.
+    """
+    http_request = HttpRequest()
+    http_request.method = "POST"
+    request = Request(http_request)
+    request.user = user or get_system_user()
+    return request
 
 
 class ImportService:
     """
     Small, synchronous service that reuses Program/Episode serializers.
     Idempotent per (source_code, external_id, entity_type).
+
+    The imports return an ImportResult; a payload identical to the last one
+    imported for the record (see `payload_hash`) is skipped before any
+    validation or save, so no receiver runs for it.
     """
 
     @staticmethod
@@ -22,12 +105,16 @@ class ImportService:
             defaults={"name": source_code, "system": "other"},
         )
 
-        record, _ = models.ImportRecord.objects.get_or_create(
+        record, _ = models.ImportRecord.objects.select_related("program").get_or_create(
             source=source,
             entity_type=models.ImportRecord.PROGRAM,
             external_id=external_id,
         )
 
+        digest = payload_hash(program_data)
+        if is_unchanged(record, "program", digest):
+            return ImportResult(record.program, skipped=True)
+
         if record.program:
             instance = record.program
             serializer = ProgramSerializer(
@@ -52,9 +139,10 @@ class ImportService:
         record.program = program
         record.status = models.ImportRecord.SUCCESS
         record.last_error = ""
-        record.save(update_fields=["program", "status", "last_error"])
+        record.payload_hash = digest
+        record.save(update_fields=["program", "status", "last_error", "payload_hash", "updated_at"])
 
-        return program
+        return ImportResult(program)
 
     @staticmethod
     @transaction.atomic
@@ -71,7 +159,7 @@ class ImportService:
             defaults={"name": source_code, "system": "other"},
         )
 
-        record, _ = models.ImportRecord.objects.get_or_create(
+        record, _ = models.ImportRecord.objects.select_related("episode").get_or_create(
             source=source,
             entity_type=models.ImportRecord.EPISODE,
             external_id=external_id,
@@ -81,6 +169,10 @@ class ImportService:
         episode_data = dict(episode_data)  # shallow copy
         episode_data["program"] = str(program_id)
 
+        digest = payload_hash(episode_data)
+        if is_unchanged(record, "episode", digest):
+            return ImportResult(record.episode, skipped=True)
+
         if record.episode:
             instance = record.episode
             serializer = EpisodeSerializer(
@@ -105,6 +197,121 @@ class ImportService:
         record.episode = episode
         record.status = models.ImportRecord.SUCCESS
         record.last_error = ""
-        record.save(update_fields=["episode", "status", "last_error"])
+        record.payload_hash = digest
+        record.save(update_fields=["episode", "status", "last_error", "payload_hash", "updated_at"])
+
+        return ImportResult(episode)
 
-        return episode
\ No newline at end of file
+    @staticmethod
+    def get_youtube_source(source_code: str = None):
+        source, _ = models.ContentSource.objects.get_or_create(
+            code=source_code or app_settings.IMPORTER_YOUTUBE_SOURCE_CODE,
+            defaults={"name": "YouTube", "system": "youtube"},
+        )
+        return source
+
+    @staticmethod
+    @transaction.atomic
+    def import_youtube_video(*, video: dict, request, source_code: str = None):
+        """
+        Upsert a YouTube video (the fields of `VideoMetadata`) as an Episode.
+
+        - Videos land in one Program per channel, external_id "channel:<channel name>",
+          reused when any YouTube source (e.g. a channel walked by
+          `apps.importer.youtube`) already imported it.
+        - The episode is keyed by the video id; an already imported video
+          only gets its title, description and thumbnail refreshed
+          (skipped when those did not change). A video another YouTube
+          source imported is left to that source and skipped.
+        - A new episode is numbered with the program row locked until it is
+          saved, so concurrent imports into one channel never share a number.
+        """
+        source = ImportService.get_youtube_source(source_code)
+        config = source.config or {}
+        publish = config.get("publish", True)
+        video_id = video["video_id"]
+        channel_name = (video.get("channel_name") or "").strip() or "YouTube"
+
+        other_record = models.ImportRecord.objects.filter(
+            source__system="youtube",
+            entity_type=models.ImportRecord.EPISODE,
+            external_id=video_id,
+            episode__isnull=False,
+        ).exclude(source=source).select_related("episode").first()
+        if other_record is not None:
+            return ImportResult(other_record.episode, skipped=True)
+
+        channel_id = f"channel:{channel_name}"[:255]
+        program_records = models.ImportRecord.objects.filter(
+            source__system="youtube",
+            entity_type=models.ImportRecord.PROGRAM,
+            external_id=channel_id,
+            program__isnull=False,
+        ).select_related("program")
+        program_record = program_records.filter(source=source).first() or program_records.first()
+
+        if program_record is not None:
+            program = program_record.program
+        else:
+            program = ImportService.import_program(
+                source_code=source.code,
+                external_id=channel_id,
+                program_data={
+                    "title": channel_name[:255],
+                    "category_id": config.get("category_id"),
+                    "type": config.get("program_type", ProgramTypeChoices.SHOW),
+                    "language": config.get("language", settings.LANGUAGE_CODE),
+                    "cover_image_url": video.get("thumbnail_url") or "",
+                    "is_published": publish,
+                    "publish_date": timezone.localdate().isoformat(),
+                },
+                request=request,
+            ).instance
+
+        description = video.get("description") or ""
+        episode_data = {
+            "title": (video.get("title") or video_id)[:255],
+            "short_description": description[:500],
+            "body": description,
+            "thumbnail_url": video.get("thumbnail_url") or None,
+        }
+        already_imported = models.ImportRecord.objects.filter(
+            source=source,
+            entity_type=models.ImportRecord.EPISODE,
+            external_id=video_id,
+            episode__isnull=False,
+        ).exists()
+        if not already_imported:
+            program_models.Program.objects.select_for_update().only("pk").get(pk=program.pk)
+            episode_data.update({
+                "media_type": EpisodeMediaTypeChoices.VIDEO,
+                "media_url": YOUTUBE_WATCH_URL.format(video_id=video_id),
+                "duration_seconds": 0,
+                "episode_number": program.episodes.count() + 1,
+                "is_published": publish,
+                "publish_date": timezone.now().isoformat(),
+            })
+
+        return ImportService.import_episode(
+            source_code=source.code,
+            external_id=video_id,
+            program_id=program.pk,
+            episode_data=episode_data,
+            request=request,
+        )
+
+    @staticmethod
+    def record_failure(*, source_code: str, entity_type: str, external_id: str, error: str):
+        """
+        Keep the error of an import that raised (and was rolled back) on its ImportRecord.
+        """
+        source, _ = models.ContentSource.objects.get_or_create(
+            code=source_code,
+            defaults={"name": source_code, "system": "other"},
+        )
+        models.ImportRecord.objects.update_or_create(
+            source=source,
+            entity_type=entity_type,
+            external_id=external_id,
+            defaults={"status": models.ImportRecord.FAILED, "last_error": error},
+        )
@@ -0,0 +1,92 @@
+# apps/importer/tasks.py
+import logging
+from typing import Dict, List
+
+from celery import shared_task
+from rest_framework.exceptions import ValidationError
+
+from . import jobs, models, rss, youtube
+from .services import ImportService, system_request
+
+logger = logging.getLogger(__name__)
+
+
+def record_video_failure(source: models.ContentSource, video: Dict, error: str) -> None:
+    try:
+        ImportService.record_failure(
+            source_code=source.code,
+            entity_type=models.ImportRecord.EPISODE,
+            external_id=video["video_id"],
+            error=error,
+        )
+    except Exception:
+        logger.exception("Could not record the failed import of YouTube video %s.", video.get("video_id"))
+
+
+@shared_task(ignore_result=True)
+def import_external_videos(videos: List[Dict]) -> int:
+    """
+    Import videos answered by the external search provider (see
+    `apps.search.ingest`) so the next searches find them internally.
+    A video that fails (invalid or a database error) is logged and recorded
+    as failed on its ImportRecord, and does not stop the others. Without a
+    system user, or a `category_id` in the source config, the batch is
+    skipped with one log line instead. Returns the number imported
+    (unchanged videos are skipped and not counted).
+    """
+    try:
+        request = system_request()
+        source = ImportService.get_youtube_source()
+    except Exception:
+        logger.exception("Could not import %d external videos.", len(videos))
+        return 0
+    if not (source.config or {}).get("category_id"):
+        logger.warning(
+            "Skipped %d external videos: the config of source %s has no category_id.", len(videos), source.code
+        )
+        return 0
+
+    imported = skipped = 0
+    for video in videos:
+        try:
+            result = ImportService.import_youtube_video(video=video, request=request, source_code=source.code)
+        except ValidationError as exc:
+            logger.warning("Could not import YouTube video %s: %s", video.get("video_id"), exc.detail)
+            record_video_failure(source, video, str(exc.detail))
+        except Exception as exc:
+            logger.exception("Could not import YouTube video %s.", video.get("video_id"))
+            record_video_failure(source, video, str(exc))
+        else:
+            if result.skipped:
+                skipped += 1
+            else:
+                imported += 1
+    logger.info("Imported %d external videos, %d unchanged.", imported, skipped)
+    return imported
+
+
+@shared_task(ignore_result=True, acks_late=True)
+def process_import_job(job_id: str) -> None:
+    """
+    Run a submitted ImportJob (see `apps.importer.jobs.run_job`).
+    Late acknowledgement: a job lost with its worker is delivered again and resumes.
+    """
+    jobs.run_job(job_id)
+
+
+@shared_task(ignore_result=True)
+def poll_rss_feeds() -> None:
+    """
+    Poll every RSS ContentSource (see `apps.importer.rss`).
+    """
+    for result in rss.poll_feeds():
+        logger.info("RSS feed %s: %s", result["source"], result)
+
+
+@shared_task(ignore_result=True)
+def ingest_youtube_channels() -> None:
+    """
+    Walk the channels/playlists of the YouTube ContentSources (see `apps.importer.youtube`).
+    """
+    for result in youtube.ingest_channels():
+        logger.info("YouTube source %s: %s", result["source"], result)
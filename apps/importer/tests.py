@@ -0,0 +1,253 @@
+# apps/importer/tests.py
+import io
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from . import models
+from .bulk import FAILED, imported_episode_numbers
+from .rss import IMPORTED, NOT_MODIFIED, FeedChannel, FeedItem, FeedPoller, parse_feed
+from .services import ImportService, system_request
+from .youtube import COMPLETED, PARTIAL, ChannelIngestor
+from ..category.models import Category
+from ..program.models import Program
+from ..program import EpisodeMediaTypeChoices
+from ..search.external_search_api import ListedVideo, VideoListingPage
+
+FEED_ITEM = """
+    <item>
+      <title>{title}</title>
+      <guid>{guid}</guid>
+      <description>&lt;p&gt;About {title}&lt;/p&gt;</description>
+      <pubDate>Mon, 06 Jan 2025 08:00:00 GMT</pubDate>
+      <enclosure url="https://example.com/{guid}.mp3" type="audio/mpeg" length="1"/>
+      <itunes:duration>1:02:03</itunes:duration>
+    </item>"""
+
+
+def make_feed(*guids: str) -> bytes:
+    items = "".join(FEED_ITEM.format(guid=guid, title=f"Episode {guid}") for guid in guids)
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">
+  <channel>
+    <title>Example podcast</title>
+    <description>Talks about examples.</description>
+    <language>en-us</language>
+    <itunes:image href="https://example.com/cover.jpg"/>{items}
+  </channel>
+</rss>""".encode("utf-8")
+
+
+class FeedResponse:
+    """
+    What FeedPoller.fetch reads of a streamed requests.Response.
+    """
+
+    def __init__(self, body: bytes = b"", status_code: int = 200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.raw = io.BytesIO(body)
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        self.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def listed_video(video_id: str, channel: str = "Example channel") -> ListedVideo:
+    return ListedVideo(
+        video_id=video_id,
+        title=f"Video {video_id}",
+        description="",
+        thumbnail_url="",
+        length="10:00",
+        channel_name=channel,
+        channel_link=f"https://www.youtube.com/@{channel.replace(' ', '')}",
+        channel_thumbnail_url="",
+    )
+
+
+class StubListingService:
+    """
+    Serves canned listing pages by page token (None for the first one).
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.tokens = []
+
+    def get_page(self, search_query, page_token=None, country_code=None, language_code=None):
+        self.tokens.append(page_token)
+        return self.pages[page_token]
+
+
+class ImporterTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(
+            phone_number="+201000000001", username="importer-admin", name="Importer admin"
+        )
+        cls.category = Category.objects.create(name="Technology")
+
+
+class ParseFeedTests(SimpleTestCase):
+    def test_channel_comes_first_then_items(self):
+        entries = list(parse_feed(io.BytesIO(make_feed("a", "b"))))
+
+        self.assertIsInstance(entries[0], FeedChannel)
+        self.assertEqual(entries[0].title, "Example podcast")
+        self.assertEqual(entries[0].language, "en-us")
+        self.assertEqual(entries[0].image_url, "https://example.com/cover.jpg")
+        self.assertEqual([entry.guid for entry in entries[1:]], ["a", "b"])
+
+    def test_item_fields(self):
+        item = list(parse_feed(io.BytesIO(make_feed("a"))))[1]
+
+        self.assertIsInstance(item, FeedItem)
+        self.assertEqual(item.title, "Episode a")
+        self.assertEqual(item.media_url, "https://example.com/a.mp3")
+        self.assertEqual(item.media_type, EpisodeMediaTypeChoices.AUDIO)
+        self.assertEqual(item.duration_seconds, 3723)
+        self.assertIsNone(item.episode_number)
+        self.assertTrue(item.published.startswith("2025-01-06T08:00:00"))
+
+    def test_feed_without_items_still_yields_the_channel(self):
+        entries = list(parse_feed(io.BytesIO(make_feed())))
+
+        self.assertEqual(len(entries), 1)
+        self.assertIsInstance(entries[0], FeedChannel)
+
+
+class FeedPollerTests(ImporterTestCase):
+    def setUp(self):
+        self.source = models.ContentSource.objects.create(
+            code="example-feed",
+            name="Example feed",
+            system="rss",
+            config={"url": "https://example.com/feed.xml", "category_id": str(self.category.pk)},
+        )
+
+    def poll(self, response: FeedResponse):
+        with mock.patch("apps.importer.rss.requests.get", return_value=response) as get:
+            result = FeedPoller(self.source, request=system_request(user=self.admin)).poll()
+        self.source.refresh_from_db()
+        return result, get
+
+    def test_poll_imports_the_feed_and_keeps_its_validators(self):
+        result, _ = self.poll(FeedResponse(
+            make_feed("a", "b"), headers={"ETag": '"v1"', "Last-Modified": "Mon, 06 Jan 2025 08:00:00 GMT"}
+        ))
+
+        self.assertEqual(result["status"], IMPORTED)
+        self.assertEqual(result[FAILED], 0)
+        self.assertEqual(set(imported_episode_numbers(self.source)), {"a", "b"})
+        self.assertEqual(self.source.config["etag"], '"v1"')
+        self.assertEqual(self.source.config["last_modified"], "Mon, 06 Jan 2025 08:00:00 GMT")
+
+    def test_not_modified_feed_is_not_parsed(self):
+        self.source.config.update(etag='"v1"', last_modified="Mon, 06 Jan 2025 08:00:00 GMT")
+        self.source.save()
+
+        result, get = self.poll(FeedResponse(status_code=304))
+
+        self.assertEqual(result["status"], NOT_MODIFIED)
+        headers = get.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], "Mon, 06 Jan 2025 08:00:00 GMT")
+        self.assertFalse(models.ImportRecord.objects.filter(source=self.source).exists())
+
+    def test_episode_numbers_stay_stable_when_repolled(self):
+        self.poll(FeedResponse(make_feed("a", "b")))
+        first = imported_episode_numbers(self.source)
+
+        # A new item published at the top of the feed.
+        result, _ = self.poll(FeedResponse(make_feed("c", "a", "b")))
+        second = imported_episode_numbers(self.source)
+
+        self.assertEqual(result["status"], IMPORTED)
+        self.assertEqual(first, {"a": 1, "b": 2})
+        self.assertEqual(second, {"a": 1, "b": 2, "c": 3})
+
+
+class ChannelIngestorTests(ImporterTestCase):
+    def setUp(self):
+        self.source = models.ContentSource.objects.create(
+            code="example-channel",
+            name="Example channel",
+            system="youtube",
+            config={"channel": "Example channel", "category_id": str(self.category.pk)},
+        )
+        self.listing = StubListingService({
+            None: VideoListingPage([listed_video("v1"), listed_video("v2")], next_page_token="t2"),
+            "t2": VideoListingPage([listed_video("v3")], next_page_token="t3"),
+            "t3": VideoListingPage([listed_video("v4")]),
+        })
+
+    def ingest(self, **kwargs):
+        ingestor = ChannelIngestor(self.source, listing_service=self.listing, request=system_request(user=self.admin))
+        result = ingestor.ingest(**kwargs)
+        self.source.refresh_from_db()
+        return result
+
+    def test_walks_the_listing_to_the_end(self):
+        result = self.ingest()
+
+        self.assertEqual(result["status"], COMPLETED)
+        self.assertEqual(result["pages"], 3)
+        self.assertEqual(self.listing.tokens, [None, "t2", "t3"])
+        self.assertNotIn("page_token", self.source.config)
+        self.assertEqual(imported_episode_numbers(self.source), {"v1": 1, "v2": 2, "v3": 3, "v4": 4})
+
+    @override_settings(IMPORTER_YOUTUBE_MAX_PAGES=1)
+    def test_run_stops_after_max_pages_and_the_next_one_resumes(self):
+        result = self.ingest()
+
+        self.assertEqual(result["status"], PARTIAL)
+        self.assertEqual(result["pages"], 1)
+        self.assertEqual(self.listing.tokens, [None])
+        self.assertEqual(self.source.config["page_token"], "t2")
+        self.assertEqual(set(imported_episode_numbers(self.source)), {"v1", "v2"})
+
+        result = self.ingest(max_pages=5)
+
+        self.assertEqual(result["status"], COMPLETED)
+        self.assertEqual(self.listing.tokens, [None, "t2", "t3"])
+        self.assertNotIn("page_token", self.source.config)
+        self.assertEqual(imported_episode_numbers(self.source), {"v1": 1, "v2": 2, "v3": 3, "v4": 4})
+
+    def test_videos_of_other_channels_are_skipped(self):
+        self.listing.pages = {
+            None: VideoListingPage([listed_video("v1"), listed_video("x1", channel="Other channel"), listed_video("v2")]),
+        }
+
+        result = self.ingest()
+
+        self.assertEqual(result["status"], COMPLETED)
+        self.assertEqual(set(imported_episode_numbers(self.source)), {"v1", "v2"})
+        self.assertEqual(
+            set(models.ImportRecord.objects.filter(source=self.source, entity_type=models.ImportRecord.PROGRAM)
+                .values_list("external_id", flat=True)),
+            {"channel:Example channel"},
+        )
+
+    def test_external_fallback_reuses_videos_of_channel_sources(self):
+        self.ingest()
+
+        result = ImportService.import_youtube_video(
+            video={"video_id": "v1", "title": "Video v1", "channel_name": "Example channel"},
+            request=system_request(user=self.admin),
+        )
+
+        self.assertTrue(result.skipped)
+        self.assertEqual(
+            models.ImportRecord.objects.filter(entity_type=models.ImportRecord.EPISODE, external_id="v1").count(), 1
+        )
+        self.assertEqual(Program.objects.filter(title="Example channel").count(), 1)
@@ -1,11 +1,22 @@
 # apps/importer/urls.py
 from django.urls import path
 
-from .views.restful_apis import ProgramImportAPIView, EpisodeImportAPIView
+from .views.restful_apis import (
+    BulkImportAPIView,
+    EpisodeImportAPIView,
+    ImportJobAPIView,
+    ImportJobCancelAPIView,
+    ImportJobDetailAPIView,
+    ProgramImportAPIView,
+)
 
 app_name = "importer"
 
 urlpatterns = [
     path("api/programs/", ProgramImportAPIView.as_view(), name="program-importer"),
     path("api/episodes/", EpisodeImportAPIView.as_view(), name="episode-importer"),
+    path("api/bulk/", BulkImportAPIView.as_view(), name="bulk-importer"),
+    path("api/jobs/", ImportJobAPIView.as_view(), name="import-jobs"),
+    path("api/jobs/<uuid:pk>/", ImportJobDetailAPIView.as_view(), name="import-job"),
+    path("api/jobs/<uuid:pk>/cancel/", ImportJobCancelAPIView.as_view(), name="import-job-cancel"),
 ]
\ No newline at end of file
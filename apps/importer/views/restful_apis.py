@@ -1,12 +1,18 @@
 # apps/importer/views/restful_apis.py
+from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import parsers, status
 
 from apps.program.serializers import ProgramSerializer
 from apps.episode.serializers import EpisodeSerializer
 
+from apps.importer import jobs
+from apps.importer.bulk import BulkImporter, summarize
+from apps.importer.models import ImportJob
+from apps.importer.parsers import NDJSONParser
 from apps.importer.permissions import ImportAccessPermission
+from apps.importer.serializers import ImportJobSerializer
 from apps.importer.services import ImportService
 
 class ProgramImportAPIView(APIView):
@@ -28,6 +34,9 @@ class ProgramImportAPIView(APIView):
          "external_id": "hist-001",
          ... Program fields directly here ...
        }
+
+    The response is the program with `skipped`: true (and status 200) when
+    the payload is the same as the last one imported for it, nothing is saved then.
     """
 
     permission_classes = (ImportAccessPermission,)
@@ -63,15 +72,15 @@ class ProgramImportAPIView(APIView):
         if errors:
             return Response(errors, status=status.HTTP_400_BAD_REQUEST)
 
-        program = ImportService.import_program(
+        result = ImportService.import_program(
             source_code=source_code,
             external_id=external_id,
             program_data=program_payload,
             request=request,
         )
 
-        data = ProgramSerializer(program, context={"request": request}).data
-        return Response(data, status=status.HTTP_201_CREATED)
+        data = dict(ProgramSerializer(result.instance, context={"request": request}).data, skipped=result.skipped)
+        return Response(data, status=status.HTTP_200_OK if result.skipped else status.HTTP_201_CREATED)
 
 
 class EpisodeImportAPIView(APIView):
@@ -95,6 +104,8 @@ class EpisodeImportAPIView(APIView):
          "program_id": "<program UUID>",
          ... Episode fields directly here ...
        }
+
+    Unchanged payloads are skipped as for programs (`skipped`: true, status 200).
     """
 
     permission_classes = (ImportAccessPermission,)
@@ -132,7 +143,7 @@ class EpisodeImportAPIView(APIView):
         if errors:
             return Response(errors, status=status.HTTP_400_BAD_REQUEST)
 
-        episode = ImportService.import_episode(
+        result = ImportService.import_episode(
             source_code=source_code,
             external_id=external_id,
             program_id=program_id,
@@ -140,5 +151,136 @@ class EpisodeImportAPIView(APIView):
             request=request,
         )
 
-        data = EpisodeSerializer(episode, context={"request": request}).data
-        return Response(data, status=status.HTTP_201_CREATED)
\ No newline at end of file
+        data = dict(EpisodeSerializer(result.instance, context={"request": request}).data, skipped=result.skipped)
+        return Response(data, status=status.HTTP_200_OK if result.skipped else status.HTTP_201_CREATED)
+
+
+class BulkImportAPIView(APIView):
+    """
+    Import or update many Programs with their Episodes in one request.
+
+    Body: a JSON array of program rows ({"rows": [...]} is accepted too),
+    or NDJSON (Content-Type: application/x-ndjson), one program row per line:
+
+       {
+         "source_code": "yt",
+         "external_id": "hist-001",
+         "program": { ... Program fields ... },
+         "episodes": [
+           {"external_id": "8SCQnB4A0xU", "episode": { ... Episode fields ... }},
+           ...
+         ]
+       }
+
+    Program and episode fields may also be flat, as for the single importers.
+    `?source_code=` is the default of rows without one.
+
+    Rows are written in chunks (see `apps.importer.bulk.BulkImporter`);
+    a failing row does not stop the others. The response reports every
+    program and episode: {"summary": {created, updated, skipped, failed}, "rows": [...]},
+    skipped rows being those whose payload did not change since their last import.
+    """
+
+    permission_classes = (ImportAccessPermission,)
+    parser_classes = (parsers.JSONParser, NDJSONParser)
+
+    def post(self, request, *args, **kwargs):
+        rows = request.data
+        if isinstance(rows, dict):
+            rows = rows.get("rows")
+        if rows is None or isinstance(rows, (str, bytes, dict)):
+            return Response(
+                {"rows": ["Expected a list of program rows."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        importer = BulkImporter(request, source_code=request.query_params.get("source_code") or None)
+        reports = list(importer.run(rows))
+
+        return Response({"summary": summarize(reports), "rows": reports}, status=status.HTTP_200_OK)
+
+
+class ImportJobMixin:
+    """
+    Import jobs visible to the current user: their own, every job for admins.
+    """
+
+    def get_queryset(self):
+        queryset = ImportJob.objects.all()
+        if not getattr(self.request.user, "is_admin", False):
+            queryset = queryset.filter(created_by=self.request.user)
+        return queryset
+
+    def get_job(self, pk):
+        return get_object_or_404(self.get_queryset(), pk=pk)
+
+
+class ImportJobAPIView(ImportJobMixin, APIView):
+    """
+    Submit a bulk import to run in the background.
+
+    POST /importer/api/jobs/ with the rows of the bulk importer, either:
+
+    1) JSON: a list of program rows, or {"rows": [...], "source_code": "yt"}
+    2) multipart/form-data: `file` (JSON array or NDJSON) and optional `source_code`
+
+    Answers 202 at once with the job; poll GET /importer/api/jobs/<id>/
+    for its status and counters, POST /importer/api/jobs/<id>/cancel/ to stop it.
+
+    GET lists the jobs of the current user (every job for admins).
+    """
+
+    permission_classes = (ImportAccessPermission,)
+    parser_classes = (parsers.JSONParser, parsers.MultiPartParser, parsers.FormParser)
+
+    def get(self, request, *args, **kwargs):
+        return Response(ImportJobSerializer(self.get_queryset()[:50], many=True).data, status=status.HTTP_200_OK)
+
+    def post(self, request, *args, **kwargs):
+        data = request.data
+        source_code = request.query_params.get("source_code") or ""
+        file = None
+        rows = data
+
+        if isinstance(data, dict) or hasattr(data, "getlist"):
+            source_code = data.get("source_code") or source_code
+            file = request.FILES.get("file")
+            rows = data.get("rows")
+
+        if file is None and not isinstance(rows, list):
+            return Response(
+                {"rows": ["Expected a list of program rows or a `file`."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        job = jobs.submit_job(user=request.user, rows=rows, file=file, source_code=str(source_code)[:50])
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class ImportJobDetailAPIView(ImportJobMixin, APIView):
+    """
+    GET /importer/api/jobs/<id>/: status, progress counters and failed rows of an import job.
+    """
+
+    permission_classes = (ImportAccessPermission,)
+
+    def get(self, request, pk, *args, **kwargs):
+        return Response(ImportJobSerializer(self.get_job(pk)).data, status=status.HTTP_200_OK)
+
+
+class ImportJobCancelAPIView(ImportJobMixin, APIView):
+    """
+    POST /importer/api/jobs/<id>/cancel/: stop a pending or running job.
+    The chunks already imported are kept; 409 when the job had already finished.
+    """
+
+    permission_classes = (ImportAccessPermission,)
+
+    def post(self, request, pk, *args, **kwargs):
+        job = self.get_job(pk)
+        if not jobs.cancel_job(job):
+            return Response(
+                {"status": [f"The job is already {job.status}."]},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_200_OK)
@@ -0,0 +1,241 @@
+# apps/importer/youtube.py
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+import requests
+from django.conf import settings
+from django.db import connections
+
+from . import models
+from .app_settings import app_settings
+from .bulk import BulkImporter, imported_episode_numbers
+from .rss import parse_duration, url_or_none
+from .services import YOUTUBE_WATCH_URL, system_request
+from ..program import EpisodeMediaTypeChoices, ProgramTypeChoices
+from ..search.external_search_api import ListedVideo, VideoListingPage, YouTubeListingService
+from ..search.resilience import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+COMPLETED = "completed"
+PARTIAL = "partial"
+FAILED = "failed"
+
+# Shared by every walker of the process: SerpApi calls of all sources together.
+rate_limiter = RateLimiter(app_settings.IMPORTER_YOUTUBE_RATE_LIMIT)
+
+
+class ChannelIngestor:
+    """
+    Walk the YouTube listing of one ContentSource(system="youtube") page
+    by page and upsert its videos through the BulkImporter: one Program per
+    channel (external_id "channel:<name>", as `ImportService.import_youtube_video`)
+    and one Episode per video, keyed by the video id.
+
+    `config` of the source:
+      - search_query: listing walked (a channel or playlist name); defaults to `channel`
+      - channel: keep only the videos of this channel (name, or end of its link)
+      - category_id (required to create programs), language, program_type, publish
+      - page_token: where the last walk stopped, kept by the ingestor after
+        every page imported; cleared once the listing has been walked to the end
+
+    Videos another YouTube source already imported (e.g. through the external
+    search fallback, `ImportService.import_youtube_video`) are left to it.
+
+    The next page is fetched while the current one is imported; every
+    call waits on the shared `rate_limiter`. A run stops after
+    IMPORTER_YOUTUBE_MAX_PAGES pages and the next one resumes there.
+    """
+
+    def __init__(self, source: models.ContentSource, listing_service: YouTubeListingService = None, request=None):
+        self.source = source
+        self.config = dict(source.config or {})
+        self.channel = (self.config.get("channel") or "").strip()
+        self.search_query = (self.config.get("search_query") or self.channel).strip()
+        self.listing_service = listing_service or YouTubeListingService(rate_limiter=rate_limiter)
+        self.importer = BulkImporter(request or system_request(), source_code=source.code)
+        self.numbers: Optional[Dict[str, int]] = None
+        self.next_numbers: Dict[str, int] = {}
+
+    def fetch(self, page_token: Optional[str]) -> VideoListingPage:
+        return self.listing_service.get_page(
+            self.search_query,
+            page_token=page_token,
+            language_code=self.config.get("language"),
+        )
+
+    def pages(self, page_token: Optional[str], max_pages: int) -> Iterator[VideoListingPage]:
+        """
+        Up to `max_pages` pages from `page_token`, the next one always in flight.
+        """
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="youtube-page") as prefetch:
+            future = prefetch.submit(self.fetch, page_token)
+            for fetched in range(1, max_pages + 1):
+                page = future.result()
+                future = None
+                if page.next_page_token and fetched < max_pages:
+                    future = prefetch.submit(self.fetch, page.next_page_token)
+                try:
+                    yield page
+                except GeneratorExit:
+                    if future is not None:
+                        future.cancel()
+                    raise
+                if future is None:
+                    return
+
+    def keep(self, video: ListedVideo) -> bool:
+        if not self.channel:
+            return True
+        channel = self.channel.lower()
+        return (
+            video.channel_name.strip().lower() == channel
+            or video.channel_link.rstrip("/").lower().endswith(channel)
+        )
+
+    def imported_elsewhere(self, page: VideoListingPage) -> Set[str]:
+        """
+        Ids of the videos of `page` that another YouTube source imported.
+        """
+        return set(
+            models.ImportRecord.objects.filter(
+                source__system="youtube",
+                entity_type=models.ImportRecord.EPISODE,
+                external_id__in=[video.video_id for video in page.videos],
+                episode__isnull=False,
+            )
+            .exclude(source=self.source)
+            .values_list("external_id", flat=True)
+        )
+
+    def program_external_id(self, channel_name: str) -> str:
+        return f"channel:{channel_name}"[:255]
+
+    def episode_number(self, video: ListedVideo, channel_name: str) -> int:
+        """
+        Stored number of a known video, else the next one of its program.
+        """
+        if self.numbers is None:
+            self.numbers = imported_episode_numbers(self.source)
+        if video.video_id in self.numbers:
+            return self.numbers[video.video_id]
+
+        if channel_name not in self.next_numbers:
+            record = models.ImportRecord.objects.filter(
+                source=self.source,
+                entity_type=models.ImportRecord.PROGRAM,
+                external_id=self.program_external_id(channel_name),
+                program__isnull=False,
+            ).select_related("program").first()
+            self.next_numbers[channel_name] = record.program.episodes_count if record is not None else 0
+
+        self.next_numbers[channel_name] += 1
+        self.numbers[video.video_id] = self.next_numbers[channel_name]
+        return self.numbers[video.video_id]
+
+    def program_data(self, video: ListedVideo, channel_name: str) -> Dict[str, Any]:
+        return {
+            "title": channel_name[:255],
+            "category_id": self.config.get("category_id"),
+            "type": self.config.get("program_type", ProgramTypeChoices.SHOW),
+            "language": self.config.get("language", settings.LANGUAGE_CODE),
+            "cover_image_url": url_or_none(video.channel_thumbnail_url, 1000),
+            "is_published": self.config.get("publish", True),
+        }
+
+    def episode_row(self, video: ListedVideo, channel_name: str) -> Dict[str, Any]:
+        return {
+            "external_id": video.video_id,
+            "episode": {
+                "title": (video.title or video.video_id)[:255],
+                "short_description": video.description[:500],
+                "body": video.description,
+                "thumbnail_url": url_or_none(video.thumbnail_url, 200),
+                "media_type": EpisodeMediaTypeChoices.VIDEO,
+                "media_url": YOUTUBE_WATCH_URL.format(video_id=video.video_id),
+                "duration_seconds": parse_duration(video.length),
+                "episode_number": self.episode_number(video, channel_name),
+                "is_published": self.config.get("publish", True),
+            },
+        }
+
+    def rows(self, page: VideoListingPage) -> List[Dict[str, Any]]:
+        """
+        The videos of a page as program rows, one per channel.
+        """
+        rows: Dict[str, Dict[str, Any]] = {}
+        elsewhere = self.imported_elsewhere(page)
+        for video in page.videos:
+            if not self.keep(video) or video.video_id in elsewhere:
+                continue
+            channel_name = video.channel_name.strip() or "YouTube"
+            if channel_name not in rows:
+                rows[channel_name] = {
+                    "external_id": self.program_external_id(channel_name),
+                    "program": self.program_data(video, channel_name),
+                    "episodes": [],
+                }
+            rows[channel_name]["episodes"].append(self.episode_row(video, channel_name))
+        return list(rows.values())
+
+    def save_page_token(self, page_token: Optional[str]) -> None:
+        if page_token:
+            self.config["page_token"] = page_token
+        else:
+            self.config.pop("page_token", None)
+        self.source.config = self.config
+        self.source.save(update_fields=["config", "updated_at"])
+
+    def ingest(self, max_pages: int = None) -> Dict[str, Any]:
+        result = {"source": self.source.code, "status": FAILED, "pages": 0}
+        if not self.search_query:
+            result["error"] = "No search_query or channel in the source config."
+            return result
+
+        counts = Counter()
+        page_token = self.config.get("page_token")
+        try:
+            for page in self.pages(page_token, max_pages or app_settings.IMPORTER_YOUTUBE_MAX_PAGES):
+                for report in self.importer.run(self.rows(page)):
+                    counts[report["status"]] += 1
+                page_token = page.next_page_token
+                self.save_page_token(page_token)
+                result["pages"] += 1
+        except requests.RequestException as exc:
+            # The token of the last page imported is kept: the next run resumes there.
+            logger.warning("YouTube ingestion of %s stopped: %s", self.source.code, exc)
+            result["error"] = str(exc)
+            result["status"] = PARTIAL if result["pages"] else FAILED
+        else:
+            result["status"] = PARTIAL if page_token else COMPLETED
+
+        result.update(counts)
+        return result
+
+
+def ingest_source(source: models.ContentSource) -> Dict[str, Any]:
+    try:
+        return ChannelIngestor(source).ingest()
+    finally:
+        connections.close_all()
+
+
+def ingest_channels(sources: Iterable[models.ContentSource] = None, workers: int = None) -> List[Dict[str, Any]]:
+    """
+    Walk YouTube sources (every ContentSource with system "youtube" and a
+    `search_query` or `channel` by default) on at most IMPORTER_YOUTUBE_WORKERS threads.
+    """
+    if sources is None:
+        sources = [
+            source for source in models.ContentSource.objects.filter(system="youtube")
+            if (source.config or {}).get("search_query") or (source.config or {}).get("channel")
+        ]
+    sources = list(sources)
+    if not sources:
+        return []
+
+    workers = min(workers or app_settings.IMPORTER_YOUTUBE_WORKERS, len(sources))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="youtube-ingest") as pool:
+        return list(pool.map(ingest_source, sources))
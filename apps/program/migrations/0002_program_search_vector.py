@@ -0,0 +1,19 @@
+# Generated by Django 4.1.4 on 2026-10-18 09:12
+
+import apps.search.modelfields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('program', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='program',
+            name='search_vector',
+            field=apps.search.modelfields.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+    ]
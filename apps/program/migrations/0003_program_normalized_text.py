@@ -0,0 +1,29 @@
+# Generated by Django 4.1.4 on 2026-10-18 12:20
+
+import apps.search.modelfields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('program', '0002_program_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='program',
+            name='search_title',
+            field=apps.search.modelfields.NormalizedTextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='program',
+            name='search_summary',
+            field=apps.search.modelfields.NormalizedTextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='program',
+            name='search_body',
+            field=apps.search.modelfields.NormalizedTextField(blank=True, default='', editable=False),
+        ),
+    ]
@@ -5,6 +5,7 @@ from ..core import _, models as core_models, modelfields as core_modelfields
 from ..core.utils import slug
 from ..category import models as category_models
 from ..core.utils.slug import slugify
+from ..search import markup, modelfields as search_modelfields, normalization
 from ..tag import models as tag_models
 from ..tag import modelfields as tag_modelfields
 from . import ProgramTypeChoices, managers, modelfields
@@ -30,6 +31,11 @@ class Program(core_models.CommonModel, core_models.TrackedModel, core_models.Act
     is_featured = modelfields.IsFeaturedField()
     episodes_count = models.PositiveIntegerField(default=0)
     tags = tag_modelfields.TagsField(blank=True)
+    search_vector = search_modelfields.SearchVectorField()
+    search_title = search_modelfields.NormalizedTextField()
+    search_summary = search_modelfields.NormalizedTextField()
+    search_body = search_modelfields.NormalizedTextField()
+    plain_body = search_modelfields.PlainTextField()
 
     objects = managers.BaseProgramManager()
 
@@ -44,4 +50,12 @@ class Program(core_models.CommonModel, core_models.TrackedModel, core_models.Act
     def save(self, *args, **kwargs):
         if not self.slug and self.title:
             self.slug = slug.slugify(self, 'title')
+        update_fields = normalization.normalize_fields(
+            self, normalization.PROGRAM_PLAIN_FIELDS, kwargs.get('update_fields'), transform=markup.strip_markup
+        )
+        update_fields = normalization.normalize_fields(
+            self, normalization.PROGRAM_NORMALIZED_FIELDS, update_fields
+        )
+        if update_fields is not None:
+            kwargs['update_fields'] = update_fields
         super().save(*args, **kwargs)
@@ -11,17 +11,15 @@ def receiver_program_saved(sender, instance: models.Program, created, **kwargs):
     When a program is created or updated:
       - If active & published, index it.
       - Otherwise, remove it from search.
+    Both happen after commit, on the search index worker.
     """
-    if instance.is_active and instance.is_published:
-        SearchService.index_program(instance)
-    else:
-        SearchService.remove_program(instance.id)
+    SearchService.schedule_program(instance.id)
 
 
 @receiver(post_delete, sender=models.Program)
 def receiver_program_deleted(sender, instance: models.Program, **kwargs):
     """
     When a program is hard-deleted:
-      - Remove it from search index.
+      - Remove it from search index (after commit).
     """
-    SearchService.remove_program(instance.id)
\ No newline at end of file
+    SearchService.schedule_program(instance.id)
\ No newline at end of file
@@ -0,0 +1,231 @@
+# apps/search/analytics.py
+import atexit
+import datetime
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from .app_settings import app_settings
+from .models import SearchQueryStat
+from .normalization import normalize
+
+logger = logging.getLogger(__name__)
+
+QUERY_MAX_LENGTH = SearchQueryStat._meta.get_field("query").max_length
+WRITE_BATCH_SIZE = 500
+
+# (day, normalized query, source)
+StatKey = Tuple[datetime.date, str, str]
+# [searches, zero_results, results, latency_ms, max_latency_ms]
+Counters = List[float]
+
+
+class AnalyticsBuffer:
+    """
+    Per-process aggregate of search requests, written to SearchQueryStat in batches.
+
+    - `record` only updates in-memory counters keyed by (day, normalized query,
+      source): the request never waits on the database.
+    - A daemon thread flushes every SEARCH_ANALYTICS_FLUSH_INTERVAL seconds, or
+      as soon as SEARCH_ANALYTICS_MAX_PENDING distinct keys are pending, and on exit.
+    - A flush costs a few statements per WRITE_BATCH_SIZE keys however many
+      requests they aggregate (see `write_stats`).
+    - After a fork the child starts with an empty buffer and its own thread.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: Dict[StatKey, Counters] = {}
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def record(self, query: str, source: str, result_count: int, latency_ms: float) -> None:
+        if not app_settings.SEARCH_ANALYTICS_ENABLED:
+            return
+
+        query = normalize(query).strip()[:QUERY_MAX_LENGTH]
+        if not query:
+            return
+
+        key = (timezone.localdate(), query, source)
+        with self._lock:
+            self._ensure_flusher()
+            counters = self._pending.get(key)
+            if counters is None:
+                counters = self._pending[key] = [0, 0, 0, 0.0, 0.0]
+            counters[0] += 1
+            counters[1] += 0 if result_count else 1
+            counters[2] += result_count
+            counters[3] += latency_ms
+            counters[4] = max(counters[4], latency_ms)
+            full = len(self._pending) >= app_settings.SEARCH_ANALYTICS_MAX_PENDING
+
+        if full:
+            self._wake.set()
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def drain(self) -> Dict[StatKey, Counters]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def flush(self) -> int:
+        """
+        Write what is pending; returns the number of keys written.
+        On a database error the counters are put back for the next flush.
+        """
+        pending = self.drain()
+        if not pending:
+            return 0
+
+        try:
+            write_stats(pending)
+        except DatabaseError:
+            logger.exception("Could not write %d search query stats, retrying on the next flush.", len(pending))
+            self._restore(pending)
+            return 0
+        return len(pending)
+
+    def _restore(self, pending: Dict[StatKey, Counters]) -> None:
+        with self._lock:
+            if len(self._pending) >= app_settings.SEARCH_ANALYTICS_MAX_PENDING:
+                return
+            for key, counters in pending.items():
+                current = self._pending.setdefault(key, [0, 0, 0, 0.0, 0.0])
+                for position in range(4):
+                    current[position] += counters[position]
+                current[4] = max(current[4], counters[4])
+
+    def _ensure_flusher(self) -> None:
+        # Called with the lock held.
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None and self._thread.is_alive():
+            return
+
+        if self._pid is None:
+            atexit.register(self.flush)
+        elif self._pid != pid:
+            # Forked: the parent's counters are flushed by the parent.
+            self._pending = {}
+
+        self._pid = pid
+        self._thread = threading.Thread(target=self._run, name="search-analytics", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(app_settings.SEARCH_ANALYTICS_FLUSH_INTERVAL)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Search analytics flush failed.")
+            finally:
+                close_old_connections()
+
+
+def write_stats(pending: Dict[StatKey, Counters]) -> None:
+    """
+    Add the counters to their SearchQueryStat rows, by batches of WRITE_BATCH_SIZE keys:
+
+    - missing rows are created empty (conflicts ignored, another worker may create them),
+    - the rows are locked and read back in one query,
+    - the incremented rows are written with one bulk update.
+    """
+    keys = list(pending)
+    for start in range(0, len(keys), WRITE_BATCH_SIZE):
+        batch = keys[start:start + WRITE_BATCH_SIZE]
+        with transaction.atomic():
+            SearchQueryStat.objects.bulk_create(
+                [SearchQueryStat(day=day, query=query, source=source) for day, query, source in batch],
+                ignore_conflicts=True,
+            )
+            rows = SearchQueryStat.objects.select_for_update().filter(
+                day__in={key[0] for key in batch},
+                query__in={key[1] for key in batch},
+                source__in={key[2] for key in batch},
+            )
+
+            now = timezone.now()
+            updated = []
+            for row in rows:
+                counters = pending.get((row.day, row.query, row.source))
+                if counters is None:
+                    continue
+                row.searches += counters[0]
+                row.zero_results += counters[1]
+                row.results += counters[2]
+                row.latency_ms += counters[3]
+                row.max_latency_ms = max(row.max_latency_ms, counters[4])
+                row.updated_at = now
+                updated.append(row)
+
+            SearchQueryStat.objects.bulk_update(
+                updated, ["searches", "zero_results", "results", "latency_ms", "max_latency_ms", "updated_at"]
+            )
+
+
+def recent_stats(days: Optional[int] = None):
+    days = app_settings.SEARCH_ANALYTICS_WINDOW_DAYS if days is None else days
+    since = timezone.localdate() - datetime.timedelta(days=days)
+    return SearchQueryStat.objects.filter(day__gt=since)
+
+
+def top_queries(limit: int, days: Optional[int] = None) -> List[Dict]:
+    """
+    Most searched queries answered internally over the last `days` days.
+    """
+    return list(
+        recent_stats(days)
+        .filter(source=SearchQueryStat.INTERNAL)
+        .values("query")
+        .annotate(searches=Sum("searches"))
+        .order_by("-searches", "query")[:limit]
+    )
+
+
+def zero_result_queries(limit: int, days: Optional[int] = None) -> List[Dict]:
+    """
+    Queries internal search could not answer over the last `days` days, most
+    frequent first, with how many of them went to the external provider (SerpApi spend).
+    """
+    return list(
+        recent_stats(days)
+        .exclude(source=SearchQueryStat.INTERNAL)
+        .values("query")
+        .annotate(
+            searches=Sum("searches"),
+            external=Sum("searches", filter=Q(source=SearchQueryStat.EXTERNAL)),
+        )
+        .order_by("-searches", "query")[:limit]
+    )
+
+
+analytics_buffer = AnalyticsBuffer()
+
+
+def record_search(query: str, source: str, result_count: int, latency_ms: float) -> None:
+    analytics_buffer.record(query, source, result_count, latency_ms)
+
+
+def record_response(query: str, data: Mapping[str, Any], started: float) -> None:
+    """
+    Record a search response body of the search views; `started` is the time.monotonic() of the request.
+    Results count as the page `total` when known, else the results returned.
+    """
+    if not query or "source" not in data:
+        return
+
+    result_count = data.get("total")
+    if result_count is None:
+        result_count = len(data.get("results") or [])
+    record_search(query, data["source"], result_count, (time.monotonic() - started) * 1000)
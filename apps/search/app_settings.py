@@ -0,0 +1,479 @@
+import os
+
+from django.conf import settings
+
+from ..core.app_settings import AppSettings
+
+
+class AppSettings(AppSettings):
+    """
+    This class is used to return values from the project's settings file.
+    If this value does not exist, a default value is assigned.
+    """
+
+    @property
+    def SEARCH_BACKEND(self):
+        """
+        Dotted path of the search backend class used behind SearchService.
+        Empty by default: PostgreSQL full-text search on PostgreSQL, the
+        portable database backend elsewhere. The in-process inverted index
+        ("apps.search.backends.memory.MemorySearchBackend") keeps its files on
+        local disk, so it only suits deployments on a single host.
+        """
+        return self._setting("SEARCH_BACKEND", "")
+
+    @property
+    def SEARCH_TEXT_SEARCH_CONFIGS(self):
+        """
+        PostgreSQL text search configuration used for each content language.
+        """
+        return self._setting("SEARCH_TEXT_SEARCH_CONFIGS", {"ar": "arabic", "en": "english"})
+
+    @property
+    def SEARCH_DEFAULT_TEXT_SEARCH_CONFIG(self):
+        """
+        Text search configuration used when a language has no dedicated configuration.
+        """
+        return self._setting("SEARCH_DEFAULT_TEXT_SEARCH_CONFIG", "simple")
+
+    @property
+    def SEARCH_INDEX_PATH(self):
+        """
+        Snapshot file of the in-process inverted index; its change journals are written next to it.
+        """
+        return self._setting("SEARCH_INDEX_PATH", os.path.join(settings.BASE_DIR, "var", "search", "index.pickle"))
+
+    @property
+    def SEARCH_INDEX_JOURNAL_MAX_BYTES(self):
+        """
+        Size of the change journal of the in-process index past which the snapshot is rewritten.
+        """
+        return self._setting("SEARCH_INDEX_JOURNAL_MAX_BYTES", 32 * 1024 * 1024)
+
+    @property
+    def SEARCH_INDEX_FIELD_WEIGHTS(self):
+        """
+        Weight of a term occurrence in each indexed field.
+        """
+        return self._setting(
+            "SEARCH_INDEX_FIELD_WEIGHTS",
+            {"title": 3.0, "short_description": 2.0, "long_description": 1.0, "body": 1.0},
+        )
+
+    @property
+    def SEARCH_INDEX_MAX_PREFIX_EXPANSIONS(self):
+        """
+        Maximum number of indexed terms a query term may expand to by prefix.
+        """
+        return self._setting("SEARCH_INDEX_MAX_PREFIX_EXPANSIONS", 64)
+
+    @property
+    def SEARCH_INDEX_RELOAD_INTERVAL(self):
+        """
+        Seconds between checks for a newer snapshot or journal entries written by another worker.
+        """
+        return self._setting("SEARCH_INDEX_RELOAD_INTERVAL", 5)
+
+    @property
+    def SEARCH_FUZZY_ENABLED(self):
+        """
+        Retry with typo-tolerant trigram matching when a query has no exact match.
+        """
+        return self._setting("SEARCH_FUZZY_ENABLED", True)
+
+    @property
+    def SEARCH_TRIGRAM_SIMILARITY_THRESHOLD(self):
+        """
+        Minimum trigram similarity (0..1) for a fuzzy match.
+        """
+        return self._setting("SEARCH_TRIGRAM_SIMILARITY_THRESHOLD", 0.3)
+
+    @property
+    def SEARCH_FUZZY_MAX_MATCHES(self):
+        """
+        Maximum number of fuzzy candidates considered by the pure-Python n-gram index.
+        """
+        return self._setting("SEARCH_FUZZY_MAX_MATCHES", 500)
+
+    @property
+    def SEARCH_TRIGRAM_REBUILD_INTERVAL(self):
+        """
+        Seconds after which a process rebuilds the trigram index of the database backend.
+        """
+        return self._setting("SEARCH_TRIGRAM_REBUILD_INTERVAL", 600)
+
+    @property
+    def SEARCH_HIGHLIGHT_ENABLED(self):
+        """
+        Add highlighted title and snippet offsets to internal search results.
+        """
+        return self._setting("SEARCH_HIGHLIGHT_ENABLED", True)
+
+    @property
+    def SEARCH_HIGHLIGHT_SNIPPET_LENGTH(self):
+        """
+        Approximate length, in characters, of the snippet cut around the first match.
+        """
+        return self._setting("SEARCH_HIGHLIGHT_SNIPPET_LENGTH", 160)
+
+    @property
+    def SEARCH_SUGGEST_DEFAULT_LIMIT(self):
+        """
+        Number of autocomplete suggestions returned when `limit` is not given.
+        """
+        return self._setting("SEARCH_SUGGEST_DEFAULT_LIMIT", 8)
+
+    @property
+    def SEARCH_SUGGEST_MAX_LIMIT(self):
+        """
+        Upper bound of `limit` for autocomplete, also the size of the per-prefix cache.
+        """
+        return self._setting("SEARCH_SUGGEST_MAX_LIMIT", 20)
+
+    @property
+    def SEARCH_SUGGEST_MAX_PREFIX_LENGTH(self):
+        """
+        Longest word prefix stored in the autocomplete table.
+        """
+        return self._setting("SEARCH_SUGGEST_MAX_PREFIX_LENGTH", 20)
+
+    @property
+    def SEARCH_SUGGEST_FEATURED_BOOST(self):
+        """
+        Weight multiplier of featured programs and episodes in autocomplete.
+        """
+        return self._setting("SEARCH_SUGGEST_FEATURED_BOOST", 2.0)
+
+    @property
+    def SEARCH_SUGGEST_RECENCY_HALF_LIFE(self):
+        """
+        Days after which the recency boost of a suggestion is halved.
+        """
+        return self._setting("SEARCH_SUGGEST_RECENCY_HALF_LIFE", 90)
+
+    @property
+    def SEARCH_SUGGEST_REBUILD_INTERVAL(self):
+        """
+        Seconds after which a process rebuilds its autocomplete table from the database.
+        """
+        return self._setting("SEARCH_SUGGEST_REBUILD_INTERVAL", 300)
+
+    @property
+    def SEARCH_SPELLING_ENABLED(self):
+        """
+        Offer a "did you mean" correction when a query has no internal match.
+        """
+        return self._setting("SEARCH_SPELLING_ENABLED", True)
+
+    @property
+    def SEARCH_SPELLING_AUTO_RETRY(self):
+        """
+        Search again with the correction, before any external fallback, and return its results.
+        """
+        return self._setting("SEARCH_SPELLING_AUTO_RETRY", True)
+
+    @property
+    def SEARCH_SPELLING_MAX_EDIT_DISTANCE(self):
+        """
+        Maximum edits between a query term and its correction. Each extra edit
+        multiplies the size of the precomputed delete table.
+        """
+        return self._setting("SEARCH_SPELLING_MAX_EDIT_DISTANCE", 2)
+
+    @property
+    def SEARCH_SPELLING_PREFIX_LENGTH(self):
+        """
+        Leading characters of a word the delete table is computed from.
+        """
+        return self._setting("SEARCH_SPELLING_PREFIX_LENGTH", 7)
+
+    @property
+    def SEARCH_SPELLING_REBUILD_INTERVAL(self):
+        """
+        Seconds after which a process rebuilds its spelling dictionary from the database.
+        """
+        return self._setting("SEARCH_SPELLING_REBUILD_INTERVAL", 600)
+
+    @property
+    def SEARCH_EXTERNAL_INGEST_ENABLED(self):
+        """
+        Queue the videos answered by the external provider for import into the catalog.
+        Off by default: the importer needs a `category_id` in the config of the
+        IMPORTER_YOUTUBE_SOURCE_CODE source and a system user (IMPORTER_SYSTEM_USERNAME
+        or an active admin) to create the channel programs.
+        """
+        return self._setting("SEARCH_EXTERNAL_INGEST_ENABLED", False)
+
+    @property
+    def SEARCH_EXTERNAL_INGEST_DEDUPE_TIMEOUT(self):
+        """
+        Seconds during which a video already queued for import is not queued again.
+        """
+        return self._setting("SEARCH_EXTERNAL_INGEST_DEDUPE_TIMEOUT", 60 * 60 * 24)
+
+    @property
+    def SEARCH_CACHE_ALIAS(self):
+        """
+        Django cache used by the search app (Redis when USE_REDIS_CACHE, local memory otherwise).
+        """
+        return self._setting("SEARCH_CACHE_ALIAS", "default")
+
+    @property
+    def SEARCH_RESULT_CACHE_ENABLED(self):
+        """
+        Cache internal search pages until the catalog changes. On a local memory
+        SEARCH_CACHE_ALIAS each process keeps its own pages, invalidated through a
+        catalog generation kept in the database; a shared cache (e.g. Redis) shares both.
+        """
+        return self._setting("SEARCH_RESULT_CACHE_ENABLED", True)
+
+    @property
+    def SEARCH_RESULT_CACHE_TIMEOUT(self):
+        """
+        Seconds a cached search page lives when the catalog does not change.
+        """
+        return self._setting("SEARCH_RESULT_CACHE_TIMEOUT", 60 * 10)
+
+    @property
+    def SEARCH_EXTERNAL_CACHE_TTL(self):
+        """
+        Seconds an external (SerpApi) lookup is served as fresh.
+        """
+        return self._setting("SEARCH_EXTERNAL_CACHE_TTL", 60 * 60)
+
+    @property
+    def SEARCH_EXTERNAL_CACHE_STALE_TTL(self):
+        """
+        Seconds an expired lookup is still served while it is refreshed in the background.
+        """
+        return self._setting("SEARCH_EXTERNAL_CACHE_STALE_TTL", 60 * 60 * 24)
+
+    @property
+    def SEARCH_EXTERNAL_CACHE_LOCK_TIMEOUT(self):
+        """
+        Lifetime of the cross-worker lock held while one worker calls the provider.
+        """
+        return self._setting("SEARCH_EXTERNAL_CACHE_LOCK_TIMEOUT", 10)
+
+    @property
+    def SEARCH_EXTERNAL_CACHE_WAIT_TIMEOUT(self):
+        """
+        Seconds a worker waits for the value fetched by the lock holder before calling itself.
+        """
+        return self._setting("SEARCH_EXTERNAL_CACHE_WAIT_TIMEOUT", 4)
+
+    @property
+    def SEARCH_EXTERNAL_POOL_SIZE(self):
+        """
+        Keep-alive connections kept open to the external provider per process.
+        """
+        return self._setting("SEARCH_EXTERNAL_POOL_SIZE", 10)
+
+    @property
+    def SEARCH_EXTERNAL_CONNECT_TIMEOUT(self):
+        return self._setting("SEARCH_EXTERNAL_CONNECT_TIMEOUT", 1.0)
+
+    @property
+    def SEARCH_EXTERNAL_READ_TIMEOUT(self):
+        return self._setting("SEARCH_EXTERNAL_READ_TIMEOUT", 3.0)
+
+    @property
+    def SEARCH_EXTERNAL_MAX_RETRIES(self):
+        """
+        Retries of a failed external call (connection errors, timeouts, 429 and 5xx).
+        """
+        return self._setting("SEARCH_EXTERNAL_MAX_RETRIES", 2)
+
+    @property
+    def SEARCH_EXTERNAL_BACKOFF_BASE(self):
+        return self._setting("SEARCH_EXTERNAL_BACKOFF_BASE", 0.1)
+
+    @property
+    def SEARCH_EXTERNAL_BACKOFF_CAP(self):
+        return self._setting("SEARCH_EXTERNAL_BACKOFF_CAP", 1.0)
+
+    @property
+    def SEARCH_EXTERNAL_RETRY_BUDGET_RATIO(self):
+        """
+        Retries allowed per first attempt over a sliding window.
+        """
+        return self._setting("SEARCH_EXTERNAL_RETRY_BUDGET_RATIO", 0.2)
+
+    @property
+    def SEARCH_EXTERNAL_BREAKER_FAILURE_RATE(self):
+        """
+        Error rate (0..1) that opens the circuit breaker of the external provider.
+        """
+        return self._setting("SEARCH_EXTERNAL_BREAKER_FAILURE_RATE", 0.5)
+
+    @property
+    def SEARCH_EXTERNAL_BREAKER_MINIMUM_CALLS(self):
+        return self._setting("SEARCH_EXTERNAL_BREAKER_MINIMUM_CALLS", 10)
+
+    @property
+    def SEARCH_EXTERNAL_BREAKER_WINDOW(self):
+        return self._setting("SEARCH_EXTERNAL_BREAKER_WINDOW", 60)
+
+    @property
+    def SEARCH_EXTERNAL_BREAKER_RESET_TIMEOUT(self):
+        """
+        Seconds the breaker stays open before a trial call is let through.
+        """
+        return self._setting("SEARCH_EXTERNAL_BREAKER_RESET_TIMEOUT", 30)
+
+    @property
+    def SEARCH_EXTERNAL_BATCH_MAX_SIZE(self):
+        """
+        Maximum number of video ids of one batch lookup.
+        """
+        return self._setting("SEARCH_EXTERNAL_BATCH_MAX_SIZE", 50)
+
+    @property
+    def SEARCH_EXTERNAL_BATCH_THROTTLE_RATE(self):
+        """
+        Batch lookups allowed per user (DRF rate, e.g. "20/hour"); None does not throttle.
+        """
+        return self._setting("SEARCH_EXTERNAL_BATCH_THROTTLE_RATE", "20/hour")
+
+    @property
+    def SEARCH_EXTERNAL_BATCH_CONCURRENCY(self):
+        """
+        Provider calls in flight at once for one batch lookup.
+        """
+        return self._setting("SEARCH_EXTERNAL_BATCH_CONCURRENCY", 8)
+
+    @property
+    def SEARCH_EXTERNAL_BATCH_DEADLINE(self):
+        """
+        Seconds after which a batch lookup returns with whatever has answered.
+        """
+        return self._setting("SEARCH_EXTERNAL_BATCH_DEADLINE", 5.0)
+
+    @property
+    def SEARCH_ASYNC_DEADLINE(self):
+        """
+        Seconds the async search endpoint may spend on one request.
+        """
+        return self._setting("SEARCH_ASYNC_DEADLINE", 4.0)
+
+    @property
+    def SEARCH_ASYNC_HEDGE_DELAY(self):
+        """
+        Head start of internal search before the external lookup is started in parallel.
+        """
+        return self._setting("SEARCH_ASYNC_HEDGE_DELAY", 0.15)
+
+    @property
+    def SEARCH_ANALYTICS_ENABLED(self):
+        """
+        Record searches (normalized query, source, result count, latency) into SearchQueryStat.
+        """
+        return self._setting("SEARCH_ANALYTICS_ENABLED", True)
+
+    @property
+    def SEARCH_ANALYTICS_FLUSH_INTERVAL(self):
+        """
+        Seconds between two batched writes of the recorded searches.
+        """
+        return self._setting("SEARCH_ANALYTICS_FLUSH_INTERVAL", 10.0)
+
+    @property
+    def SEARCH_ANALYTICS_MAX_PENDING(self):
+        """
+        Distinct pending (day, query, source) keys that trigger an early flush.
+        """
+        return self._setting("SEARCH_ANALYTICS_MAX_PENDING", 5000)
+
+    @property
+    def SEARCH_ANALYTICS_WINDOW_DAYS(self):
+        """
+        Days of statistics the nightly pre-warm and zero-result report look at.
+        """
+        return self._setting("SEARCH_ANALYTICS_WINDOW_DAYS", 7)
+
+    @property
+    def SEARCH_ANALYTICS_PREWARM_TOP(self):
+        """
+        Number of top queries whose first page is pre-computed into the result cache every night.
+        """
+        return self._setting("SEARCH_ANALYTICS_PREWARM_TOP", 100)
+
+    @property
+    def SEARCH_ANALYTICS_PREWARM_TIMEOUT(self):
+        """
+        Lifetime of pre-warmed pages; they still go away at the next catalog change.
+        """
+        return self._setting("SEARCH_ANALYTICS_PREWARM_TIMEOUT", 60 * 60 * 24)
+
+    @property
+    def SEARCH_ANALYTICS_REPORT_TOP(self):
+        """
+        Number of queries listed by the zero-result report.
+        """
+        return self._setting("SEARCH_ANALYTICS_REPORT_TOP", 50)
+
+    @property
+    def SEARCH_INDEX_ASYNC(self):
+        """
+        Apply committed index updates on a Celery worker; when off, right after the commit in-process.
+        """
+        return self._setting("SEARCH_INDEX_ASYNC", True)
+
+    @property
+    def SEARCH_INDEX_BATCH_SIZE(self):
+        """
+        Maximum number of programs and of episodes per index update task.
+        """
+        return self._setting("SEARCH_INDEX_BATCH_SIZE", 500)
+
+    @property
+    def SEARCH_INDEX_CHANGES_POLL_INTERVAL(self):
+        """
+        Seconds between checks for index update batches applied by another process.
+        """
+        return self._setting("SEARCH_INDEX_CHANGES_POLL_INTERVAL", 5)
+
+    @property
+    def SEARCH_INDEX_CHANGES_TIMEOUT(self):
+        """
+        Seconds the ids of an applied batch stay readable by the other processes.
+        """
+        return self._setting("SEARCH_INDEX_CHANGES_TIMEOUT", 60 * 60)
+
+    @property
+    def SEARCH_INDEX_CHANGES_MAX_REPLAY(self):
+        """
+        Batches a process replays at most; further behind, it rebuilds from the database.
+        """
+        return self._setting("SEARCH_INDEX_CHANGES_MAX_REPLAY", 50)
+
+    @property
+    def SEARCH_RELATED_TOP_K(self):
+        """
+        Related episodes and related programs kept per item.
+        """
+        return self._setting("SEARCH_RELATED_TOP_K", 10)
+
+    @property
+    def SEARCH_RELATED_MIN_SCORE(self):
+        """
+        Minimum cosine similarity for an item to be listed as related.
+        """
+        return self._setting("SEARCH_RELATED_MIN_SCORE", 0.05)
+
+    @property
+    def SEARCH_RELATED_MAX_DF(self):
+        """
+        Terms found in more than this share of the items are ignored when relating them.
+        """
+        return self._setting("SEARCH_RELATED_MAX_DF", 0.5)
+
+    @property
+    def SEARCH_RELATED_BLOCK_BUDGET(self):
+        """
+        Similarity scores held in memory at once (8 bytes each) while computing neighbours.
+        """
+        return self._setting("SEARCH_RELATED_BLOCK_BUDGET", 8_000_000)
+
+
+app_settings = AppSettings()
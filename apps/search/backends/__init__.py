@@ -0,0 +1,41 @@
+# apps/search/backends/__init__.py
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from ..app_settings import app_settings
+
+_backend = None
+
+
+def get_backend_path() -> str:
+    """
+    Resolve the configured backend; when SEARCH_BACKEND is empty (the default),
+    use the best database backend for the vendor.
+    """
+    if app_settings.SEARCH_BACKEND:
+        return app_settings.SEARCH_BACKEND
+
+    if connection.vendor == "postgresql":
+        return "apps.search.backends.postgres.PostgresSearchBackend"
+
+    return "apps.search.backends.database.DatabaseSearchBackend"
+
+
+def get_search_backend():
+    """
+    Return the process-wide search backend instance.
+    """
+    global _backend
+
+    if _backend is None:
+        _backend = import_string(get_backend_path())()
+
+    return _backend
+
+
+def reset_search_backend() -> None:
+    """
+    Drop the process-wide instance, e.g. after the search settings changed.
+    """
+    global _backend
+    _backend = None
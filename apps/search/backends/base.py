@@ -0,0 +1,223 @@
+# apps/search/backends/base.py
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+
+from apps.program.models import Program
+from apps.episode.models import Episode
+
+from ..results import SearchResultPage, SortKey
+
+PROGRAM_FIELDS = (
+    "id",
+    "title",
+    "short_description",
+    "slug",
+    "cover_image_url",
+    "type",
+    "language",
+    "publish_date",
+)
+
+EPISODE_FIELDS = (
+    "id",
+    "title",
+    "short_description",
+    "slug",
+    "thumbnail_url",
+    "media_type",
+    "publish_date",
+    "program__slug",
+)
+
+
+def program_result(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "kind": "program",
+        "id": row["id"],
+        "title": row["title"],
+        "description": row["short_description"],
+        "slug": row["slug"],
+        "cover_image_url": row["cover_image_url"],
+        "type": row["type"],
+        "language": row["language"],
+        "publish_date": row["publish_date"],
+    }
+
+
+def episode_result(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "kind": "episode",
+        "id": row["id"],
+        "title": row["title"],
+        "description": row["short_description"],
+        "slug": row["slug"],
+        "thumbnail_url": row["thumbnail_url"],
+        "media_type": row["media_type"],
+        "publish_date": row["publish_date"],
+        "program_slug": row["program__slug"],
+    }
+
+
+class BulkIndexer:
+    """
+    Receives the rows read by one `reindex_search` worker (see `apps.search.reindex`).
+
+    - `program_values`/`episode_values`: the values() projection rows are read with,
+      so no model instance is ever built.
+    - `state()` is the picklable result of the worker (None when everything
+      is already written), `merge()` adds it to the indexer of the parent process,
+      which is finally handed to `BaseSearchBackend.finish_reindex`.
+    """
+    program_values: Tuple[str, ...] = ("id",)
+    episode_values: Tuple[str, ...] = ("id",)
+
+    def __init__(self, backend: "BaseSearchBackend", state: Any = None) -> None:
+        self.backend = backend
+
+    def programs(self):
+        return self.backend.published_programs()
+
+    def episodes(self):
+        return self.backend.published_episodes()
+
+    def add_programs(self, rows: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def add_episodes(self, rows: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def state(self) -> Any:
+        return None
+
+    def merge(self, state: Any) -> None:
+        return None
+
+
+class BaseSearchBackend:
+    """
+    Contract every search engine behind SearchService has to fulfil.
+
+    Index hooks are no-ops by default so engines that read straight
+    from the database only need to implement `search`.
+    """
+
+    def index_program(self, program: Program) -> None:
+        return None
+
+    def remove_program(self, program_id) -> None:
+        return None
+
+    def index_episode(self, episode: Episode) -> None:
+        return None
+
+    def remove_episode(self, episode_id) -> None:
+        return None
+
+    def index_programs(self, programs: Iterable[Program]) -> None:
+        """
+        Batch variants of the hooks, used by the index update worker.
+        Engines override them when a batch is cheaper than one call per row.
+        """
+        for program in programs:
+            self.index_program(program)
+
+    def remove_programs(self, program_ids: Iterable) -> None:
+        for program_id in program_ids:
+            self.remove_program(program_id)
+
+    def index_episodes(self, episodes: Iterable[Episode]) -> None:
+        for episode in episodes:
+            self.index_episode(episode)
+
+    def remove_episodes(self, episode_ids: Iterable) -> None:
+        for episode_id in episode_ids:
+            self.remove_episode(episode_id)
+
+    def refresh_local(self, programs: Iterable[Program], removed_program_ids: Iterable,
+                      episodes: Iterable[Episode], removed_episode_ids: Iterable) -> None:
+        """
+        Bring the in-process state of the engine (e.g. an in-memory index)
+        up to date with a batch another process applied (see `IndexChangeFeed`).
+        Nothing to do for engines that only read shared storage.
+        """
+        return None
+
+    def reload_local(self) -> None:
+        """
+        Rebuild the in-process state of the engine from the database,
+        when batches applied by other processes were missed.
+        """
+        return None
+
+    # Engines that store documents set a BulkIndexer subclass, see `reindex_search`.
+    bulk_indexer_class: Optional[Type[BulkIndexer]] = None
+
+    def bulk_indexer(self, state: Any = None) -> BulkIndexer:
+        return self.bulk_indexer_class(self, state)
+
+    def finish_reindex(self, indexer: BulkIndexer) -> None:
+        """
+        Publish the result of a bulk reindex once every worker is done.
+        """
+        return None
+
+    def rebuild(self) -> int:
+        """
+        Recompute everything the engine derives from the rows, e.g. after a backfill.
+        Returns the number of documents processed.
+        """
+        return 0
+
+    def search(self, query: str, limit: int = 10, after: Optional[SortKey] = None) -> SearchResultPage:
+        """
+        Return one page of the merged Program/Episode stream, ordered by
+        relevance then publish date, starting right after the `after` position.
+        """
+        raise NotImplementedError
+
+    def fuzzy_search(self, query: str, limit: int = 10, after: Optional[SortKey] = None) -> SearchResultPage:
+        """
+        Typo-tolerant variant of `search`, used when the exact search finds nothing.
+        """
+        return SearchResultPage()
+
+    async def asearch(self, query: str, limit: int = 10, after: Optional[SortKey] = None) -> SearchResultPage:
+        """
+        `search` for async views. Engines on the async ORM override it,
+        the default runs `search` in the sync thread.
+        """
+        return await sync_to_async(self.search)(query, limit=limit, after=after)
+
+    async def afuzzy_search(self, query: str, limit: int = 10, after: Optional[SortKey] = None) -> SearchResultPage:
+        return await sync_to_async(self.fuzzy_search)(query, limit=limit, after=after)
+
+    def facets(self, query: str) -> Dict[str, Counter]:
+        """
+        Number of matches of `query` per category, program type, language
+        and episode media type (see `apps.search.facets`).
+        Empty when the engine cannot count them.
+        """
+        return {}
+
+    async def afacets(self, query: str) -> Dict[str, Counter]:
+        return await sync_to_async(self.facets)(query)
+
+    def published_programs(self):
+        """
+        Programs that are visible to search.
+        """
+        return Program.objects.filter(Q(is_active=True), Q(is_published=True))
+
+    def published_episodes(self):
+        """
+        Episodes that are visible to search.
+        """
+        return Episode.objects.filter(
+            Q(is_active=True),
+            Q(is_published=True),
+            Q(program__is_active=True),
+            Q(program__is_published=True),
+        )
@@ -0,0 +1,392 @@
+# apps/search/backends/database.py
+import datetime
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from django.db import connections
+from django.db.models import Count, DateField, DateTimeField, FloatField, Q, Value
+from django.db.models.functions import Coalesce, TruncSecond
+
+from ..app_settings import app_settings
+from ..documents import EPISODE_FACET_FIELDS, PROGRAM_FACET_FIELDS, document_key, sort_timestamp
+from ..facets import accumulate, empty_counts
+from ..fuzzy import TrigramIndex
+from ..indexing import index_changes
+from ..normalization import normalize
+from ..results import SearchHit, SearchResultPage, SortKey, paginate_hits
+from .base import (
+    BaseSearchBackend,
+    EPISODE_FIELDS,
+    PROGRAM_FIELDS,
+    episode_result,
+    program_result,
+)
+
+logger = logging.getLogger(__name__)
+
+EPOCH_DATE = datetime.date(1970, 1, 1)
+EPOCH_DATETIME = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def program_published():
+    return Coalesce("publish_date", Value(EPOCH_DATE), output_field=DateField())
+
+
+def episode_published():
+    return TruncSecond(
+        Coalesce("publish_date", Value(EPOCH_DATETIME), output_field=DateTimeField()),
+        tzinfo=datetime.timezone.utc,
+    )
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """
+    Portable fallback that works on every database (SQLite included):
+
+    - Looks into Program and Episode models.
+    - Searches the normalized shadow columns (see `apps.search.normalization`)
+      with the normalized query, so no per-row case folding is needed.
+    - Both tables are read with keyset (search-after) pagination and merged
+      into one ordering, so a deep page costs the same as the first one.
+    - Fuzzy matching runs on a pure-Python trigram index of the titles,
+      built on first use and kept in sync by the SearchService hooks, and
+      with the batches applied by other processes (see `IndexChangeFeed`).
+      Every SEARCH_TRIGRAM_REBUILD_INTERVAL seconds it is rebuilt in the
+      background, which catches up with writes applied elsewhere when the
+      feed cannot be shared (process-local cache).
+    """
+
+    def __init__(self) -> None:
+        self._trigram_lock = threading.Lock()
+        self._trigram_build_lock = threading.Lock()
+        self._trigrams: Optional[TrigramIndex] = None
+        self._trigrams_built_at = 0.0
+        # Hook updates made while a rebuild runs, replayed on the new index.
+        self._trigram_changes: Optional[Dict[str, Optional[str]]] = None
+
+    # SearchService hooks
+
+    @staticmethod
+    def _apply_trigram(trigrams: TrigramIndex, key: str, title: Optional[str]) -> None:
+        if title is None:
+            trigrams.remove(key)
+        else:
+            trigrams.add(key, title)
+
+    def _update_trigrams(self, key: str, title: Optional[str]) -> None:
+        with self._trigram_lock:
+            if self._trigram_changes is not None:
+                self._trigram_changes[key] = title
+            if self._trigrams is not None:
+                self._apply_trigram(self._trigrams, key, title)
+
+    def index_program(self, program) -> None:
+        self._update_trigrams(document_key("program", program.pk), program.title)
+
+    def remove_program(self, program_id) -> None:
+        self._update_trigrams(document_key("program", program_id), None)
+
+    def index_episode(self, episode) -> None:
+        self._update_trigrams(document_key("episode", episode.pk), episode.title)
+
+    def remove_episode(self, episode_id) -> None:
+        self._update_trigrams(document_key("episode", episode_id), None)
+
+    def refresh_local(self, programs, removed_program_ids, episodes, removed_episode_ids) -> None:
+        for program in programs:
+            self.index_program(program)
+        for program_id in removed_program_ids:
+            self.remove_program(program_id)
+        for episode in episodes:
+            self.index_episode(episode)
+        for episode_id in removed_episode_ids:
+            self.remove_episode(episode_id)
+
+    def reload_local(self) -> None:
+        # Rebuilt in the background at the next fuzzy search, which keeps using the current index meanwhile.
+        self._trigrams_built_at = float("-inf")
+
+    def finish_reindex(self, indexer) -> None:
+        with self._trigram_lock:
+            self._trigrams = None
+
+    def rebuild(self) -> int:
+        with self._trigram_lock:
+            self._trigrams = None
+        return len(self.trigrams)
+
+    def build_trigrams(self) -> TrigramIndex:
+        trigrams = TrigramIndex()
+        for pk, title in self.published_programs().values_list("id", "title").iterator():
+            trigrams.add(document_key("program", pk), title)
+        for pk, title in self.published_episodes().values_list("id", "title").iterator():
+            trigrams.add(document_key("episode", pk), title)
+        return trigrams
+
+    def _rebuild_trigrams(self) -> TrigramIndex:
+        """
+        Build a new index aside and swap it in; the caller holds `_trigram_build_lock`.
+        """
+        with self._trigram_lock:
+            self._trigram_changes = {}
+        try:
+            trigrams = self.build_trigrams()
+        except BaseException:
+            with self._trigram_lock:
+                self._trigram_changes = None
+            raise
+
+        with self._trigram_lock:
+            for key, title in self._trigram_changes.items():
+                self._apply_trigram(trigrams, key, title)
+            self._trigram_changes = None
+            self._trigrams = trigrams
+            self._trigrams_built_at = time.monotonic()
+        return trigrams
+
+    def _rebuild_trigrams_in_background(self) -> None:
+        try:
+            self._rebuild_trigrams()
+        except Exception:
+            logger.exception("Could not rebuild the trigram index.")
+            # Retried after the next interval, not on every search.
+            self._trigrams_built_at = time.monotonic()
+        finally:
+            self._trigram_build_lock.release()
+            connections.close_all()
+
+    @property
+    def trigrams(self) -> TrigramIndex:
+        trigrams = self._trigrams
+        age = time.monotonic() - self._trigrams_built_at
+        if trigrams is not None and age <= app_settings.SEARCH_TRIGRAM_REBUILD_INTERVAL:
+            return trigrams
+
+        if trigrams is None:
+            # Nothing to match against yet: wait for the first build.
+            with self._trigram_build_lock:
+                trigrams = self._trigrams
+                return trigrams if trigrams is not None else self._rebuild_trigrams()
+
+        # Expired: keep matching against it while a background thread rebuilds.
+        if self._trigram_build_lock.acquire(blocking=False):
+            try:
+                threading.Thread(
+                    target=self._rebuild_trigrams_in_background, name="trigram-rebuild", daemon=True
+                ).start()
+            except BaseException:
+                self._trigram_build_lock.release()
+                raise
+        return trigrams
+
+    # Queries
+
+    def search(self, query: str, limit: int = 10, after: Optional[SortKey] = None) -> SearchResultPage:
+        if not query:
+            return SearchResultPage()
+
+        program_qs = self.annotate_programs(
+            self.filter_programs(self.published_programs(), query), self.score_expression(query)
+        )
+        episode_qs = self.annotate_episodes(
+            self.filter_episodes(self.published_episodes(), query), self.score_expression(query)
+        )
+        return self.paginate_querysets(program_qs, episode_qs, limit, after)
+
+    async def asearch(self, query: str, limit: int = 10, after: Optional[SortKey] = None) -> SearchResultPage:
+        if not query:
+            return SearchResultPage()
+
+        program_qs = self.annotate_programs(
+            self.filter_programs(self.published_programs(), query), self.score_expression(query)
+        )
+        episode_qs = self.annotate_episodes(
+            self.filter_episodes(self.published_episodes(), query), self.score_expression(query)
+        )
+        return await self.apaginate_querysets(program_qs, episode_qs, limit, after)
+
+    def facets(self, query: str):
+        """
+        One grouped query per entity: matches are counted per combination of
+        facet values and summed up here, instead of one COUNT per facet value.
+        """
+        counts = empty_counts()
+        if not query:
+            return counts
+
+        program_fields = list(PROGRAM_FACET_FIELDS.values())
+        accumulate(
+            counts,
+            self.filter_programs(self.published_programs(), query)
+            .values(*program_fields).annotate(count=Count("id")).order_by(),
+            PROGRAM_FACET_FIELDS,
+        )
+        episode_fields = list(EPISODE_FACET_FIELDS.values())
+        accumulate(
+            counts,
+            self.filter_episodes(self.published_episodes(), query)
+            .values(*episode_fields).annotate(count=Count("id")).order_by(),
+            EPISODE_FACET_FIELDS,
+        )
+        return counts
+
+    def fuzzy_search(self, query: str, limit: int = 10, after: Optional[SortKey] = None) -> SearchResultPage:
+        if not query:
+            return SearchResultPage()
+
+        index_changes.poll()
+        matches = dict(
+            self.trigrams.search(
+                query,
+                threshold=app_settings.SEARCH_TRIGRAM_SIMILARITY_THRESHOLD,
+                limit=app_settings.SEARCH_FUZZY_MAX_MATCHES,
+            )
+        )
+        program_ids = [key.split(":", 1)[1] for key in matches if key.startswith("program:")]
+        episode_ids = [key.split(":", 1)[1] for key in matches if key.startswith("episode:")]
+
+        # Matches are resolved by primary key, never by scanning the tables.
+        program_rows = (
+            self.published_programs()
+            .filter(pk__in=program_ids)
+            .annotate(published=program_published())
+            .values(*PROGRAM_FIELDS, "published")
+        )
+        episode_rows = (
+            self.published_episodes()
+            .filter(pk__in=episode_ids)
+            .annotate(published=episode_published())
+            .values(*EPISODE_FIELDS, "published")
+        )
+
+        hits = []
+        for kind, rows, to_result in (
+            ("program", program_rows, program_result),
+            ("episode", episode_rows, episode_result),
+        ):
+            for row in rows:
+                key = document_key(kind, row["id"])
+                sort_key = SortKey(matches[key], sort_timestamp(row["published"]), key)
+                hits.append(SearchHit(sort_key, to_result(row)))
+
+        total = len(hits)
+        if after is not None:
+            hits = [hit for hit in hits if hit.sort_key.is_after(after)]
+
+        return paginate_hits(hits, limit, total=total)
+
+    def paginate_querysets(self, program_qs, episode_qs, limit: int, after: Optional[SortKey]) -> SearchResultPage:
+        """
+        Read both annotated querysets (`score`, `published`) after the cursor and merge them.
+        """
+        limit = max(limit, 1)
+
+        # Counting is only paid for on the first page, later pages keep the client's total.
+        total = None if after else program_qs.count() + episode_qs.count()
+
+        program_rows, episode_rows = self.window_querysets(program_qs, episode_qs, limit, after)
+        return self.merge_rows(program_rows, episode_rows, limit, total)
+
+    async def apaginate_querysets(self, program_qs, episode_qs, limit: int, after: Optional[SortKey]) -> SearchResultPage:
+        """
+        `paginate_querysets` on the async ORM.
+        """
+        limit = max(limit, 1)
+        total = None if after else await program_qs.acount() + await episode_qs.acount()
+
+        program_qs, episode_qs = self.window_querysets(program_qs, episode_qs, limit, after)
+        program_rows = [row async for row in program_qs]
+        episode_rows = [row async for row in episode_qs]
+        return self.merge_rows(program_rows, episode_rows, limit, total)
+
+    def window_querysets(self, program_qs, episode_qs, limit: int, after: Optional[SortKey]):
+        """
+        The `limit + 1` first rows of each table after the cursor, as values() querysets.
+        """
+        if after is not None:
+            program_qs = program_qs.filter(self.after_filter("program", after))
+            episode_qs = episode_qs.filter(self.after_filter("episode", after))
+
+        program_rows = (
+            program_qs.select_related("category")
+            .order_by("-score", "-published", "id")
+            .values(*PROGRAM_FIELDS, "score", "published")[:limit + 1]
+        )
+        episode_rows = (
+            episode_qs.select_related("program", "program__category")
+            .order_by("-score", "-published", "id")
+            .values(*EPISODE_FIELDS, "score", "published")[:limit + 1]
+        )
+        return program_rows, episode_rows
+
+    def merge_rows(self, program_rows, episode_rows, limit: int, total: Optional[int]) -> SearchResultPage:
+        hits = [self.make_hit("program", row, program_result(row)) for row in program_rows]
+        hits += [self.make_hit("episode", row, episode_result(row)) for row in episode_rows]
+
+        return paginate_hits(hits, limit, total=total)
+
+    def make_hit(self, kind: str, row, payload) -> SearchHit:
+        sort_key = SortKey(
+            float(row["score"] or 0.0),
+            sort_timestamp(row["published"]),
+            document_key(kind, row["id"]),
+        )
+        return SearchHit(sort_key, payload)
+
+    def filter_programs(self, queryset, query: str):
+        # Programs: search title + short_description + long_description
+        return queryset.filter(self.normalized_filter(query))
+
+    def filter_episodes(self, queryset, query: str):
+        # Episodes: search title + short_description + body
+        return queryset.filter(self.normalized_filter(query))
+
+    def normalized_filter(self, query: str) -> Q:
+        query = normalize(query)
+        return Q(search_title__contains=query) | Q(search_summary__contains=query) | Q(search_body__contains=query)
+
+    def score_expression(self, query: str):
+        """
+        Relevance of a row. Substring matching has no notion of relevance, so every match scores 0
+        and the order falls back to the publish date.
+        """
+        return Value(0.0, output_field=FloatField())
+
+    def annotate_programs(self, queryset, score):
+        return queryset.annotate(score=score, published=program_published())
+
+    def annotate_episodes(self, queryset, score):
+        return queryset.annotate(score=score, published=episode_published())
+
+    def after_filter(self, kind: str, after: SortKey) -> Q:
+        """
+        Rows strictly after `after` in the (score desc, published desc, key asc) ordering.
+        `published` is compared in whole seconds, the unit shared by both tables.
+        """
+        after_kind, after_id = after.key.split(":", 1)
+        seconds = after.published
+
+        if kind == "program":
+            # A date sorts as its midnight: strictly older means before the first midnight >= cursor.
+            days = -(-seconds // 86400)
+            older = Q(published__lt=EPOCH_DATE + datetime.timedelta(days=days))
+            same = Q(published=EPOCH_DATE + datetime.timedelta(days=days)) if seconds % 86400 == 0 else Q(pk__in=[])
+        else:
+            moment = EPOCH_DATETIME + datetime.timedelta(seconds=seconds)
+            older = Q(published__lt=moment)
+            same = Q(published=moment)
+
+        if kind == after_kind:
+            tie = Q(id__gt=after_id)
+        elif kind > after_kind:
+            tie = Q()
+        else:
+            tie = Q(pk__in=[])
+
+        return (
+            Q(score__lt=after.score)
+            | (Q(score=after.score) & older)
+            | (Q(score=after.score) & same & tie)
+        )
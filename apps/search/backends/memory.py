@@ -0,0 +1,328 @@
+# apps/search/backends/memory.py
+import contextlib
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+from apps.program.models import Program
+from apps.episode.models import Episode
+
+from ..app_settings import app_settings
+from ..documents import (
+    EPISODE_VALUES,
+    PROGRAM_VALUES,
+    document_key,
+    episode_document,
+    episode_row,
+    iter_episode_documents,
+    iter_program_documents,
+    program_document,
+    program_row,
+)
+from ..index import InvertedIndex, snapshot_lock
+from ..results import SearchHit, SearchResultPage, SortKey, paginate_hits
+from .base import BaseSearchBackend, BulkIndexer
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBulkIndexer(BulkIndexer):
+    """
+    Every worker builds an index of its own rows; the parent merges them
+    into a fresh index that replaces the snapshot at the end. Updates applied
+    to the old snapshot while the reindex runs are only kept if the rows
+    were read after them.
+    """
+    program_values = PROGRAM_VALUES
+    episode_values = EPISODE_VALUES
+
+    def __init__(self, backend, state=None) -> None:
+        super().__init__(backend, state)
+        if state is None:
+            self.index = InvertedIndex(
+                app_settings.SEARCH_INDEX_FIELD_WEIGHTS,
+                app_settings.SEARCH_INDEX_MAX_PREFIX_EXPANSIONS,
+            )
+        else:
+            self.index = InvertedIndex.from_state(state, app_settings.SEARCH_INDEX_MAX_PREFIX_EXPANSIONS)
+
+    def add_programs(self, rows) -> None:
+        self.index.add_many(map(program_document, rows))
+
+    def add_episodes(self, rows) -> None:
+        self.index.add_many(map(episode_document, rows))
+
+    def state(self):
+        return self.index.to_state()
+
+    def merge(self, state) -> None:
+        self.index.merge(InvertedIndex.from_state(state))
+
+
+class IndexJournal:
+    """
+    Append-only log of the changes made on top of one snapshot, stored next
+    to it as `<snapshot>.<journal id>.log`. A write appends one small record
+    instead of rewriting the snapshot; workers replay the records they have
+    not seen yet. A new snapshot starts a new journal, so a worker never
+    replays records that belong to an older one.
+
+    Records are pickled ("add", [SearchDocument, ...]) / ("remove", [key, ...]).
+    """
+
+    def __init__(self, snapshot_path: str, journal_id: str) -> None:
+        self.path = f"{snapshot_path}.{journal_id}.log"
+
+    def append(self, records: List[Tuple[str, list]]) -> int:
+        """
+        Write the records; returns the end offset of the journal.
+        """
+        data = b"".join(pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL) for record in records)
+        with open(self.path, "ab") as handle:
+            handle.write(data)
+            return handle.tell()
+
+    def read(self, offset: int) -> Tuple[List[Tuple[str, list]], int]:
+        """
+        Complete records after `offset`, and the offset after the last of them.
+        A record still being written is left for the next read.
+        """
+        records = []
+        try:
+            with open(self.path, "rb") as handle:
+                handle.seek(offset)
+                while True:
+                    try:
+                        records.append(pickle.load(handle))
+                    except (EOFError, ValueError, pickle.UnpicklingError):
+                        break
+                    offset = handle.tell()
+        except OSError:
+            pass
+        return records, offset
+
+    def delete(self) -> None:
+        with contextlib.suppress(OSError):
+            os.unlink(self.path)
+
+
+def apply_record(index: InvertedIndex, record: Tuple[str, list]) -> None:
+    operation, payload = record
+    if operation == "add":
+        index.add_many(payload)
+    else:
+        for key in payload:
+            index.remove(key)
+
+
+class MemorySearchBackend(BaseSearchBackend):
+    """
+    Search engine backed by an in-process inverted index.
+
+    - The receivers keep the index up to date incrementally through SearchService.
+    - Changes are appended to a journal next to the snapshot file; the snapshot
+      itself is only rewritten once the journal outgrows SEARCH_INDEX_JOURNAL_MAX_BYTES,
+      so a write costs one small append, not a dump of the whole index.
+    - A restarted worker loads the snapshot plus its journal instead of
+      rebuilding the index from the database.
+    - Workers replay the journal entries written by other workers (or by Celery)
+      on the fly. Snapshot and journal live on local disk: every worker has
+      to run on the same host (or share the SEARCH_INDEX_PATH directory).
+    """
+
+    bulk_indexer_class = MemoryBulkIndexer
+
+    def __init__(self) -> None:
+        self.path = app_settings.SEARCH_INDEX_PATH
+        self._lock = threading.RLock()
+        self._index: Optional[InvertedIndex] = None
+        self._snapshot_mtime: Optional[float] = None
+        self._journal_offset = 0
+        self._checked_at = 0.0
+
+    # Index lifecycle
+
+    @property
+    def index(self) -> InvertedIndex:
+        with self._lock:
+            if self._index is None:
+                self._load()
+            elif time.monotonic() - self._checked_at >= app_settings.SEARCH_INDEX_RELOAD_INTERVAL:
+                self._reload_if_stale()
+            return self._index
+
+    def _get_snapshot_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def journal(self, index: InvertedIndex) -> IndexJournal:
+        return IndexJournal(self.path, index.journal_id)
+
+    def _load(self) -> None:
+        started = time.monotonic()
+        index = InvertedIndex.load(self.path, app_settings.SEARCH_INDEX_MAX_PREFIX_EXPANSIONS)
+
+        if index is None:
+            with snapshot_lock(self.path):
+                # Another worker may have built it while we were waiting for the lock.
+                index = InvertedIndex.load(self.path, app_settings.SEARCH_INDEX_MAX_PREFIX_EXPANSIONS)
+                if index is None:
+                    self._save_snapshot(self.build())
+                    logger.info("Search index built with %s documents", len(self._index))
+                    self._checked_at = time.monotonic()
+                    return
+
+        self._use_snapshot(index)
+        logger.info(
+            "Search index loaded with %s documents in %.1f ms",
+            len(index),
+            (time.monotonic() - started) * 1000,
+        )
+
+    def _use_snapshot(self, index: InvertedIndex) -> None:
+        self._index = index
+        self._snapshot_mtime = self._get_snapshot_mtime()
+        self._journal_offset = 0
+        self._replay_journal()
+        self._checked_at = time.monotonic()
+
+    def _replay_journal(self) -> None:
+        records, self._journal_offset = self.journal(self._index).read(self._journal_offset)
+        for record in records:
+            apply_record(self._index, record)
+
+    def _reload_if_stale(self) -> None:
+        self._checked_at = time.monotonic()
+        mtime = self._get_snapshot_mtime()
+        if mtime is not None and mtime != self._snapshot_mtime:
+            index = InvertedIndex.load(self.path, app_settings.SEARCH_INDEX_MAX_PREFIX_EXPANSIONS)
+            if index is not None:
+                self._use_snapshot(index)
+                return
+        self._replay_journal()
+
+    def _save_snapshot(self, index: InvertedIndex) -> None:
+        """
+        Write `index` as the new snapshot with an empty journal; the caller holds the snapshot lock.
+        """
+        previous = self.journal(self._index) if self._index is not None else None
+        index.journal_id = uuid.uuid4().hex
+        index.save(self.path)
+        self._index = index
+        self._snapshot_mtime = self._get_snapshot_mtime()
+        self._journal_offset = 0
+        if previous is not None:
+            previous.delete()
+
+    def build(self) -> InvertedIndex:
+        """
+        Rebuild the whole index from the database.
+        """
+        index = InvertedIndex(
+            app_settings.SEARCH_INDEX_FIELD_WEIGHTS,
+            app_settings.SEARCH_INDEX_MAX_PREFIX_EXPANSIONS,
+        )
+        index.add_many(iter_program_documents(self.published_programs()))
+        index.add_many(iter_episode_documents(self.published_episodes()))
+        return index
+
+    def rebuild(self) -> int:
+        index = self.build()
+        with self._lock, snapshot_lock(self.path):
+            self._save_snapshot(index)
+        return len(index)
+
+    def finish_reindex(self, indexer: MemoryBulkIndexer) -> None:
+        with self._lock, snapshot_lock(self.path):
+            self._save_snapshot(indexer.index)
+
+    def _write(self, record: Tuple[str, list]) -> None:
+        """
+        Apply a change on top of the latest snapshot and journal, then append
+        it to the journal, holding the snapshot lock so concurrent writers
+        never lose updates.
+        """
+        with self._lock, snapshot_lock(self.path):
+            if self._index is None:
+                self._load()
+            else:
+                self._reload_if_stale()
+            apply_record(self._index, record)
+            self._journal_offset = self.journal(self._index).append([record])
+            if self._journal_offset > app_settings.SEARCH_INDEX_JOURNAL_MAX_BYTES:
+                self._save_snapshot(self._index)
+
+    # SearchService hooks
+
+    def index_program(self, program: Program) -> None:
+        self._write(("add", [program_document(program_row(program))]))
+
+    def remove_program(self, program_id) -> None:
+        self._write(("remove", [document_key("program", program_id)]))
+
+    def index_episode(self, episode: Episode) -> None:
+        self._write(("add", [episode_document(episode_row(episode))]))
+
+    def remove_episode(self, episode_id) -> None:
+        self._write(("remove", [document_key("episode", episode_id)]))
+
+    def index_programs(self, programs) -> None:
+        documents = [program_document(program_row(program)) for program in programs]
+        if documents:
+            self._write(("add", documents))
+
+    def remove_programs(self, program_ids) -> None:
+        keys = [document_key("program", program_id) for program_id in program_ids]
+        if keys:
+            self._write(("remove", keys))
+
+    def index_episodes(self, episodes) -> None:
+        documents = [episode_document(episode_row(episode)) for episode in episodes]
+        if documents:
+            self._write(("add", documents))
+
+    def remove_episodes(self, episode_ids) -> None:
+        keys = [document_key("episode", episode_id) for episode_id in episode_ids]
+        if keys:
+            self._write(("remove", keys))
+
+    # Queries
+
+    def search(self, query: str, limit: int = 10, after: Optional[SortKey] = None) -> SearchResultPage:
+        return self._search(query, limit, after)
+
+    def fuzzy_search(self, query: str, limit: int = 10, after: Optional[SortKey] = None) -> SearchResultPage:
+        return self._search(query, limit, after, fuzzy_threshold=app_settings.SEARCH_TRIGRAM_SIMILARITY_THRESHOLD)
+
+    def facets(self, query: str):
+        """
+        Counted from the facet values kept in the index, over the same matches as `search`.
+        """
+        if not query:
+            return {}
+
+        index = self.index
+        with self._lock:
+            return index.facet_counts(index.search(query))
+
+    def _search(self, query: str, limit: int, after: Optional[SortKey], fuzzy_threshold=None) -> SearchResultPage:
+        if not query:
+            return SearchResultPage()
+
+        index = self.index
+        with self._lock:
+            scores = index.search(query, fuzzy_threshold=fuzzy_threshold)
+            hits = (
+                SearchHit(SortKey(score, int(index.published[key]), key), index.documents[key])
+                for key, score in scores.items()
+            )
+            if after is not None:
+                hits = (hit for hit in hits if hit.sort_key.is_after(after))
+
+            return paginate_hits(hits, limit, total=len(scores))
@@ -0,0 +1,182 @@
+# apps/search/backends/postgres.py
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+from typing import Optional
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import connection, transaction
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+from apps.program.models import Program
+from apps.episode.models import Episode
+
+from ..app_settings import app_settings
+from ..normalization import normalize
+from ..results import SearchResultPage, SortKey
+from .base import BulkIndexer
+from .database import DatabaseSearchBackend
+
+
+class PostgresBulkIndexer(BulkIndexer):
+    """
+    Reindex by recomputing the search vectors of every row, whatever its visibility,
+    reading only the primary key and the content language.
+    """
+    program_values = ("id", "language")
+    episode_values = ("id", "program__language")
+
+    def programs(self):
+        return Program.objects.all()
+
+    def episodes(self):
+        return Episode.objects.all()
+
+    def add_programs(self, rows) -> None:
+        self._update(Program, rows, "language")
+
+    def add_episodes(self, rows) -> None:
+        self._update(Episode, rows, "program__language")
+
+    def _update(self, model, rows, language_field: str) -> None:
+        by_config = defaultdict(list)
+        for row in rows:
+            by_config[self.backend.get_config(row[language_field])].append(row["id"])
+        self.backend.update_vectors(model, by_config)
+
+
+class PostgresSearchBackend(DatabaseSearchBackend):
+    """
+    Full-text search on top of `django.contrib.postgres`.
+
+    - Every Program/Episode row keeps a weighted `search_vector`
+      (title > short description > long description/body), backed by a GIN index.
+    - The vector is built from the normalized shadow columns, with the text
+      search configuration of the content language.
+    - Results are ordered by rank, then by publish date.
+    - Fuzzy matching uses pg_trgm word similarity on normalized titles (GIN trigram indexes).
+    """
+
+    bulk_indexer_class = PostgresBulkIndexer
+
+    def get_config(self, language) -> str:
+        return app_settings.SEARCH_TEXT_SEARCH_CONFIGS.get(
+            language, app_settings.SEARCH_DEFAULT_TEXT_SEARCH_CONFIG
+        )
+
+    def build_vector(self, config: str, *weighted_fields) -> SearchVector:
+        return reduce(
+            lambda left, right: left + right,
+            (SearchVector(field, weight=weight, config=config) for field, weight in weighted_fields),
+        )
+
+    def build_query(self, query: str) -> SearchQuery:
+        """
+        The query language is unknown, so it is parsed with every configuration
+        and a row matches when any of them does.
+        """
+        query = normalize(query)
+        configs = dict.fromkeys(app_settings.SEARCH_TEXT_SEARCH_CONFIGS.values())
+        return reduce(
+            or_,
+            (SearchQuery(query, config=config, search_type="websearch") for config in configs),
+        )
+
+    def index_program(self, program: Program) -> None:
+        vector = self.build_vector(
+            self.get_config(program.language),
+            ("search_title", "A"),
+            ("search_summary", "B"),
+            ("search_body", "C"),
+        )
+        Program.objects.filter(pk=program.pk).update(search_vector=vector)
+
+    def index_episode(self, episode: Episode) -> None:
+        vector = self.build_vector(
+            self.get_config(episode.program.language),
+            ("search_title", "A"),
+            ("search_summary", "B"),
+            ("search_body", "C"),
+        )
+        Episode.objects.filter(pk=episode.pk).update(search_vector=vector)
+
+    def index_programs(self, programs) -> None:
+        """
+        One UPDATE per text search configuration instead of one per program.
+        """
+        by_config = defaultdict(list)
+        for program in programs:
+            by_config[self.get_config(program.language)].append(program.pk)
+        self.update_vectors(Program, by_config)
+
+    def index_episodes(self, episodes) -> None:
+        by_config = defaultdict(list)
+        for episode in episodes:
+            by_config[self.get_config(episode.program.language)].append(episode.pk)
+        self.update_vectors(Episode, by_config)
+
+    def update_vectors(self, model, ids_by_config) -> None:
+        for config, ids in ids_by_config.items():
+            model.objects.filter(pk__in=ids).update(search_vector=self.build_vector(
+                config, ("search_title", "A"), ("search_summary", "B"), ("search_body", "C")
+            ))
+
+    def rebuild(self) -> int:
+        """
+        Recompute every search vector with one UPDATE per text search configuration.
+        """
+        languages = app_settings.SEARCH_TEXT_SEARCH_CONFIGS
+        updated = 0
+
+        for language in list(languages) + [None]:
+            if language is None:
+                programs = Program.objects.exclude(language__in=list(languages))
+                episodes = Episode.objects.exclude(program__language__in=list(languages))
+            else:
+                programs = Program.objects.filter(language=language)
+                episodes = Episode.objects.filter(program__language=language)
+
+            config = self.get_config(language)
+            updated += programs.update(search_vector=self.build_vector(
+                config, ("search_title", "A"), ("search_summary", "B"), ("search_body", "C")
+            ))
+            updated += episodes.update(search_vector=self.build_vector(
+                config, ("search_title", "A"), ("search_summary", "B"), ("search_body", "C")
+            ))
+
+        return updated
+
+    def filter_programs(self, queryset, query: str):
+        return queryset.filter(search_vector=self.build_query(query))
+
+    def filter_episodes(self, queryset, query: str):
+        return queryset.filter(search_vector=self.build_query(query))
+
+    def score_expression(self, query: str):
+        # Cast to double precision so the rank survives the round trip through the cursor.
+        return Cast(SearchRank(F("search_vector"), self.build_query(query)), FloatField())
+
+    def fuzzy_search(self, query: str, limit: int = 10, after: Optional[SortKey] = None) -> SearchResultPage:
+        if not query:
+            return SearchResultPage()
+
+        query = normalize(query)
+        score = Cast(TrigramWordSimilarity(query, "search_title"), FloatField())
+        program_qs = self.annotate_programs(
+            self.published_programs().filter(search_title__trigram_word_similar=query), score
+        )
+        episode_qs = self.annotate_episodes(
+            self.published_episodes().filter(search_title__trigram_word_similar=query), score
+        )
+
+        # `%>` only uses the trigram index with the configured threshold, not with a per-row
+        # comparison. The threshold is set local to a transaction that also runs the queries,
+        # so it never leaks to the next user of a pooled connection.
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                    [str(app_settings.SEARCH_TRIGRAM_SIMILARITY_THRESHOLD)],
+                )
+            return self.paginate_querysets(program_qs, episode_qs, limit, after)
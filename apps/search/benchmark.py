@@ -0,0 +1,311 @@
+# apps/search/benchmark.py
+import datetime
+import json
+import math
+import random
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.episode.models import Episode
+from apps.program.models import Program
+from apps.tag.models import Tag
+
+from .backends import get_backend_path, get_search_backend
+from .internal_search import search_internal_content
+from .markup import strip_markup
+from .normalization import (
+    EPISODE_NORMALIZED_FIELDS,
+    EPISODE_PLAIN_FIELDS,
+    PROGRAM_NORMALIZED_FIELDS,
+    PROGRAM_PLAIN_FIELDS,
+    normalize_fields,
+)
+
+EPISODES_PER_PROGRAM = 20
+TAG_COUNT = 300
+VOCABULARY_SIZE = 20000
+
+ENGLISH_WORDS = (
+    "news sport football match season episode interview story history science health music culture "
+    "travel food economy market technology world people city family children school life business "
+    "politics energy climate water future game team player coach league cup final goal week night "
+    "morning live special report analysis review guide talk show podcast series documentary drama comedy"
+).split()
+
+ARABIC_WORDS = (
+    "أخبار رياضة كرة القدم مباراة موسم حلقة مقابلة قصة تاريخ علوم صحة موسيقى ثقافة سفر طعام اقتصاد "
+    "سوق تقنية العالم الناس مدينة عائلة أطفال مدرسة حياة أعمال سياسة طاقة مناخ ماء مستقبل لعبة فريق "
+    "لاعب مدرب دوري كأس نهائي هدف أسبوع ليلة صباح مباشر خاص تقرير تحليل مراجعة دليل حوار برنامج "
+    "سلسلة وثائقي دراما كوميديا الإسلام القرآن رمضان مكة الرياض جدة"
+).split()
+
+ENGLISH_SYLLABLES = "ba be bi bo ka ke ki ko la le li lo ma me mi mo na ne ni no ra re ri ro sa se si so ta te ti to".split()
+ARABIC_LETTERS = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+
+
+class CorpusGenerator:
+    """
+    Reproducible synthetic bilingual catalog.
+
+    - Program `n` and its episodes only depend on (seed, n), so a corpus can
+      be grown from one size to the next and stays identical across runs.
+    - Words follow a Zipf distribution over a mixed Arabic/English
+      vocabulary (real words first, synthetic long tail after).
+    - Title/description/body lengths and tag counts are drawn from
+      skewed distributions close to what an editorial catalog looks like.
+    """
+
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+        rng = random.Random(seed)
+        self.vocabulary = self._build_vocabulary(rng)
+        self.cum_weights = list(self._zipf_cum_weights(len(self.vocabulary), 1.05))
+        self.tag_names = [f"{self.vocabulary[rank]} {rank}" for rank in range(TAG_COUNT)]
+        self.tag_cum_weights = list(self._zipf_cum_weights(TAG_COUNT, 1.2))
+
+    @staticmethod
+    def _zipf_cum_weights(size: int, exponent: float) -> Iterator[float]:
+        total = 0.0
+        for rank in range(1, size + 1):
+            total += 1.0 / rank ** exponent
+            yield total
+
+    @staticmethod
+    def _build_vocabulary(rng: random.Random) -> List[str]:
+        vocabulary = []
+        for english, arabic in zip(ENGLISH_WORDS, ARABIC_WORDS):
+            vocabulary += [english, arabic]
+
+        seen = set(vocabulary)
+        while len(vocabulary) < VOCABULARY_SIZE:
+            if rng.random() < 0.5:
+                word = "".join(rng.choice(ENGLISH_SYLLABLES) for _ in range(rng.randint(2, 4)))
+            else:
+                word = "".join(rng.choice(ARABIC_LETTERS) for _ in range(rng.randint(3, 7)))
+            if word not in seen:
+                seen.add(word)
+                vocabulary.append(word)
+        return vocabulary
+
+    def words(self, rng: random.Random, count: int) -> str:
+        return " ".join(rng.choices(self.vocabulary, cum_weights=self.cum_weights, k=count))
+
+    def length(self, rng: random.Random, median: float, low: int, high: int) -> int:
+        return min(max(int(rng.lognormvariate(math.log(median), 0.4)), low), high)
+
+    def tags(self, rng: random.Random) -> List[int]:
+        count = min(int(rng.expovariate(0.6)), 6)
+        return sorted(set(rng.choices(range(TAG_COUNT), cum_weights=self.tag_cum_weights, k=count)))
+
+    def uuid(self, rng: random.Random) -> uuid.UUID:
+        return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+    def program(self, number: int) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        rng = random.Random(f"{self.seed}:{number}")
+        language = "ar" if rng.random() < 0.6 else "en"
+        published = datetime.date(2015, 1, 1) + datetime.timedelta(days=rng.randint(0, 3650))
+
+        program = {
+            "id": self.uuid(rng),
+            "slug": f"bench-program-{number}",
+            "title": self.words(rng, self.length(rng, 4, 1, 12)),
+            "short_description": self.words(rng, self.length(rng, 15, 5, 40)),
+            "long_description": self.words(rng, self.length(rng, 60, 20, 200)),
+            "language": language,
+            "publish_date": published,
+            "is_published": rng.random() < 0.9,
+            "is_featured": rng.random() < 0.05,
+            "is_active": True,
+            "tags": self.tags(rng),
+        }
+
+        episodes = []
+        for index in range(EPISODES_PER_PROGRAM):
+            moment = datetime.datetime.combine(published, datetime.time(), tzinfo=datetime.timezone.utc)
+            episodes.append({
+                "id": self.uuid(rng),
+                "slug": f"bench-episode-{number}-{index}",
+                "title": self.words(rng, self.length(rng, 6, 2, 16)),
+                "short_description": self.words(rng, self.length(rng, 15, 5, 40)),
+                "body": self.words(rng, self.length(rng, 40, 10, 150)),
+                "publish_date": moment + datetime.timedelta(days=7 * index, seconds=rng.randint(0, 86399)),
+                "duration_seconds": rng.randint(120, 7200),
+                "episode_number": index + 1,
+                "is_published": rng.random() < 0.95,
+                "is_featured": rng.random() < 0.02,
+                "is_active": True,
+                "tags": self.tags(rng),
+            })
+        return program, episodes
+
+    def query_mix(self, per_category: int = 10) -> Dict[str, List[str]]:
+        """
+        Fixed queries per category: frequent words, rare words,
+        words absent from the corpus and single characters.
+        """
+        rng = random.Random(f"{self.seed}:queries")
+        head = self.vocabulary[:per_category * 2]
+        tail = self.vocabulary[5000:VOCABULARY_SIZE]
+        return {
+            "head": [rng.choice(head) for _ in range(per_category)],
+            "head_two_words": [f"{rng.choice(head)} {rng.choice(head)}" for _ in range(per_category)],
+            "tail": rng.sample(tail, per_category),
+            "no_hit": [f"xq{rng.randint(10000, 99999)}zv" for _ in range(per_category)],
+            "single_character": [rng.choice("abkmst" + ARABIC_LETTERS[:6]) for _ in range(per_category)],
+        }
+
+
+def load_corpus(generator: CorpusGenerator, start: int, stop: int, chunk_size: int = 200) -> None:
+    """
+    Bulk insert programs [start, stop) with their episodes and tags.
+    Receivers are bypassed; the search backend is rebuilt afterwards.
+    """
+    tag_ids = dict(Tag.objects.filter(name__in=generator.tag_names).values_list("name", "pk"))
+    missing = [Tag(name=name, is_active=True) for name in generator.tag_names if name not in tag_ids]
+    Tag.objects.bulk_create(missing)
+    tag_ids.update({tag.name: tag.pk for tag in missing})
+    tag_pk = [tag_ids[name] for name in generator.tag_names]
+
+    ProgramTag = Program.tags.through
+    EpisodeTag = Episode.tags.through
+
+    for chunk_start in range(start, stop, chunk_size):
+        programs, episodes, program_tags, episode_tags = [], [], [], []
+
+        for number in range(chunk_start, min(chunk_start + chunk_size, stop)):
+            program_data, episodes_data = generator.program(number)
+            program = Program(**{key: value for key, value in program_data.items() if key != "tags"})
+            normalize_fields(program, PROGRAM_PLAIN_FIELDS, transform=strip_markup)
+            normalize_fields(program, PROGRAM_NORMALIZED_FIELDS)
+            programs.append(program)
+            program_tags += [ProgramTag(program_id=program.pk, tag_id=tag_pk[tag]) for tag in program_data["tags"]]
+
+            for episode_data in episodes_data:
+                episode = Episode(program=program, **{key: value for key, value in episode_data.items() if key != "tags"})
+                normalize_fields(episode, EPISODE_PLAIN_FIELDS, transform=strip_markup)
+                normalize_fields(episode, EPISODE_NORMALIZED_FIELDS)
+                episodes.append(episode)
+                episode_tags += [EpisodeTag(episode_id=episode.pk, tag_id=tag_pk[tag]) for tag in episode_data["tags"]]
+
+        Program.objects.bulk_create(programs)
+        Episode.objects.bulk_create(episodes, batch_size=2000)
+        ProgramTag.objects.bulk_create(program_tags, batch_size=5000)
+        EpisodeTag.objects.bulk_create(episode_tags, batch_size=5000)
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of already sorted values.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def rows_scanned(queries: List[Dict[str, str]]) -> Optional[int]:
+    """
+    Rows read by the scan nodes of the captured SELECTs, from EXPLAIN ANALYZE.
+    Only PostgreSQL exposes it; None elsewhere.
+    """
+    if connection.vendor != "postgresql":
+        return None
+
+    def walk(node) -> int:
+        rows = 0
+        if "Scan" in node.get("Node Type", ""):
+            loops = node.get("Actual Loops", 1)
+            rows += (node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)) * loops
+        for child in node.get("Plans", ()):
+            rows += walk(child)
+        return rows
+
+    total = 0
+    with connection.cursor() as cursor:
+        for query in queries:
+            if not query["sql"].lstrip().upper().startswith("SELECT"):
+                continue
+            try:
+                cursor.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + query["sql"])
+            except Exception:
+                continue
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            total += walk(plan[0]["Plan"])
+    return total
+
+
+def measure(queries: Sequence[str], repeat: int, limit: int = 10) -> Dict[str, Any]:
+    latencies, query_counts, scanned = [], [], []
+
+    for query in queries:
+        # First run: warm-up, SQL capture and scan accounting, not timed.
+        with CaptureQueriesContext(connection) as captured:
+            search_internal_content(query, limit=limit)
+        query_counts.append(len(captured.captured_queries))
+        rows = rows_scanned(captured.captured_queries)
+        if rows is not None:
+            scanned.append(rows)
+
+        for _ in range(repeat):
+            started = time.perf_counter()
+            search_internal_content(query, limit=limit)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "queries_per_request": round(sum(query_counts) / len(query_counts), 2) if query_counts else 0.0,
+        "rows_scanned_per_request": round(sum(scanned) / len(scanned)) if scanned else None,
+    }
+
+
+def run(sizes: Sequence[int], repeat: int = 20, seed: int = 42, queries_per_category: int = 10) -> Dict[str, Any]:
+    """
+    Grow the corpus through every size (in episodes) and run the query mix at each step.
+    Must run against a scratch database: it inserts the synthetic catalog.
+    """
+    generator = CorpusGenerator(seed)
+    query_mix = generator.query_mix(queries_per_category)
+    report: Dict[str, Any] = {
+        "backend": get_backend_path(),
+        "vendor": connection.vendor,
+        "seed": seed,
+        "repeat": repeat,
+        "queries": query_mix,
+        "sizes": {},
+    }
+
+    loaded = 0
+    for size in sorted(sizes):
+        target = math.ceil(size / EPISODES_PER_PROGRAM)
+
+        started = time.perf_counter()
+        load_corpus(generator, loaded, target)
+        loaded = target
+        load_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        get_search_backend().rebuild()
+        rebuild_seconds = time.perf_counter() - started
+
+        report["sizes"][str(size)] = {
+            "programs": loaded,
+            "episodes": loaded * EPISODES_PER_PROGRAM,
+            "load_seconds": round(load_seconds, 2),
+            "rebuild_seconds": round(rebuild_seconds, 2),
+            "categories": {
+                category: measure(queries, repeat) for category, queries in query_mix.items()
+            },
+        }
+
+    return report
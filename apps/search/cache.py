@@ -0,0 +1,220 @@
+# apps/search/cache.py
+import hashlib
+import json
+from typing import Awaitable, Callable, Dict, Optional
+
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import F
+
+from .app_settings import app_settings
+from .models import CatalogGeneration
+from .normalization import normalize
+from .results import SearchResultPage
+
+GENERATION_KEY = "search:generation"
+CATALOG_GENERATION = "catalog"
+HITS_KEY = "search:results:hits"
+MISSES_KEY = "search:results:misses"
+
+
+def get_cache():
+    return caches[app_settings.SEARCH_CACHE_ALIAS]
+
+
+def is_shared(cache) -> bool:
+    """
+    Whether every worker process sees the same entries (Redis, memcached,
+    database...), as opposed to a per-process local memory or dummy cache.
+    """
+    return not isinstance(cache, (LocMemCache, DummyCache))
+
+
+def incr(cache, key: str) -> int:
+    """
+    Atomic increment on Redis and local memory alike, creating the counter when missing.
+    """
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, timeout=None):
+            return 1
+        return cache.incr(key)
+
+
+def catalog_generation() -> int:
+    generation = CatalogGeneration.objects.filter(name=CATALOG_GENERATION).values_list("value", flat=True).first()
+    return generation or 1
+
+
+async def acatalog_generation() -> int:
+    generation = await (
+        CatalogGeneration.objects.filter(name=CATALOG_GENERATION).values_list("value", flat=True).afirst()
+    )
+    return generation or 1
+
+
+def bump_catalog_generation() -> int:
+    """
+    Atomic increment of the database generation, creating its row when missing.
+    """
+    generations = CatalogGeneration.objects.filter(name=CATALOG_GENERATION)
+    if not generations.update(value=F("value") + 1):
+        _, created = CatalogGeneration.objects.get_or_create(name=CATALOG_GENERATION, defaults={"value": 2})
+        if not created:
+            generations.update(value=F("value") + 1)
+    return catalog_generation()
+
+
+async def aincr(cache, key: str) -> int:
+    try:
+        return await cache.aincr(key)
+    except ValueError:
+        if await cache.aadd(key, 1, timeout=None):
+            return 1
+        return await cache.aincr(key)
+
+
+class ResultCache:
+    """
+    Cache of internal search pages, invalidated by a catalog generation.
+
+    - Keys embed the current generation, so bumping it (any Program/Episode
+      write) makes every older entry unreachable at once; they then expire
+      on their own.
+    - Between edits, entries stay hot for SEARCH_RESULT_CACHE_TIMEOUT seconds.
+    - Hits and misses are counted in the same cache, so the numbers cover
+      every worker when Redis is used.
+    - On a process-local cache (local memory, see `is_shared`) pages stay in
+      each process, but the generation is read from the database
+      (`CatalogGeneration`): catalog writes are often applied by a Celery
+      worker, and every process must see them.
+    """
+
+    def __init__(self, cache=None):
+        self._cache = cache
+
+    @property
+    def cache(self):
+        return self._cache if self._cache is not None else get_cache()
+
+    @property
+    def enabled(self) -> bool:
+        return app_settings.SEARCH_RESULT_CACHE_ENABLED
+
+    def get_generation(self) -> int:
+        if not is_shared(self.cache):
+            return catalog_generation()
+        generation = self.cache.get(GENERATION_KEY)
+        if generation is None:
+            self.cache.add(GENERATION_KEY, 1, timeout=None)
+            generation = self.cache.get(GENERATION_KEY, 1)
+        return int(generation)
+
+    async def aget_generation(self) -> int:
+        if not is_shared(self.cache):
+            return await acatalog_generation()
+        generation = await self.cache.aget(GENERATION_KEY)
+        if generation is None:
+            await self.cache.aadd(GENERATION_KEY, 1, timeout=None)
+            generation = await self.cache.aget(GENERATION_KEY, 1)
+        return int(generation)
+
+    def bump_generation(self) -> int:
+        if not is_shared(self.cache):
+            return bump_catalog_generation()
+        return incr(self.cache, GENERATION_KEY)
+
+    def make_key(self, generation: int, query: str, limit: int, cursor: Optional[str], language: Optional[str]) -> str:
+        window = json.dumps([normalize(query).strip(), limit, cursor or "", language or ""], ensure_ascii=False)
+        digest = hashlib.sha1(window.encode("utf-8")).hexdigest()
+        return f"search:results:{generation}:{digest}"
+
+    def get_or_compute(
+        self,
+        query: str,
+        limit: int,
+        cursor: Optional[str],
+        language: Optional[str],
+        compute: Callable[[], SearchResultPage],
+    ) -> SearchResultPage:
+        if not self.enabled:
+            return compute()
+
+        cache = self.cache
+        key = self.make_key(self.get_generation(), query, limit, cursor, language)
+
+        page = cache.get(key)
+        if page is not None:
+            incr(cache, HITS_KEY)
+            page.cached = True
+            return page
+
+        incr(cache, MISSES_KEY)
+        page = compute()
+        cache.set(key, page, timeout=app_settings.SEARCH_RESULT_CACHE_TIMEOUT)
+        return page
+
+    async def aget_or_compute(
+        self,
+        query: str,
+        limit: int,
+        cursor: Optional[str],
+        language: Optional[str],
+        compute: Callable[[], Awaitable[SearchResultPage]],
+    ) -> SearchResultPage:
+        """
+        `get_or_compute` for async views, on the async cache API.
+        """
+        if not self.enabled:
+            return await compute()
+
+        cache = self.cache
+        key = self.make_key(await self.aget_generation(), query, limit, cursor, language)
+
+        page = await cache.aget(key)
+        if page is not None:
+            await aincr(cache, HITS_KEY)
+            page.cached = True
+            return page
+
+        await aincr(cache, MISSES_KEY)
+        page = await compute()
+        await cache.aset(key, page, timeout=app_settings.SEARCH_RESULT_CACHE_TIMEOUT)
+        return page
+
+    def warm(
+        self,
+        query: str,
+        limit: int,
+        language: Optional[str],
+        compute: Callable[[], SearchResultPage],
+        timeout: Optional[int] = None,
+    ) -> SearchResultPage:
+        """
+        Compute the first page of `query` and store it, whether or not it is cached.
+        `timeout` may outlive SEARCH_RESULT_CACHE_TIMEOUT: the generation still
+        invalidates the page at the next catalog change.
+        """
+        page = compute()
+        if self.enabled:
+            key = self.make_key(self.get_generation(), query, limit, None, language)
+            self.cache.set(key, page, timeout=timeout or app_settings.SEARCH_RESULT_CACHE_TIMEOUT)
+        return page
+
+    def stats(self) -> Dict[str, float]:
+        cache = self.cache
+        hits = int(cache.get(HITS_KEY) or 0)
+        misses = int(cache.get(MISSES_KEY) or 0)
+        lookups = hits + misses
+        return {
+            "enabled": self.enabled,
+            "generation": self.get_generation(),
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
+
+
+result_cache = ResultCache()
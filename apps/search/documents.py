@@ -0,0 +1,135 @@
+# apps/search/documents.py
+import calendar
+import datetime
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+
+from apps.program.models import Program
+from apps.episode.models import Episode
+
+from .backends.base import EPISODE_FIELDS, PROGRAM_FIELDS, episode_result, program_result
+
+# Indexed field -> column it is read from (rich text bodies from their plain-text copy).
+PROGRAM_TEXT_FIELDS = {"title": "title", "short_description": "short_description", "long_description": "plain_body"}
+EPISODE_TEXT_FIELDS = {"title": "title", "short_description": "short_description", "body": "plain_body"}
+
+# values() lookups feeding each facet (see apps.search.facets).
+PROGRAM_FACET_FIELDS = {"category": "category_id", "type": "type", "language": "language"}
+EPISODE_FACET_FIELDS = {
+    "category": "program__category_id",
+    "type": "program__type",
+    "language": "program__language",
+    "media_type": "media_type",
+}
+
+
+class SearchDocument(NamedTuple):
+    """
+    What a search engine needs to know about one Program or Episode:
+
+    - key: unique id inside the index, e.g. "program:<uuid>"
+    - fields: searchable text per field name
+    - payload: the result row returned to the API as-is
+    - published_at: sort key (unix seconds, 0 when unknown)
+    - parent: key of the owning program for episodes
+    - facets: facet name -> value, for facet counts
+    """
+    key: str
+    kind: str
+    fields: Dict[str, str]
+    payload: Dict[str, Any]
+    published_at: int
+    parent: Optional[str] = None
+    facets: Optional[Dict[str, Any]] = None
+
+
+def document_key(kind: str, object_id) -> str:
+    return f"{kind}:{object_id}"
+
+
+def sort_timestamp(value) -> int:
+    """
+    Turn a date or datetime into whole unix seconds so programs (date)
+    and episodes (datetime) can share one ordering.
+    """
+    if value is None:
+        return 0
+
+    if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc)
+
+    return calendar.timegm(value.timetuple())
+
+
+def program_document(row: Dict[str, Any]) -> SearchDocument:
+    """
+    Build a document from a `Program.objects.values(...)` row.
+    """
+    payload = program_result(row)
+    payload["id"] = str(payload["id"])
+
+    return SearchDocument(
+        key=document_key("program", payload["id"]),
+        kind="program",
+        fields={name: row.get(column) or "" for name, column in PROGRAM_TEXT_FIELDS.items()},
+        payload=payload,
+        published_at=sort_timestamp(row["publish_date"]),
+        facets={name: row.get(field) for name, field in PROGRAM_FACET_FIELDS.items()},
+    )
+
+
+def episode_document(row: Dict[str, Any]) -> SearchDocument:
+    """
+    Build a document from an `Episode.objects.values(...)` row.
+    """
+    payload = episode_result(row)
+    payload["id"] = str(payload["id"])
+
+    return SearchDocument(
+        key=document_key("episode", payload["id"]),
+        kind="episode",
+        fields={name: row.get(column) or "" for name, column in EPISODE_TEXT_FIELDS.items()},
+        payload=payload,
+        published_at=sort_timestamp(row["publish_date"]),
+        parent=document_key("program", row["program_id"]),
+        facets={name: row.get(field) for name, field in EPISODE_FACET_FIELDS.items()},
+    )
+
+
+def program_row(program: Program) -> Dict[str, Any]:
+    """
+    Same shape as a values() row, built from an already loaded instance.
+    """
+    row = {name: getattr(program, name) for name in PROGRAM_FIELDS}
+    row.update({column: getattr(program, column) for column in PROGRAM_TEXT_FIELDS.values()})
+    row["category_id"] = program.category_id
+    return row
+
+
+def episode_row(episode: Episode) -> Dict[str, Any]:
+    row = {name: getattr(episode, name) for name in EPISODE_FIELDS if "__" not in name}
+    row.update({column: getattr(episode, column) for column in EPISODE_TEXT_FIELDS.values()})
+    row["program__slug"] = episode.program.slug
+    row["program_id"] = episode.program_id
+    row["program__category_id"] = episode.program.category_id
+    row["program__type"] = episode.program.type
+    row["program__language"] = episode.program.language
+    return row
+
+
+# values() projection a document is built from.
+PROGRAM_VALUES = tuple(dict.fromkeys(
+    PROGRAM_FIELDS + tuple(PROGRAM_TEXT_FIELDS.values()) + tuple(PROGRAM_FACET_FIELDS.values())
+))
+EPISODE_VALUES = tuple(dict.fromkeys(
+    EPISODE_FIELDS + tuple(EPISODE_TEXT_FIELDS.values()) + ("program_id",) + tuple(EPISODE_FACET_FIELDS.values())
+))
+
+
+def iter_program_documents(queryset, chunk_size: int = 2000) -> Iterator[SearchDocument]:
+    for row in queryset.values(*PROGRAM_VALUES).iterator(chunk_size=chunk_size):
+        yield program_document(row)
+
+
+def iter_episode_documents(queryset, chunk_size: int = 2000) -> Iterator[SearchDocument]:
+    for row in queryset.values(*EPISODE_VALUES).iterator(chunk_size=chunk_size):
+        yield episode_document(row)
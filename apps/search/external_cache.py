@@ -0,0 +1,188 @@
+# apps/search/external_cache.py
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .app_settings import app_settings
+from .cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key inside one process:
+    the first caller runs the function, the others wait for its outcome.
+    """
+
+    class _Call:
+        def __init__(self) -> None:
+            self.done = threading.Event()
+            self.result: Any = None
+            self.error: Optional[BaseException] = None
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, "SingleFlight._Call"] = {}
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class StaleWhileRevalidateCache:
+    """
+    Cache of upstream responses that serves stale entries while refreshing them.
+
+    - An entry is fresh for `ttl` seconds, then stale for `stale_ttl` more:
+      stale entries are returned at once and refreshed in a background thread.
+    - Concurrent misses for one key make a single upstream call: threads of a
+      worker through SingleFlight, workers through a lock key added in the
+      shared cache (the losers poll the cache until the winner stores the value).
+    - `fetch` returns None for responses that must not be cached.
+    """
+
+    refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="swr-refresh")
+
+    def __init__(self, namespace: str, ttl: int, stale_ttl: int, lock_timeout: int = 10, wait_timeout: float = 5.0):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.single_flight = SingleFlight()
+
+    @property
+    def cache(self):
+        return get_cache()
+
+    def make_key(self, key: Tuple) -> str:
+        return f"{self.namespace}:" + ":".join(str(part or "") for part in key)
+
+    def get(self, key: Tuple, fetch: Callable[[], Optional[Any]]) -> Optional[Any]:
+        cache_key = self.make_key(key)
+        entry = self.cache.get(cache_key)
+
+        if entry is not None:
+            if entry["fresh_until"] < time.time():
+                self.refresh_executor.submit(self._refresh, cache_key, fetch)
+            return entry["value"]
+
+        return self.single_flight.do(cache_key, lambda: self._load(cache_key, fetch))
+
+    def peek(self, key: Tuple) -> Optional[Any]:
+        """
+        Cached value of `key` (fresh or stale) without calling upstream; None on a miss.
+        """
+        entry = self.cache.get(self.make_key(key))
+        return None if entry is None else entry["value"]
+
+    def put(self, key: Tuple, value: Any) -> None:
+        self._store(self.make_key(key), value)
+
+    async def apeek(self, key: Tuple) -> Optional[Any]:
+        entry = await self.cache.aget(self.make_key(key))
+        return None if entry is None else entry["value"]
+
+    async def aput(self, key: Tuple, value: Any) -> None:
+        entry = {"value": value, "fresh_until": time.time() + self.ttl}
+        await self.cache.aset(self.make_key(key), entry, timeout=self.ttl + self.stale_ttl)
+
+    def _store(self, cache_key: str, value: Any) -> None:
+        entry = {"value": value, "fresh_until": time.time() + self.ttl}
+        self.cache.set(cache_key, entry, timeout=self.ttl + self.stale_ttl)
+
+    def _acquire(self, cache_key: str) -> Optional[str]:
+        token = uuid.uuid4().hex
+        if self.cache.add(f"{cache_key}:lock", token, timeout=self.lock_timeout):
+            return token
+        return None
+
+    def _release(self, cache_key: str, token: str) -> None:
+        lock_key = f"{cache_key}:lock"
+        if self.cache.get(lock_key) == token:
+            self.cache.delete(lock_key)
+
+    def _fetch_and_store(self, cache_key: str, fetch: Callable[[], Optional[Any]]) -> Optional[Any]:
+        value = fetch()
+        if value is not None:
+            self._store(cache_key, value)
+        return value
+
+    def _load(self, cache_key: str, fetch: Callable[[], Optional[Any]]) -> Optional[Any]:
+        token = self._acquire(cache_key)
+        if token is not None:
+            try:
+                return self._fetch_and_store(cache_key, fetch)
+            finally:
+                self._release(cache_key, token)
+
+        # Another worker is already calling upstream: wait for its value.
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                return entry["value"]
+            if self.cache.get(f"{cache_key}:lock") is None:
+                break
+
+        return self._fetch_and_store(cache_key, fetch)
+
+    def _refresh(self, cache_key: str, fetch: Callable[[], Optional[Any]]) -> None:
+        token = self._acquire(cache_key)
+        if token is None:
+            # Someone else is refreshing this entry.
+            return
+
+        try:
+            value = self.single_flight.do(f"{cache_key}:refresh", lambda: self._fetch_and_store(cache_key, fetch))
+        except Exception:
+            logger.warning("Background refresh of %s failed, keeping the stale entry.", cache_key, exc_info=True)
+            return
+
+        # On failure the lock is left to expire, which spaces out the retries.
+        if value is not None:
+            self._release(cache_key, token)
+
+
+_serpapi_cache: Optional[StaleWhileRevalidateCache] = None
+
+
+def get_serpapi_cache() -> StaleWhileRevalidateCache:
+    """
+    Process-wide cache of SerpApi lookups (one instance, so SingleFlight sees every thread).
+    """
+    global _serpapi_cache
+    if _serpapi_cache is None:
+        _serpapi_cache = StaleWhileRevalidateCache(
+            namespace="serpapi",
+            ttl=app_settings.SEARCH_EXTERNAL_CACHE_TTL,
+            stale_ttl=app_settings.SEARCH_EXTERNAL_CACHE_STALE_TTL,
+            lock_timeout=app_settings.SEARCH_EXTERNAL_CACHE_LOCK_TIMEOUT,
+            wait_timeout=app_settings.SEARCH_EXTERNAL_CACHE_WAIT_TIMEOUT,
+        )
+    return _serpapi_cache
@@ -1,9 +1,15 @@
 # apps/search/services/external_search_api.py
-from dataclasses import dataclass
-from typing import Optional
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
 
+import aiohttp
 import requests
 
+from .app_settings import app_settings
+from .external_cache import StaleWhileRevalidateCache, get_serpapi_cache
+from .resilience import ExternalProviderUnavailable, RateLimiter
 from .serpapi_client import SerpApiClient
 
 
@@ -18,18 +24,58 @@ class VideoMetadata:
     channel_name: Optional[str]
 
 
+@dataclass
+class VideoBatchResult:
+    """
+    Outcome of a batch lookup, in the order of the requested ids:
+
+    - videos: metadata of every video found
+    - missing: ids the provider has no (successful) answer for
+    - timed_out: ids still pending when the batch deadline expired
+    """
+    videos: List[VideoMetadata] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    timed_out: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ListedVideo:
+    video_id: str
+    title: str
+    description: str
+    thumbnail_url: str
+    length: str
+    channel_name: str
+    channel_link: str
+    channel_thumbnail_url: str
+
+
+@dataclass
+class VideoListingPage:
+    videos: List[ListedVideo] = field(default_factory=list)
+    next_page_token: Optional[str] = None
+
+
 class YouTubeVideoSearchService:
     """
     External video search service.
     - Uses SerpApi with `youtube_video` engine.
     - Maps JSON response to VideoMetadata.
+    - Raises ExternalProviderUnavailable while the provider's circuit breaker is open.
+    - Lookups are cached per (video_id, gl, hl) with stale-while-revalidate,
+      and concurrent misses share one upstream call (see `apps.search.external_cache`).
     If engine/provider changes, you modify this class, not the view.
     """
 
     ENGINE_NAME = "youtube_video"
 
-    def __init__(self, serpapi_client: Optional[SerpApiClient] = None) -> None:
+    def __init__(
+        self,
+        serpapi_client: Optional[SerpApiClient] = None,
+        cache: Optional[StaleWhileRevalidateCache] = None,
+    ) -> None:
         self._client = serpapi_client or SerpApiClient()
+        self._cache = cache or get_serpapi_cache()
 
     def get_video_by_id(
         self,
@@ -37,6 +83,135 @@ class YouTubeVideoSearchService:
         country_code: Optional[str] = None,
         language_code: Optional[str] = None,
     ) -> Optional[VideoMetadata]:
+        engine_params = self.get_engine_params(video_id, country_code, language_code)
+
+        try:
+            return self._cache.get(
+                (self.ENGINE_NAME, video_id, country_code, language_code),
+                lambda: self._fetch_video(video_id, engine_params),
+            )
+        except ExternalProviderUnavailable:
+            raise
+        except (requests.RequestException, ValueError):
+            return None
+
+    async def aget_video_by_id(
+        self,
+        video_id: str,
+        country_code: Optional[str] = None,
+        language_code: Optional[str] = None,
+    ) -> Optional[VideoMetadata]:
+        """
+        `get_video_by_id` for async views: the provider call runs on aiohttp,
+        so cancelling the coroutine really aborts the request.
+        """
+        cache_key = (self.ENGINE_NAME, video_id, country_code, language_code)
+        cached = await self._cache.apeek(cache_key)
+        if cached is not None:
+            return cached
+
+        engine_params = self.get_engine_params(video_id, country_code, language_code)
+        timeout = aiohttp.ClientTimeout(total=self._client_timeout())
+        try:
+            async with aiohttp.ClientSession(timeout=timeout) as http:
+                raw_response = await self._client.async_search(http, self.ENGINE_NAME, engine_params)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            # ValueError: the provider answered something that is not JSON.
+            return None
+
+        video = self.parse_video(video_id, raw_response)
+        if video is not None:
+            await self._cache.aput(cache_key, video)
+        return video
+
+    def _client_timeout(self) -> float:
+        return app_settings.SEARCH_EXTERNAL_CONNECT_TIMEOUT + app_settings.SEARCH_EXTERNAL_READ_TIMEOUT
+
+    def get_videos_by_ids(
+        self,
+        video_ids: List[str],
+        country_code: Optional[str] = None,
+        language_code: Optional[str] = None,
+        concurrency: int = 8,
+        deadline: float = 5.0,
+    ) -> VideoBatchResult:
+        """
+        Look up several videos at once.
+
+        Cached ids are answered from the cache; the others are fetched
+        concurrently on asyncio (at most `concurrency` in flight). Whatever is
+        still pending after `deadline` seconds is cancelled and reported in
+        `timed_out`, so the batch never takes longer than the deadline.
+        """
+        video_ids = list(dict.fromkeys(video_ids))
+        found: Dict[str, Optional[VideoMetadata]] = {}
+        pending = []
+
+        for video_id in video_ids:
+            cached = self._cache.peek((self.ENGINE_NAME, video_id, country_code, language_code))
+            if cached is not None:
+                found[video_id] = cached
+            else:
+                pending.append(video_id)
+
+        if pending:
+            found.update(asyncio.run(
+                self._fetch_videos(pending, country_code, language_code, concurrency, deadline)
+            ))
+
+        result = VideoBatchResult()
+        for video_id in video_ids:
+            if video_id not in found:
+                result.timed_out.append(video_id)
+            elif found[video_id] is None:
+                result.missing.append(video_id)
+            else:
+                result.videos.append(found[video_id])
+        return result
+
+    async def _fetch_videos(
+        self,
+        video_ids: List[str],
+        country_code: Optional[str],
+        language_code: Optional[str],
+        concurrency: int,
+        deadline: float,
+    ) -> Dict[str, Optional[VideoMetadata]]:
+        semaphore = asyncio.Semaphore(concurrency)
+        found: Dict[str, Optional[VideoMetadata]] = {}
+
+        async def fetch(http: aiohttp.ClientSession, video_id: str) -> None:
+            async with semaphore:
+                engine_params = self.get_engine_params(video_id, country_code, language_code)
+                try:
+                    raw_response = await self._client.async_search(http, self.ENGINE_NAME, engine_params)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, ExternalProviderUnavailable):
+                    found[video_id] = None
+                    return
+
+            video = self.parse_video(video_id, raw_response)
+            if video is not None:
+                self._cache.put((self.ENGINE_NAME, video_id, country_code, language_code), video)
+            found[video_id] = video
+
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        timeout = aiohttp.ClientTimeout(total=deadline)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as http:
+            tasks = [asyncio.ensure_future(fetch(http, video_id)) for video_id in video_ids]
+            _, late = await asyncio.wait(tasks, timeout=deadline)
+            for task in late:
+                task.cancel()
+            if late:
+                await asyncio.wait(late)
+
+        return found
+
+    def get_engine_params(
+        self,
+        video_id: str,
+        country_code: Optional[str] = None,
+        language_code: Optional[str] = None,
+    ) -> Dict[str, str]:
         engine_params = {"v": video_id}
 
         if country_code:
@@ -47,11 +222,14 @@ class YouTubeVideoSearchService:
             # serpapi uses hl (host language)
             engine_params["hl"] = language_code
 
-        try:
-            raw_response = self._client.search(self.ENGINE_NAME, engine_params)
-        except requests.RequestException:
-            return None
+        return engine_params
 
+    def _fetch_video(self, video_id: str, engine_params) -> Optional[VideoMetadata]:
+        return self.parse_video(video_id, self._client.search(self.ENGINE_NAME, engine_params))
+
+    def parse_video(self, video_id: str, raw_response) -> Optional[VideoMetadata]:
+        if not isinstance(raw_response, dict):
+            return None
         metadata_block = raw_response.get("search_metadata") or {}
         if metadata_block.get("status") != "Success":
             return None
@@ -67,4 +245,82 @@ class YouTubeVideoSearchService:
             like_count=raw_response.get("extracted_likes"),
             description=description_block.get("content"),
             channel_name=channel_block.get("name"),
-        )
\ No newline at end of file
+        )
+
+
+def video_id_from_link(link: str) -> Optional[str]:
+    """
+    Video id of a watch (`?v=`), shorts or youtu.be link.
+    """
+    parsed = urlparse(link or "")
+    video_id = (parse_qs(parsed.query).get("v") or [""])[0]
+    if not video_id:
+        parts = [part for part in parsed.path.split("/") if part]
+        if parsed.netloc.endswith("youtu.be") and parts:
+            video_id = parts[0]
+        elif len(parts) >= 2 and parts[0] == "shorts":
+            video_id = parts[1]
+    return video_id or None
+
+
+class YouTubeListingService:
+    """
+    Pages of YouTube search results (SerpApi `youtube` engine), used to
+    walk the videos of a channel or playlist.
+    - Pages are chained: each one carries the token of the next (`sp`).
+    - Every call waits on `rate_limiter` first, when given.
+    - Not cached: a listing is walked once per ingestion.
+    """
+
+    ENGINE_NAME = "youtube"
+
+    def __init__(
+        self,
+        serpapi_client: Optional[SerpApiClient] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        self._client = serpapi_client or SerpApiClient()
+        self._rate_limiter = rate_limiter
+
+    def get_page(
+        self,
+        search_query: str,
+        page_token: Optional[str] = None,
+        country_code: Optional[str] = None,
+        language_code: Optional[str] = None,
+    ) -> VideoListingPage:
+        engine_params = {"search_query": search_query}
+        if page_token:
+            engine_params["sp"] = page_token
+        if country_code:
+            engine_params["gl"] = country_code
+        if language_code:
+            engine_params["hl"] = language_code
+
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+        return self.parse_page(self._client.search(self.ENGINE_NAME, engine_params))
+
+    def parse_page(self, raw_response: Dict[str, Any]) -> VideoListingPage:
+        page = VideoListingPage(
+            next_page_token=(raw_response.get("serpapi_pagination") or {}).get("next_page_token") or None,
+        )
+        for result in raw_response.get("video_results") or []:
+            video_id = video_id_from_link(result.get("link"))
+            if not video_id:
+                continue
+            channel_block = result.get("channel") or {}
+            thumbnail_block = result.get("thumbnail") or {}
+            if isinstance(thumbnail_block, str):
+                thumbnail_block = {"static": thumbnail_block}
+            page.videos.append(ListedVideo(
+                video_id=video_id,
+                title=result.get("title") or "",
+                description=result.get("description") or "",
+                thumbnail_url=thumbnail_block.get("static") or "",
+                length=str(result.get("length") or ""),
+                channel_name=channel_block.get("name") or "",
+                channel_link=channel_block.get("link") or "",
+                channel_thumbnail_url=channel_block.get("thumbnail") or "",
+            ))
+        return page
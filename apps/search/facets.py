@@ -0,0 +1,55 @@
+# apps/search/facets.py
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping
+
+from django.conf import settings
+
+from apps.category.models import Category
+from apps.program import EpisodeMediaTypeChoices, ProgramTypeChoices
+
+from .index import FACET_NAMES
+
+Facets = Dict[str, List[Dict[str, Any]]]
+
+
+def empty_counts() -> Dict[str, Counter]:
+    return {name: Counter() for name in FACET_NAMES}
+
+
+def accumulate(counts: Dict[str, Counter], rows: Iterable[Mapping[str, Any]], fields: Mapping[str, str]) -> None:
+    """
+    Add the rows of a grouped `values(*fields).annotate(count=...)` query to `counts`.
+    `fields` maps a facet name to its values() lookup.
+    """
+    for row in rows:
+        for name, field in fields.items():
+            value = row[field]
+            if value is not None:
+                counts[name][str(value)] += row["count"]
+
+
+def build_facets(counts: Mapping[str, Counter]) -> Facets:
+    """
+    Turn raw counts into the response shape:
+    `{facet: [{"value", "label", "count"}, ...]}`, most frequent value first.
+    Category names are resolved with a single query.
+    """
+    labels = {
+        "type": dict(ProgramTypeChoices.choices),
+        "media_type": dict(EpisodeMediaTypeChoices.choices),
+        "language": dict(settings.LANGUAGES),
+        "category": {},
+    }
+    if counts.get("category"):
+        labels["category"] = {
+            str(pk): name
+            for pk, name in Category.objects.filter(pk__in=list(counts["category"])).values_list("pk", "name")
+        }
+
+    return {
+        name: [
+            {"value": value, "label": str(labels[name].get(value, value)), "count": count}
+            for value, count in sorted(counts.get(name, {}).items(), key=lambda item: (-item[1], item[0]))
+        ]
+        for name in FACET_NAMES
+    }
@@ -0,0 +1,82 @@
+# apps/search/fuzzy.py
+import heapq
+import re
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+from .normalization import normalize
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """
+    Same trigram extraction as pg_trgm: every word is normalized and padded
+    with two spaces in front and one behind before being cut into trigrams.
+    """
+    grams: Set[str] = set()
+    for word in WORD_RE.findall(normalize(text)):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramIndex:
+    """
+    Pure-Python n-gram index used where pg_trgm is not available (SQLite)
+    and by the in-process engine to fuzzy-match its vocabulary.
+
+    Similarity is the pg_trgm one: shared trigrams / (trigrams of a + trigrams of b - shared).
+    """
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Set[str]] = {}
+        self.grams: Dict[str, FrozenSet[str]] = {}
+
+    def __len__(self):
+        return len(self.grams)
+
+    def __contains__(self, key):
+        return key in self.grams
+
+    def add(self, key: str, text: str) -> None:
+        if key in self.grams:
+            self.remove(key)
+
+        grams = trigrams(text)
+        if not grams:
+            return
+
+        self.grams[key] = grams
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        for gram in self.grams.pop(key, ()):
+            keys = self.postings.get(gram)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self.postings[gram]
+
+    def search(self, text: str, threshold: float = 0.3, limit: int = 100) -> List[Tuple[str, float]]:
+        """
+        Keys whose similarity with `text` is at least `threshold`, best first.
+        """
+        query_grams = trigrams(text)
+        if not query_grams:
+            return []
+
+        shared: Dict[str, int] = {}
+        for gram in query_grams:
+            for key in self.postings.get(gram, ()):
+                shared[key] = shared.get(key, 0) + 1
+
+        query_size = len(query_grams)
+        matches = []
+        for key, count in shared.items():
+            similarity = count / (query_size + len(self.grams[key]) - count)
+            if similarity >= threshold:
+                matches.append((key, similarity))
+
+        return heapq.nlargest(limit, matches, key=lambda match: (match[1], match[0]))
@@ -0,0 +1,140 @@
+# apps/search/highlight.py
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from apps.episode.models import Episode
+from apps.program.models import Program
+
+from .app_settings import app_settings
+from .index import tokenize
+from .normalization import ARABIC_DROPPED, normalize
+from .results import SearchResultPage
+
+# Words of the original text. Unlike TOKEN_RE it keeps the marks `normalize` drops
+# inside the word, so a token normalizes to the same term the index holds.
+WORD_RE = re.compile(r"[\w" + "".join(ARABIC_DROPPED) + r"]+", re.UNICODE)
+
+ELLIPSIS = "…"
+
+Span = Tuple[int, int]
+
+
+class QueryTerms:
+    """
+    Normalized terms of a query, matched the way the index matches them:
+    by prefix, except for single characters which must match a whole word.
+    """
+
+    def __init__(self, query: str) -> None:
+        self.terms = tuple(dict.fromkeys(tokenize(query)))
+        self.prefixes = tuple(term for term in self.terms if len(term) >= 2)
+
+    def __bool__(self):
+        return bool(self.terms)
+
+    def matches(self, word: str) -> bool:
+        word = normalize(word)
+        return word in self.terms or word.startswith(self.prefixes)
+
+    def occur_in(self, normalized_text: str) -> bool:
+        """
+        Cheap pre-check on an already normalized copy of a text.
+        """
+        return any(term in normalized_text for term in self.terms)
+
+    def spans(self, text: str, window: Optional[int] = None) -> List[Span]:
+        """
+        (start, end) offsets of the matching words of `text`. With `window`,
+        scanning stops `window` characters after the first match.
+        """
+        spans: List[Span] = []
+        for match in WORD_RE.finditer(text):
+            if window is not None and spans and match.start() >= spans[0][0] + window:
+                break
+            if self.matches(match.group()):
+                spans.append(match.span())
+        return spans
+
+
+def snippet(text: str, terms: QueryTerms, length: int) -> Optional[Dict[str, Any]]:
+    """
+    About `length` characters of `text` around its first match, cut on spaces,
+    with the offsets of the matches inside the snippet. None when nothing matches.
+    """
+    spans = terms.spans(text, window=length)
+    if not spans:
+        return None
+
+    first_start, first_end = spans[0]
+    start = max(0, first_start - length // 4)
+    if start:
+        space = text.find(" ", start, first_start)
+        start = space + 1 if space != -1 else start
+    end = min(len(text), max(start + length, first_end))
+    if end < len(text):
+        space = text.rfind(" ", first_end, end)
+        end = space if space != -1 else end
+
+    prefix = ELLIPSIS if start else ""
+    shift = len(prefix) - start
+    return {
+        "text": prefix + text[start:end] + (ELLIPSIS if end < len(text) else ""),
+        "offsets": [[span_start + shift, span_end + shift] for span_start, span_end in spans if span_end <= end],
+    }
+
+
+def plain_bodies(results: List[Dict[str, Any]]) -> Dict[str, Tuple[str, str]]:
+    """
+    (normalized body, plain-text body) of every result, one query per kind.
+    """
+    ids: Dict[str, List[str]] = {"program": [], "episode": []}
+    for result in results:
+        ids[result["kind"]].append(result["id"])
+
+    bodies = {}
+    for model, kind in ((Program, "program"), (Episode, "episode")):
+        if ids[kind]:
+            rows = model.objects.filter(pk__in=ids[kind]).values_list("id", "search_body", "plain_body")
+            bodies.update({f"{kind}:{pk}": (search_body, plain_body) for pk, search_body, plain_body in rows})
+    return bodies
+
+
+def highlight_page(page: SearchResultPage, query: str) -> SearchResultPage:
+    """
+    Add a `highlight` entry to every result of `page`:
+
+    - title: offsets of the matched words in the title.
+    - snippet: the description when it matches, otherwise a cut of the
+      plain-text body around the first match, with the offsets of the
+      matched words; None when only the title matches.
+
+    Offsets are [start, end) character positions, so clients mark them up
+    themselves and nothing has to be escaped. Bodies are read from the
+    plain-text copies made at save time, and only scanned when their
+    normalized copy contains a query term.
+    """
+    terms = QueryTerms(query)
+    if not page.results or not terms or not app_settings.SEARCH_HIGHLIGHT_ENABLED:
+        return page
+
+    length = app_settings.SEARCH_HIGHLIGHT_SNIPPET_LENGTH
+    bodies = plain_bodies(page.results)
+    results = []
+    for result in page.results:
+        found = snippet(result.get("description") or "", terms, length)
+        if found is None:
+            search_body, plain_body = bodies.get(f"{result['kind']}:{result['id']}", ("", ""))
+            if plain_body and terms.occur_in(search_body):
+                found = snippet(plain_body, terms, length)
+
+        # Payloads may be shared with the index: copy rather than update them.
+        results.append({
+            **result,
+            "highlight": {
+                "title": [list(span) for span in terms.spans(result.get("title") or "")],
+                "snippet": found,
+            },
+        })
+
+    page.results = results
+    return page
@@ -0,0 +1,321 @@
+# apps/search/index.py
+import bisect
+import contextlib
+import math
+import os
+import pickle
+import re
+import sys
+import tempfile
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non POSIX platforms
+    fcntl = None
+
+from .fuzzy import TrigramIndex
+from .normalization import normalize
+
+if TYPE_CHECKING:
+    from .documents import SearchDocument
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Bumped whenever tokenization or the snapshot layout changes, so stale snapshots are rebuilt.
+SNAPSHOT_VERSION = 3
+
+# Facet values of a document are stored as a tuple in this order.
+FACET_NAMES = ("category", "type", "language", "media_type")
+
+
+def tokenize(text: str) -> List[str]:
+    if not text:
+        return []
+    return TOKEN_RE.findall(normalize(text))
+
+
+class InvertedIndex:
+    """
+    In-process inverted index over Program/Episode documents.
+
+    - postings: term -> {document key: weight}, where the weight is the sum of
+      the field weights of every occurrence of the term in the document.
+    - documents: document key -> result payload, so a search never touches the database.
+    - facets: document key -> facet values (FACET_NAMES order) for facet counts.
+    - Every structure is made of builtins only, which keeps the pickled snapshot
+      compact and fast to load.
+    - A trigram index of the vocabulary backs fuzzy matching; it is built on
+      first use and never written to the snapshot.
+    - journal_id names the change journal kept next to the snapshot
+      (see `apps.search.backends.memory.IndexJournal`).
+    """
+
+    def __init__(self, field_weights: Dict[str, float], max_prefix_expansions: int = 64):
+        self.field_weights = dict(field_weights)
+        self.max_prefix_expansions = max_prefix_expansions
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.documents: Dict[str, dict] = {}
+        self.published: Dict[str, int] = {}
+        self.parents: Dict[str, str] = {}
+        self.terms: Dict[str, tuple] = {}
+        self.facets: Dict[str, tuple] = {}
+        self.journal_id = ""
+        self._vocabulary: Optional[List[str]] = None
+        self._trigrams: Optional[TrigramIndex] = None
+
+    def __len__(self):
+        return len(self.documents)
+
+    def __contains__(self, key):
+        return key in self.documents
+
+    def add(self, document: "SearchDocument") -> None:
+        key = document.key
+        if key in self.documents:
+            self.remove(key)
+
+        weights: Dict[str, float] = {}
+        for field, text in document.fields.items():
+            field_weight = self.field_weights.get(field, 1.0)
+            for token in tokenize(text):
+                # Interned terms are shared by postings and `terms`, so the snapshot stores them once.
+                token = sys.intern(token)
+                weights[token] = weights.get(token, 0.0) + field_weight
+
+        for term, weight in weights.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                self._vocabulary = None
+                if self._trigrams is not None:
+                    self._trigrams.add(term, term)
+            postings[key] = weight
+
+        self.terms[key] = tuple(weights)
+        self.documents[key] = document.payload
+        self.published[key] = document.published_at
+        if document.parent:
+            self.parents[key] = document.parent
+        if document.facets:
+            self.facets[key] = tuple(
+                None if document.facets.get(name) is None else sys.intern(str(document.facets[name]))
+                for name in FACET_NAMES
+            )
+
+    def add_many(self, documents: Iterable["SearchDocument"]) -> int:
+        count = 0
+        for document in documents:
+            self.add(document)
+            count += 1
+        return count
+
+    def merge(self, other: "InvertedIndex") -> None:
+        """
+        Add every document of `other`, built over keys this index does not hold
+        (e.g. by another reindex worker). Terms are interned again so the
+        merged snapshot stores each of them once.
+        """
+        for term, postings in other.postings.items():
+            term = sys.intern(term)
+            current = self.postings.get(term)
+            if current is None:
+                self.postings[term] = postings
+            else:
+                current.update(postings)
+
+        for key, terms in other.terms.items():
+            self.terms[key] = tuple(map(sys.intern, terms))
+        self.documents.update(other.documents)
+        self.published.update(other.published)
+        self.parents.update(other.parents)
+        self.facets.update(other.facets)
+        self._vocabulary = None
+        self._trigrams = None
+
+    def remove(self, key: str) -> None:
+        for term in self.terms.pop(key, ()):
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(key, None)
+            if not postings:
+                del self.postings[term]
+                self._vocabulary = None
+                if self._trigrams is not None:
+                    self._trigrams.remove(term)
+
+        self.documents.pop(key, None)
+        self.published.pop(key, None)
+        self.parents.pop(key, None)
+        self.facets.pop(key, None)
+
+    def facet_counts(self, keys: Iterable[str]) -> Dict[str, Counter]:
+        """
+        Number of documents among `keys` per facet value.
+        """
+        counts = {name: Counter() for name in FACET_NAMES}
+        for values in map(self.facets.get, keys):
+            if values is None:
+                continue
+            for name, value in zip(FACET_NAMES, values):
+                if value is not None:
+                    counts[name][value] += 1
+        return counts
+
+    def is_visible(self, key: str) -> bool:
+        """
+        An episode is only visible while its program is indexed.
+        """
+        parent = self.parents.get(key)
+        return parent is None or parent in self.documents
+
+    def expand(self, term: str) -> List[str]:
+        """
+        Indexed terms starting with `term` (the term itself included).
+        """
+        if len(term) < 2:
+            return [term] if term in self.postings else []
+
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+
+        vocabulary = self._vocabulary
+        position = bisect.bisect_left(vocabulary, term)
+        expansions = []
+        while position < len(vocabulary) and len(expansions) < self.max_prefix_expansions:
+            candidate = vocabulary[position]
+            if not candidate.startswith(term):
+                break
+            expansions.append(candidate)
+            position += 1
+
+        return expansions
+
+    def similar_terms(self, term: str, threshold: float, limit: int = 8) -> List[Tuple[str, float]]:
+        """
+        Indexed terms whose trigram similarity with `term` reaches `threshold`.
+        """
+        if self._trigrams is None:
+            trigrams = TrigramIndex()
+            for candidate in self.postings:
+                trigrams.add(candidate, candidate)
+            self._trigrams = trigrams
+
+        return self._trigrams.search(term, threshold=threshold, limit=limit)
+
+    def search(self, query: str, fuzzy_threshold: Optional[float] = None) -> Dict[str, float]:
+        """
+        Score every document matching all query terms (prefix match per term).
+        Score = sum over terms of field weight * idf.
+
+        With `fuzzy_threshold`, each term also matches similar indexed terms,
+        scaled down by their similarity.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return {}
+
+        total = len(self.documents) or 1
+        scores: Optional[Dict[str, float]] = None
+
+        for term in dict.fromkeys(terms):
+            candidates = {candidate: 1.0 for candidate in self.expand(term)}
+            if fuzzy_threshold is not None:
+                for candidate, similarity in self.similar_terms(term, fuzzy_threshold):
+                    candidates.setdefault(candidate, similarity)
+
+            term_scores: Dict[str, float] = {}
+            for candidate, factor in candidates.items():
+                postings = self.postings[candidate]
+                idf = math.log(1.0 + total / len(postings))
+                for key, weight in postings.items():
+                    score = weight * idf * factor
+                    if score > term_scores.get(key, 0.0):
+                        term_scores[key] = score
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {key: scores[key] + score for key, score in term_scores.items() if key in scores}
+
+            if not scores:
+                return {}
+
+        return {key: score for key, score in scores.items() if self.is_visible(key)}
+
+    def to_state(self) -> dict:
+        return {
+            "version": SNAPSHOT_VERSION,
+            "field_weights": self.field_weights,
+            "postings": self.postings,
+            "documents": self.documents,
+            "published": self.published,
+            "parents": self.parents,
+            "terms": self.terms,
+            "facets": self.facets,
+            "journal_id": self.journal_id,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict, max_prefix_expansions: int = 64) -> "InvertedIndex":
+        index = cls(state["field_weights"], max_prefix_expansions=max_prefix_expansions)
+        index.postings = state["postings"]
+        index.documents = state["documents"]
+        index.published = state["published"]
+        index.parents = state["parents"]
+        index.terms = state["terms"]
+        index.facets = state["facets"]
+        index.journal_id = state.get("journal_id", "")
+        return index
+
+    def save(self, path: str) -> None:
+        """
+        Write the snapshot atomically: readers either see the old or the new file.
+        """
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".index-")
+        try:
+            with os.fdopen(descriptor, "wb") as handle:
+                pickle.dump(self.to_state(), handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str, max_prefix_expansions: int = 64) -> Optional["InvertedIndex"]:
+        """
+        Load a snapshot, or return None when it is missing or was written by another version.
+        """
+        try:
+            with open(path, "rb") as handle:
+                state = pickle.load(handle)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        if not isinstance(state, dict) or state.get("version") != SNAPSHOT_VERSION:
+            return None
+
+        return cls.from_state(state, max_prefix_expansions=max_prefix_expansions)
+
+
+@contextlib.contextmanager
+def snapshot_lock(path: str):
+    """
+    Exclusive lock shared by every worker writing the same snapshot file.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.lock", "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
@@ -0,0 +1,191 @@
+# apps/search/indexing.py
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from django.core.signals import request_finished, request_started
+from django.db import connections, transaction
+from kombu.exceptions import OperationalError
+
+from apps.core.middleware import get_current_request
+
+from .app_settings import app_settings
+from .cache import get_cache, incr, is_shared
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("program", "episode")
+
+CHANGES_GENERATION_KEY = "search:index:generation"
+CHANGES_KEY = "search:index:changes:{}"
+
+
+class IndexQueue:
+    """
+    Deferred, coalesced search index updates.
+
+    - `add` only remembers (kind, id); ten saves of one row are one update.
+    - Nothing leaves before the transaction commits (`transaction.on_commit`),
+      so rows that roll back are never indexed.
+    - Inside a request, committed ids are held until the response is done
+      and sent together; elsewhere (shell, commands, tasks) right after the commit.
+    - Ids are sent to the `apply_index_updates` Celery task by batches of
+      SEARCH_INDEX_BATCH_SIZE, or applied inline when SEARCH_INDEX_ASYNC is off
+      or the broker cannot be reached.
+    - The worker re-reads the rows: an id only means "bring this row up to
+      date", and a stale id costs a redundant refresh, never a wrong index.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def _state(self, name: str) -> Dict[str, Dict[str, None]]:
+        state = getattr(self._local, name, None)
+        if state is None:
+            state = {kind: {} for kind in KINDS}
+            setattr(self._local, name, state)
+        return state
+
+    def add(self, kind: str, pk, using=None) -> None:
+        self._state("pending")[kind][str(pk)] = None
+
+        connection = transaction.get_connection(using)
+        if not any(entry[1] == self._committed for entry in connection.run_on_commit):
+            transaction.on_commit(self._committed, using=using)
+
+    def _committed(self) -> None:
+        pending, committed = self._state("pending"), self._state("committed")
+        for kind in KINDS:
+            committed[kind].update(pending[kind])
+            pending[kind].clear()
+
+        if get_current_request() is None:
+            self.send()
+
+    def reset(self, **kwargs) -> None:
+        """
+        Forget ids left over by rolled back transactions.
+        """
+        self._local.pending = None
+
+    def send(self, **kwargs) -> None:
+        committed = self._state("committed")
+        self._local.committed = None
+        if not any(committed.values()):
+            return
+
+        batch_size = app_settings.SEARCH_INDEX_BATCH_SIZE
+        programs, episodes = list(committed["program"]), list(committed["episode"])
+        for start in range(0, max(len(programs), len(episodes)), batch_size):
+            dispatch(programs[start:start + batch_size], episodes[start:start + batch_size])
+
+
+def dispatch(program_ids: List[str], episode_ids: List[str]) -> None:
+    from .services import SearchService
+    from .tasks import apply_index_updates
+
+    if app_settings.SEARCH_INDEX_ASYNC:
+        try:
+            apply_index_updates.delay(program_ids, episode_ids)
+            return
+        except OperationalError:
+            logger.warning("Celery broker unreachable, applying %d index updates inline.",
+                           len(program_ids) + len(episode_ids))
+
+    SearchService.sync(program_ids, episode_ids)
+
+
+class IndexChangeFeed:
+    """
+    Batches applied by `SearchService.sync`, shared through the search cache
+    so that every process follows them, not only the worker that applied
+    them: the autocomplete table and the trigram index of the database
+    backend live in the memory of each process.
+
+    - `publish` numbers every batch with a shared generation and keeps its
+      ids for SEARCH_INDEX_CHANGES_TIMEOUT seconds.
+    - `poll` is called by the readers of those structures; at most every
+      SEARCH_INDEX_CHANGES_POLL_INTERVAL seconds it compares generations and
+      replays the missing batches on a background thread, or rebuilds the
+      structures when some batches expired or too many are missing.
+    - On a process-local cache nothing is shared: other processes only
+      catch up at their periodic rebuild (SEARCH_SUGGEST_REBUILD_INTERVAL,
+      SEARCH_TRIGRAM_REBUILD_INTERVAL).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._seen: Optional[int] = None
+        self._checked_at = 0.0
+
+    def publish(self, program_ids: List[str], episode_ids: List[str]) -> None:
+        cache = get_cache()
+        if not is_shared(cache):
+            return
+        generation = incr(cache, CHANGES_GENERATION_KEY)
+        cache.set(
+            CHANGES_KEY.format(generation),
+            (list(map(str, program_ids)), list(map(str, episode_ids))),
+            timeout=app_settings.SEARCH_INDEX_CHANGES_TIMEOUT,
+        )
+
+    def poll(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < app_settings.SEARCH_INDEX_CHANGES_POLL_INTERVAL:
+            return
+        if not self._lock.acquire(blocking=False):
+            return
+
+        started = False
+        try:
+            self._checked_at = now
+            cache = get_cache()
+            if not is_shared(cache):
+                return
+            latest = int(cache.get(CHANGES_GENERATION_KEY) or 0)
+            if self._seen is None:
+                # The structures are built from the database after this point.
+                self._seen = latest
+            elif latest != self._seen:
+                threading.Thread(
+                    target=self._catch_up, args=(self._seen, latest), name="search-index-changes", daemon=True
+                ).start()
+                started = True
+        finally:
+            if not started:
+                self._lock.release()
+
+    def _catch_up(self, seen: int, latest: int) -> None:
+        from .services import SearchService
+
+        try:
+            batches = {}
+            if 0 < latest - seen <= app_settings.SEARCH_INDEX_CHANGES_MAX_REPLAY:
+                keys = [CHANGES_KEY.format(generation) for generation in range(seen + 1, latest + 1)]
+                batches = get_cache().get_many(keys)
+                batches = batches if len(batches) == len(keys) else {}
+
+            if batches:
+                program_ids, episode_ids = {}, {}
+                for batch_programs, batch_episodes in batches.values():
+                    program_ids.update(dict.fromkeys(batch_programs))
+                    episode_ids.update(dict.fromkeys(batch_episodes))
+                SearchService.refresh_local(list(program_ids), list(episode_ids))
+            else:
+                logger.info("Search index batches %d..%d not available, rebuilding in-process structures.",
+                            seen + 1, latest)
+                SearchService.reload_local()
+            self._seen = latest
+        except Exception:
+            logger.exception("Could not follow the search index batches %d..%d.", seen + 1, latest)
+        finally:
+            self._lock.release()
+            connections.close_all()
+
+
+index_queue = IndexQueue()
+index_changes = IndexChangeFeed()
+
+request_started.connect(index_queue.reset, dispatch_uid="search_index_queue_reset")
+request_finished.connect(index_queue.send, dispatch_uid="search_index_queue_send")
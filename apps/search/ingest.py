@@ -0,0 +1,68 @@
+# apps/search/ingest.py
+import dataclasses
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+from kombu.exceptions import OperationalError
+
+from .app_settings import app_settings
+from .backends import get_search_backend
+from .backends.base import EPISODE_FIELDS, episode_result
+from .cache import get_cache
+from .external_search_api import VideoMetadata
+
+logger = logging.getLogger(__name__)
+
+QUEUED_KEY = "search:ingest:{video_id}"
+
+
+def queue_external_videos(videos: Iterable[VideoMetadata]) -> int:
+    """
+    Hand the videos the external provider answered with to the importer
+    (`apps.importer.tasks.import_external_videos`), in one background task.
+
+    A video is queued at most once per SEARCH_EXTERNAL_INGEST_DEDUPE_TIMEOUT,
+    whatever the number of workers searching for it meanwhile; when the
+    broker cannot be reached the videos are left for a later search.
+    Returns the number of videos queued.
+    """
+    if not app_settings.SEARCH_EXTERNAL_INGEST_ENABLED:
+        return 0
+
+    from apps.importer.tasks import import_external_videos
+
+    cache = get_cache()
+    timeout = app_settings.SEARCH_EXTERNAL_INGEST_DEDUPE_TIMEOUT
+    queued = [
+        video for video in videos
+        if video is not None and cache.add(QUEUED_KEY.format(video_id=video.video_id), 1, timeout=timeout)
+    ]
+    if not queued:
+        return 0
+
+    try:
+        import_external_videos.delay([dataclasses.asdict(video) for video in queued])
+    except OperationalError:
+        logger.warning("Could not queue %d external videos for import: broker unavailable.", len(queued))
+        cache.delete_many([QUEUED_KEY.format(video_id=video.video_id) for video in queued])
+        return 0
+    return len(queued)
+
+
+def imported_video(video_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Search result of the published episode a YouTube video was imported as
+    (by any source of system "youtube"), None while it is not in the catalog.
+    Lets a `video_id` lookup be answered internally once its import ran,
+    whatever the query text.
+    """
+    from apps.importer.models import ImportRecord
+
+    episode_ids = ImportRecord.objects.filter(
+        entity_type=ImportRecord.EPISODE,
+        external_id=video_id,
+        source__system="youtube",
+        episode__isnull=False,
+    ).values("episode_id")
+    row = get_search_backend().published_episodes().filter(pk__in=episode_ids).values(*EPISODE_FIELDS).first()
+    return episode_result(row) if row is not None else None
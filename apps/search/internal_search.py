@@ -1,111 +1,143 @@
 # apps/search/internal_search.py
+from typing import Optional
 
-from django.db.models import Q
+from asgiref.sync import sync_to_async
 
-from apps.program.models import Program
-from apps.episode.models import Episode
+from .app_settings import app_settings
+from .backends import get_search_backend
+from .cache import result_cache
+from .facets import build_facets
+from .highlight import highlight_page
+from .results import SearchResultPage, decode_cursor
+from .spelling import SpellingService
 
 
-def search_internal_content(query: str, limit: int = 10, offset: int = 0):
+def search_internal_content(
+    query: str,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    language: Optional[str] = None,
+) -> SearchResultPage:
     """
-    Simple internal search:
+    Internal search over Program and Episode:
 
-    - Looks into Program and Episode models.
-    - Searches in title + short/long description/body.
-    - Returns a flat list of results with a `kind` key
-      so the caller knows if it's a program or an episode.
+    - Delegates to the configured search backend: a database backend by
+      default (PostgreSQL full-text search, icontains elsewhere), or the
+      in-process inverted index (`MemorySearchBackend`) when SEARCH_BACKEND
+      selects it on a single-host deployment.
+    - Returns one page of a single merged stream ordered by relevance,
+      then publish date. Each result has a `kind` key so the caller
+      knows if it's a program or an episode.
+    - When nothing matches exactly, falls back to typo-tolerant trigram
+      matching on titles (`fuzzy=True` on the page), so misspellings are
+      answered internally instead of by the external provider.
+    - When even that finds nothing, the query is spell-checked against the
+      indexed vocabulary (`did_you_mean` on the page, see `apps.search.spelling`)
+      and, with SEARCH_SPELLING_AUTO_RETRY, searched again corrected
+      (`corrected=True`); next pages keep following the corrected stream.
+    - `cursor` is the opaque `next_cursor` of the previous page
+      (raises InvalidCursor when it cannot be decoded).
+    - The first page of exact matches carries facet counts (category,
+      program type, language, media type) over the whole result set;
+      they are cached with the page.
+    - Every result carries a `highlight` entry: offsets of the matched
+      words in the title and a snippet around the first match, cut from
+      the description or the plain-text body (see `apps.search.highlight`).
+    - Pages are cached per normalized query, page window and language
+      until the catalog changes (see `apps.search.cache`).
     """
     if not query:
-        return []
-
-    # Normalize pagination window
-    start = max(offset, 0)
-    end = start + max(limit, 1)
-
-    # Programs: search title + short_description + long_description
-    program_qs = (
-        Program.objects.filter(
-            Q(is_active=True),
-            Q(is_published=True),
-            Q(
-                Q(title__icontains=query)
-                | Q(short_description__icontains=query)
-                | Q(long_description__icontains=query)
-            ),
-        )
-        .select_related("category")
-        .order_by("-publish_date", "-id")
-        .values(
-            "id",
-            "title",
-            "short_description",
-            "slug",
-            "cover_image_url",
-            "type",
-            "language",
-            "publish_date",
-        )
+        return SearchResultPage()
+
+    after = decode_cursor(cursor) if cursor else None
+    return result_cache.get_or_compute(
+        query, limit, cursor, language, lambda: _search(query, limit, after)
     )
 
-    program_rows = list(program_qs[start:end])
-
-    program_results = [
-        {
-            "kind": "program",
-            "id": row["id"],
-            "title": row["title"],
-            "description": row["short_description"],
-            "slug": row["slug"],
-            "cover_image_url": row["cover_image_url"],
-            "type": row["type"],
-            "language": row["language"],
-            "publish_date": row["publish_date"],
-        }
-        for row in program_rows
-    ]
-
-    # Episodes: search title + short_description + body
-    episode_qs = (
-        Episode.objects.filter(
-            Q(is_published=True),
-            Q(program__is_active=True),
-            Q(program__is_published=True),
-            Q(
-                Q(title__icontains=query)
-                | Q(short_description__icontains=query)
-                | Q(body__icontains=query)
-            ),
-        )
-        .select_related("program", "program__category")
-        .order_by("-publish_date", "-id")
-        .values(
-            "id",
-            "title",
-            "short_description",
-            "slug",
-            "thumbnail_url",
-            "media_type",
-            "publish_date",
-            "program__slug",
-        )
+
+def warm_internal_content(
+    query: str,
+    limit: int = 10,
+    language: Optional[str] = None,
+    timeout: Optional[int] = None,
+) -> SearchResultPage:
+    """
+    Pre-compute the first page of `query` into the result cache (see `ResultCache.warm`).
+    """
+    return result_cache.warm(query, limit, language, lambda: _search(query, limit, None), timeout=timeout)
+
+
+def _search(query: str, limit: int, after) -> SearchResultPage:
+    page = _search_query(query, limit, after)
+    if page.results:
+        return highlight_page(page, query)
+
+    correction = SpellingService.correct(query)
+    if correction and app_settings.SEARCH_SPELLING_AUTO_RETRY:
+        corrected = _search_query(correction, limit, after)
+        if corrected.results:
+            corrected.did_you_mean, corrected.corrected = correction, True
+            return highlight_page(corrected, correction)
+
+    page.did_you_mean = correction
+    return page
+
+
+def _search_query(query: str, limit: int, after) -> SearchResultPage:
+    backend = get_search_backend()
+    page = backend.search(query, limit=limit, after=after)
+
+    if not page.results and app_settings.SEARCH_FUZZY_ENABLED:
+        page = backend.fuzzy_search(query, limit=limit, after=after)
+        page.fuzzy = True
+    elif page.results and after is None:
+        page.facets = build_facets(backend.facets(query))
+
+    return page
+
+
+async def asearch_internal_content(
+    query: str,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    language: Optional[str] = None,
+) -> SearchResultPage:
+    """
+    `search_internal_content` for async views, on the backends' async entry points.
+    """
+    if not query:
+        return SearchResultPage()
+
+    after = decode_cursor(cursor) if cursor else None
+    return await result_cache.aget_or_compute(
+        query, limit, cursor, language, lambda: _asearch(query, limit, after)
     )
 
-    episode_rows = list(episode_qs[start:end])
-
-    episode_results = [
-        {
-            "kind": "episode",
-            "id": row["id"],
-            "title": row["title"],
-            "description": row["short_description"],
-            "slug": row["slug"],
-            "thumbnail_url": row["thumbnail_url"],
-            "media_type": row["media_type"],
-            "publish_date": row["publish_date"],
-            "program_slug": row["program__slug"],
-        }
-        for row in episode_rows
-    ]
-
-
-    return program_results + episode_results
\ No newline at end of file
+
+async def _asearch(query: str, limit: int, after) -> SearchResultPage:
+    page = await _asearch_query(query, limit, after)
+    if page.results:
+        return await sync_to_async(highlight_page)(page, query)
+
+    correction = await sync_to_async(SpellingService.correct)(query)
+    if correction and app_settings.SEARCH_SPELLING_AUTO_RETRY:
+        corrected = await _asearch_query(correction, limit, after)
+        if corrected.results:
+            corrected.did_you_mean, corrected.corrected = correction, True
+            return await sync_to_async(highlight_page)(corrected, correction)
+
+    page.did_you_mean = correction
+    return page
+
+
+async def _asearch_query(query: str, limit: int, after) -> SearchResultPage:
+    backend = get_search_backend()
+    page = await backend.asearch(query, limit=limit, after=after)
+
+    if not page.results and app_settings.SEARCH_FUZZY_ENABLED:
+        page = await backend.afuzzy_search(query, limit=limit, after=after)
+        page.fuzzy = True
+    elif page.results and after is None:
+        page.facets = await sync_to_async(build_facets)(await backend.afacets(query))
+
+    return page
@@ -0,0 +1,49 @@
+# apps/search/management/commands/backfill_search_text.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.program.models import Program
+from apps.episode.models import Episode
+
+from ...backends import get_search_backend
+from ...markup import strip_markup
+from ...normalization import (
+    EPISODE_NORMALIZED_FIELDS,
+    EPISODE_PLAIN_FIELDS,
+    PROGRAM_NORMALIZED_FIELDS,
+    PROGRAM_PLAIN_FIELDS,
+    backfill,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the normalized search columns and plain-text bodies of every Program and Episode, "
+        "then let the search backend rebuild what it derives from them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--skip-rebuild",
+            action="store_true",
+            help="Only update the columns, leave the search backend untouched.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        started = time.monotonic()
+
+        # Plain-text bodies first: the normalized bodies are computed from them.
+        backfill(Program.objects.all(), PROGRAM_PLAIN_FIELDS, chunk_size=chunk_size, transform=strip_markup)
+        backfill(Episode.objects.all(), EPISODE_PLAIN_FIELDS, chunk_size=chunk_size, transform=strip_markup)
+        programs = backfill(Program.objects.all(), PROGRAM_NORMALIZED_FIELDS, chunk_size=chunk_size)
+        episodes = backfill(Episode.objects.all(), EPISODE_NORMALIZED_FIELDS, chunk_size=chunk_size)
+        self.stdout.write(
+            f"Normalized {programs} programs and {episodes} episodes in {time.monotonic() - started:.1f}s."
+        )
+
+        if not options["skip_rebuild"]:
+            documents = get_search_backend().rebuild()
+            self.stdout.write(f"Search backend rebuilt ({documents} documents).")
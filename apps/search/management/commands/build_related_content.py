@@ -0,0 +1,26 @@
+# apps/search/management/commands/build_related_content.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...related import build_related
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute the related episodes and programs of every visible item from TF-IDF vectors "
+        "of titles, descriptions, bodies and tags. Incremental by default: only items without "
+        "a list yet are computed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Recompute every list.")
+        parser.add_argument("--top", type=int, default=None, help="Defaults to SEARCH_RELATED_TOP_K.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        stats = build_related(full=options["full"], k=options["top"])
+        self.stdout.write(
+            f"{stats['computed']} of {stats['items']} items computed, {stats['linked']} lists linked, "
+            f"{stats['pruned']} pruned in {time.monotonic() - started:.1f}s."
+        )
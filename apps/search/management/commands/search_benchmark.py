@@ -0,0 +1,73 @@
+# apps/search/management/commands/search_benchmark.py
+import json
+import os
+import subprocess
+import tempfile
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from ... import benchmark
+from ...backends import reset_search_backend
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark internal search on a synthetic Arabic/English catalog of growing size "
+        "and write p50/p95/p99 latency, queries and rows scanned per request to a JSON file. "
+        "Runs in a throw-away test database, never in the configured one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", default=[10000, 100000, 1000000],
+            help="Corpus sizes in episodes.",
+        )
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs of every query.")
+        parser.add_argument("--queries", type=int, default=10, help="Queries per category.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", default="search-benchmark.json")
+        parser.add_argument("--keepdb", action="store_true", help="Keep the test database between runs.")
+
+    def handle(self, *args, **options):
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=options["keepdb"])
+
+        try:
+            with tempfile.TemporaryDirectory() as directory, override_settings(
+                SEARCH_INDEX_PATH=os.path.join(directory, "index.pickle"),
+                SEARCH_RESULT_CACHE_ENABLED=False,
+            ):
+                reset_search_backend()
+                report = benchmark.run(
+                    options["sizes"],
+                    repeat=options["repeat"],
+                    seed=options["seed"],
+                    queries_per_category=options["queries"],
+                )
+        finally:
+            reset_search_backend()
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options["keepdb"])
+
+        report["commit"] = current_commit()
+        report["created_at"] = timezone.now().isoformat()
+
+        with open(options["output"], "w", encoding="utf-8") as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+
+        for size, result in report["sizes"].items():
+            for category, stats in result["categories"].items():
+                self.stdout.write(
+                    f"{size:>8} {category:<17} p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms "
+                    f"p99={stats['p99_ms']}ms queries={stats['queries_per_request']}"
+                )
+        self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
@@ -0,0 +1,13 @@
+# apps/search/management/commands/search_cache_stats.py
+import json
+
+from django.core.management.base import BaseCommand
+
+from ...cache import result_cache
+
+
+class Command(BaseCommand):
+    help = "Print the hit/miss counters and the catalog generation of the search result cache."
+
+    def handle(self, *args, **options):
+        self.stdout.write(json.dumps(result_cache.stats(), indent=2))
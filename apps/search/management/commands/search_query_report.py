@@ -0,0 +1,26 @@
+# apps/search/management/commands/search_query_report.py
+import json
+
+from django.core.management.base import BaseCommand
+
+from ... import analytics
+from ...app_settings import app_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the most searched queries and the queries internal search could not answer "
+        "over the last days, from the search analytics."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Defaults to SEARCH_ANALYTICS_WINDOW_DAYS.")
+        parser.add_argument("--top", type=int, default=None, help="Defaults to SEARCH_ANALYTICS_REPORT_TOP.")
+
+    def handle(self, *args, **options):
+        top = options["top"] or app_settings.SEARCH_ANALYTICS_REPORT_TOP
+        report = {
+            "top_queries": analytics.top_queries(top, days=options["days"]),
+            "zero_result_queries": analytics.zero_result_queries(top, days=options["days"]),
+        }
+        self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
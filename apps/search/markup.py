@@ -0,0 +1,29 @@
+# apps/search/markup.py
+import html
+import re
+from typing import Optional
+
+# Content that is never displayed.
+HIDDEN_RE = re.compile(r"<!--.*?-->|<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
+# Tags that break the text flow become a space, so words on both sides do not stick together.
+BREAK_TAG_RE = re.compile(
+    r"</?(?:address|article|aside|blockquote|br|dd|div|dl|dt|figcaption|figure|footer|h[1-6]|header|hr|"
+    r"li|main|nav|ol|p|pre|section|table|td|th|tr|ul)\b[^>]*>",
+    re.IGNORECASE,
+)
+TAG_RE = re.compile(r"<[^>]*>")
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def strip_markup(text: Optional[str]) -> str:
+    """
+    Plain-text copy of a rich text body: comments, scripts and tags removed,
+    entities decoded and whitespace collapsed to single spaces.
+    """
+    if not text:
+        return ""
+    text = HIDDEN_RE.sub(" ", text)
+    text = BREAK_TAG_RE.sub(" ", text)
+    text = TAG_RE.sub("", text)
+    return WHITESPACE_RE.sub(" ", html.unescape(text)).strip()
@@ -0,0 +1,60 @@
+# Generated by Django 4.1.4 on 2026-10-18 09:14
+
+from django.db import migrations
+
+# Mirrors the default SEARCH_TEXT_SEARCH_CONFIGS at the time of the migration.
+TEXT_SEARCH_CONFIG_SQL = "(CASE {column} WHEN 'ar' THEN 'arabic' WHEN 'en' THEN 'english' ELSE 'simple' END)::regconfig"
+
+PROGRAM_BACKFILL_SQL = """
+UPDATE program_program SET search_vector =
+    setweight(to_tsvector({config}, coalesce(title, '')), 'A')
+    || setweight(to_tsvector({config}, coalesce(short_description, '')), 'B')
+    || setweight(to_tsvector({config}, coalesce(long_description, '')), 'C')
+""".format(config=TEXT_SEARCH_CONFIG_SQL.format(column="language"))
+
+EPISODE_BACKFILL_SQL = """
+UPDATE episode_episode AS e SET search_vector =
+    setweight(to_tsvector({config}, coalesce(e.title, '')), 'A')
+    || setweight(to_tsvector({config}, coalesce(e.short_description, '')), 'B')
+    || setweight(to_tsvector({config}, coalesce(e.body, '')), 'C')
+FROM program_program AS p
+WHERE p.id = e.program_id
+""".format(config=TEXT_SEARCH_CONFIG_SQL.format(column="p.language"))
+
+
+def create_search_indexes(apps, schema_editor):
+    """
+    GIN indexes only exist on PostgreSQL; other databases keep the icontains fallback.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS program_search_vector_gin ON program_program USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS episode_search_vector_gin ON episode_episode USING gin (search_vector)"
+    )
+    schema_editor.execute(PROGRAM_BACKFILL_SQL)
+    schema_editor.execute(EPISODE_BACKFILL_SQL)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("DROP INDEX IF EXISTS program_search_vector_gin")
+    schema_editor.execute("DROP INDEX IF EXISTS episode_search_vector_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_delete_program'),
+        ('program', '0002_program_search_vector'),
+        ('episode', '0004_episode_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
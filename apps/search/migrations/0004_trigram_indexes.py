@@ -0,0 +1,40 @@
+# Generated by Django 4.1.4 on 2026-10-18 11:02
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    Trigram indexes only exist on PostgreSQL; other databases use the pure-Python n-gram index.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS program_title_trgm ON program_program USING gin (title gin_trgm_ops)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS episode_title_trgm ON episode_episode USING gin (title gin_trgm_ops)"
+    )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("DROP INDEX IF EXISTS program_title_trgm")
+    schema_editor.execute("DROP INDEX IF EXISTS episode_title_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0003_search_vector_indexes'),
+    ]
+
+    operations = [
+        # CreateExtension is a no-op on databases other than PostgreSQL.
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.1.4 on 2026-10-18 12:24
+
+from django.db import migrations
+
+from apps.search import normalization
+
+# Mirrors the default SEARCH_TEXT_SEARCH_CONFIGS at the time of the migration.
+TEXT_SEARCH_CONFIG_SQL = "(CASE {column} WHEN 'ar' THEN 'arabic' WHEN 'en' THEN 'english' ELSE 'simple' END)::regconfig"
+
+PROGRAM_VECTOR_SQL = """
+UPDATE program_program SET search_vector =
+    setweight(to_tsvector({config}, search_title), 'A')
+    || setweight(to_tsvector({config}, search_summary), 'B')
+    || setweight(to_tsvector({config}, search_body), 'C')
+""".format(config=TEXT_SEARCH_CONFIG_SQL.format(column="language"))
+
+EPISODE_VECTOR_SQL = """
+UPDATE episode_episode AS e SET search_vector =
+    setweight(to_tsvector({config}, e.search_title), 'A')
+    || setweight(to_tsvector({config}, e.search_summary), 'B')
+    || setweight(to_tsvector({config}, e.search_body), 'C')
+FROM program_program AS p
+WHERE p.id = e.program_id
+""".format(config=TEXT_SEARCH_CONFIG_SQL.format(column="p.language"))
+
+
+# Shadow columns as of this migration (bodies are normalized from plain_body since 0009).
+PROGRAM_NORMALIZED_FIELDS = {
+    "search_title": "title",
+    "search_summary": "short_description",
+    "search_body": "long_description",
+}
+EPISODE_NORMALIZED_FIELDS = {
+    "search_title": "title",
+    "search_summary": "short_description",
+    "search_body": "body",
+}
+
+
+def backfill_normalized_text(apps, schema_editor):
+    Program = apps.get_model("program", "Program")
+    Episode = apps.get_model("episode", "Episode")
+    normalization.backfill(Program.objects.all(), PROGRAM_NORMALIZED_FIELDS)
+    normalization.backfill(Episode.objects.all(), EPISODE_NORMALIZED_FIELDS)
+
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    # Vectors and trigram indexes now read the normalized columns.
+    schema_editor.execute(PROGRAM_VECTOR_SQL)
+    schema_editor.execute(EPISODE_VECTOR_SQL)
+    schema_editor.execute("DROP INDEX IF EXISTS program_title_trgm")
+    schema_editor.execute("DROP INDEX IF EXISTS episode_title_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS program_search_title_trgm ON program_program USING gin (search_title gin_trgm_ops)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS episode_search_title_trgm ON episode_episode USING gin (search_title gin_trgm_ops)"
+    )
+
+
+def restore_title_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("DROP INDEX IF EXISTS program_search_title_trgm")
+    schema_editor.execute("DROP INDEX IF EXISTS episode_search_title_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS program_title_trgm ON program_program USING gin (title gin_trgm_ops)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS episode_title_trgm ON episode_episode USING gin (title gin_trgm_ops)"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0004_trigram_indexes'),
+        ('program', '0003_program_normalized_text'),
+        ('episode', '0005_episode_normalized_text'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_normalized_text, restore_title_indexes),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.1.4 on 2026-10-18 15:40
+
+import apps.core.modelfields
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0005_normalized_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchQueryStat',
+            fields=[
+                ('id', apps.core.modelfields.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', apps.core.modelfields.CreatedAtField(auto_now_add=True)),
+                ('updated_at', apps.core.modelfields.UpdatedAtField(auto_now=True)),
+                ('day', models.DateField()),
+                ('query', models.CharField(max_length=255)),
+                ('source', models.CharField(choices=[('internal', 'internal'), ('external', 'external'), ('none', 'none')], max_length=16)),
+                ('searches', models.PositiveIntegerField(default=0)),
+                ('zero_results', models.PositiveIntegerField(default=0)),
+                ('results', models.PositiveBigIntegerField(default=0)),
+                ('latency_ms', models.FloatField(default=0.0)),
+                ('max_latency_ms', models.FloatField(default=0.0)),
+            ],
+            options={
+                'verbose_name': 'search query stat',
+                'verbose_name_plural': 'search query stats',
+                'unique_together': {('day', 'query', 'source')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.1.4 on 2026-10-18 16:25
+
+import apps.core.modelfields
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0006_searchquerystat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedItems',
+            fields=[
+                ('id', apps.core.modelfields.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', apps.core.modelfields.CreatedAtField(auto_now_add=True)),
+                ('updated_at', apps.core.modelfields.UpdatedAtField(auto_now=True)),
+                ('kind', models.CharField(choices=[('program', 'Program'), ('episode', 'Episode')], max_length=16)),
+                ('object_id', models.UUIDField()),
+                ('episodes', models.JSONField(blank=True, default=list)),
+                ('programs', models.JSONField(blank=True, default=list)),
+            ],
+            options={
+                'verbose_name': 'related items',
+                'verbose_name_plural': 'related items',
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.1.4 on 2026-10-18 14:31
+
+from django.db import migrations
+
+from apps.search import markup, normalization
+
+
+def backfill_plain_body(apps, schema_editor):
+    Program = apps.get_model("program", "Program")
+    Episode = apps.get_model("episode", "Episode")
+    normalization.backfill(
+        Program.objects.all(), normalization.PROGRAM_PLAIN_FIELDS, transform=markup.strip_markup
+    )
+    normalization.backfill(
+        Episode.objects.all(), normalization.EPISODE_PLAIN_FIELDS, transform=markup.strip_markup
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0007_relateditems'),
+        ('program', '0004_program_plain_body'),
+        ('episode', '0006_episode_plain_body'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_plain_body, migrations.RunPython.noop),
+    ]
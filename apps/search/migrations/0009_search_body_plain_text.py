@@ -0,0 +1,47 @@
+# Generated by Django 4.1.4 on 2026-10-18 16:05
+
+from django.db import migrations
+
+from apps.search import normalization
+
+# Mirrors the default SEARCH_TEXT_SEARCH_CONFIGS at the time of the migration.
+TEXT_SEARCH_CONFIG_SQL = "(CASE {column} WHEN 'ar' THEN 'arabic' WHEN 'en' THEN 'english' ELSE 'simple' END)::regconfig"
+
+PROGRAM_VECTOR_SQL = """
+UPDATE program_program SET search_vector =
+    setweight(to_tsvector({config}, search_title), 'A')
+    || setweight(to_tsvector({config}, search_summary), 'B')
+    || setweight(to_tsvector({config}, search_body), 'C')
+""".format(config=TEXT_SEARCH_CONFIG_SQL.format(column="language"))
+
+EPISODE_VECTOR_SQL = """
+UPDATE episode_episode AS e SET search_vector =
+    setweight(to_tsvector({config}, e.search_title), 'A')
+    || setweight(to_tsvector({config}, e.search_summary), 'B')
+    || setweight(to_tsvector({config}, e.search_body), 'C')
+FROM program_program AS p
+WHERE p.id = e.program_id
+""".format(config=TEXT_SEARCH_CONFIG_SQL.format(column="p.language"))
+
+
+def normalize_plain_bodies(apps, schema_editor):
+    Program = apps.get_model("program", "Program")
+    Episode = apps.get_model("episode", "Episode")
+    # search_body used to be normalized from the raw HTML: tag and attribute names matched queries.
+    normalization.backfill(Program.objects.all(), {"search_body": "plain_body"})
+    normalization.backfill(Episode.objects.all(), {"search_body": "plain_body"})
+
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(PROGRAM_VECTOR_SQL)
+        schema_editor.execute(EPISODE_VECTOR_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0008_plain_body'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_plain_bodies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.1.4 on 2026-10-18 16:40
+
+import apps.core.modelfields
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0009_search_body_plain_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogGeneration',
+            fields=[
+                ('id', apps.core.modelfields.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', apps.core.modelfields.CreatedAtField(auto_now_add=True)),
+                ('updated_at', apps.core.modelfields.UpdatedAtField(auto_now=True)),
+                ('name', models.CharField(max_length=32, unique=True)),
+                ('value', models.PositiveBigIntegerField(default=1)),
+            ],
+            options={
+                'verbose_name': 'catalog generation',
+                'verbose_name_plural': 'catalog generations',
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.contrib.postgres.search import SearchVectorField as BaseSearchVectorField
+from django.db import models
+
+from ..core.utils.translation import _
+
+
+class SearchVectorField(BaseSearchVectorField):
+    """
+    Stored full-text document of a row.
+    It is maintained by the search backend, never by forms or serializers.
+    """
+    description = _("search vector")
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("null", True)
+        kwargs.setdefault("blank", True)
+        kwargs.setdefault("editable", False)
+        super(SearchVectorField, self).__init__(*args, **kwargs)
+
+
+class NormalizedTextField(models.TextField):
+    """
+    Normalized copy of a text field (see `apps.search.normalization`),
+    filled when the row is saved and only read by the search backends.
+    """
+    description = _("normalized text")
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("blank", True)
+        kwargs.setdefault("default", "")
+        kwargs.setdefault("editable", False)
+        super(NormalizedTextField, self).__init__(*args, **kwargs)
+
+
+class PlainTextField(models.TextField):
+    """
+    Markup-free copy of a rich text field (see `apps.search.markup`),
+    filled when the row is saved and read by search highlighting.
+    """
+    description = _("plain text")
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("blank", True)
+        kwargs.setdefault("default", "")
+        kwargs.setdefault("editable", False)
+        super(PlainTextField, self).__init__(*args, **kwargs)
@@ -0,0 +1,85 @@
+# apps/search/models.py
+from django.db import models
+
+from ..core import _, models as core_models
+from ..program import SearchEntityChoices
+
+
+class SearchQueryStat(core_models.CommonModel):
+    """
+    Daily aggregate of the searches made with one normalized query.
+
+    - One row per (day, query, source): requests are counted in memory and
+      added here in batches (see `apps.search.analytics`), never one write per search.
+    - source: where the answer came from, "internal", "external" or "none".
+    - zero_results: searches that returned nothing.
+    - latency_ms: summed latency, divide by `searches` for the mean.
+    """
+    INTERNAL = "internal"
+    EXTERNAL = "external"
+    NONE = "none"
+    SOURCE_CHOICES = (
+        (INTERNAL, _("internal")),
+        (EXTERNAL, _("external")),
+        (NONE, _("none")),
+    )
+
+    day = models.DateField()
+    query = models.CharField(max_length=255)
+    source = models.CharField(max_length=16, choices=SOURCE_CHOICES)
+    searches = models.PositiveIntegerField(default=0)
+    zero_results = models.PositiveIntegerField(default=0)
+    results = models.PositiveBigIntegerField(default=0)
+    latency_ms = models.FloatField(default=0.0)
+    max_latency_ms = models.FloatField(default=0.0)
+
+    class Meta:
+        unique_together = ("day", "query", "source")
+        verbose_name = _("search query stat")
+        verbose_name_plural = _("search query stats")
+
+    def __str__(self):
+        return f"{self.day}:{self.source}:{self.query}"
+
+
+class RelatedItems(core_models.CommonModel):
+    """
+    "More like this" lists of one program or episode, computed offline (see `apps.search.related`).
+
+    - episodes / programs: most similar items first, each stored as the small
+      payload a detail page shows plus its score, so attaching them costs one
+      lookup on the (kind, object_id) unique index and no join.
+    """
+    kind = models.CharField(max_length=16, choices=SearchEntityChoices.choices)
+    object_id = models.UUIDField()
+    episodes = models.JSONField(default=list, blank=True)
+    programs = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        unique_together = ("kind", "object_id")
+        verbose_name = _("related items")
+        verbose_name_plural = _("related items")
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}"
+
+
+class CatalogGeneration(core_models.CommonModel):
+    """
+    Generation of the catalog, bumped by every indexed Program/Episode write.
+
+    - The result cache keys its pages with it (see `apps.search.cache`) when
+      the search cache is local to each process: a row every process reads,
+      so a write applied by a Celery worker invalidates the pages of the web
+      processes too. A shared cache (Redis) keeps the generation itself.
+    - One row per `name`, created on the first bump.
+    """
+    name = models.CharField(max_length=32, unique=True)
+    value = models.PositiveBigIntegerField(default=1)
+
+    class Meta:
+        verbose_name = _("catalog generation")
+        verbose_name_plural = _("catalog generations")
+
+    def __str__(self):
+        return f"{self.name}:{self.value}"
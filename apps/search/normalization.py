@@ -0,0 +1,119 @@
+# apps/search/normalization.py
+from typing import Callable, Dict, Iterable, Optional, Set
+
+# Harakat (fathatan .. sukun), superscript alef and tatweel carry no meaning for matching.
+ARABIC_DROPPED = [chr(code) for code in range(0x064B, 0x0653)] + ["ٰ", "ـ"]
+
+ARABIC_FOLDED = {
+    "آ": "ا",  # alef with madda above -> alef
+    "أ": "ا",  # alef with hamza above -> alef
+    "إ": "ا",  # alef with hamza below -> alef
+    "ٱ": "ا",  # alef wasla -> alef
+    "ى": "ي",  # alef maksura -> ya
+    "ئ": "ي",  # ya with hamza above -> ya
+    "ؤ": "و",  # waw with hamza above -> waw
+    "ة": "ه",  # ta marbuta -> ha
+}
+
+# Arabic-Indic and Eastern Arabic-Indic digits -> ASCII digits.
+DIGITS_FOLDED = {chr(0x0660 + digit): str(digit) for digit in range(10)}
+DIGITS_FOLDED.update({chr(0x06F0 + digit): str(digit) for digit in range(10)})
+
+TRANSLATION_TABLE = str.maketrans({
+    **dict.fromkeys(ARABIC_DROPPED),
+    **ARABIC_FOLDED,
+    **DIGITS_FOLDED,
+})
+
+# Plain-text copies of the rich text bodies (see `strip_markup`), read by search highlighting.
+PROGRAM_PLAIN_FIELDS = {"plain_body": "long_description"}
+EPISODE_PLAIN_FIELDS = {"plain_body": "body"}
+
+# Shadow column -> source field, for each indexed model. Bodies are normalized
+# from their plain-text copy, so the plain fields are filled first.
+PROGRAM_NORMALIZED_FIELDS = {
+    "search_title": "title",
+    "search_summary": "short_description",
+    "search_body": "plain_body",
+}
+EPISODE_NORMALIZED_FIELDS = {
+    "search_title": "title",
+    "search_summary": "short_description",
+    "search_body": "plain_body",
+}
+
+
+def normalize(text: Optional[str]) -> str:
+    """
+    Fold a text to its matching form:
+
+    - drops tashkeel and tatweel
+    - unifies alef/hamza variants, alef maksura, ta marbuta
+    - maps Arabic-Indic digits to ASCII
+    - case-folds the rest
+
+    The same function runs on stored text and on incoming queries,
+    so comparisons stay plain equality/containment.
+    """
+    if not text:
+        return ""
+    return text.translate(TRANSLATION_TABLE).casefold()
+
+
+def normalize_fields(
+    instance,
+    fields: Dict[str, str],
+    update_fields: Optional[Iterable[str]] = None,
+    transform: Callable[[Optional[str]], str] = normalize,
+) -> Optional[Set[str]]:
+    """
+    Fill the shadow columns of `instance` from their source fields, `transform`ed.
+    Returns `update_fields` extended with the shadow columns of the updated sources.
+    """
+    for target, source in fields.items():
+        setattr(instance, target, transform(getattr(instance, source)))
+
+    if update_fields is None:
+        return None
+
+    update_fields = set(update_fields)
+    update_fields.update(target for target, source in fields.items() if source in update_fields)
+    return update_fields
+
+
+def backfill(
+    queryset,
+    fields: Dict[str, str],
+    chunk_size: int = 2000,
+    transform: Callable[[Optional[str]], str] = normalize,
+) -> int:
+    """
+    Recompute the shadow columns of every row of `queryset`.
+
+    Rows are read as tuples in primary key order and written back with one
+    bulk UPDATE per chunk. Also works with the historical models of a migration.
+    """
+    targets = list(fields)
+    sources = [fields[target] for target in targets]
+    model = queryset.model
+    updated = 0
+    last_pk = None
+
+    while True:
+        chunk = queryset.order_by("pk")
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+        rows = list(chunk.values_list("pk", *sources)[:chunk_size])
+        if not rows:
+            return updated
+
+        objects = []
+        for pk, *values in rows:
+            obj = model(pk=pk)
+            for target, value in zip(targets, values):
+                setattr(obj, target, transform(value))
+            objects.append(obj)
+
+        queryset.bulk_update(objects, targets)
+        updated += len(objects)
+        last_pk = rows[-1][0]
@@ -14,4 +14,28 @@ class SearchAccessPolicy(AccessPolicy):
     @staticmethod
     def client(request, view, action) -> bool:
         user = request.user
-        return getattr(user, "role", None) == "client"
\ No newline at end of file
+        return getattr(user, "role", None) == "client"
+
+
+class SearchMetricsAccessPolicy(AccessPolicy):
+    statements = [
+        {
+            "action": "<safe_methods>",
+            "principal": ["authenticated"],
+            "effect": "allow",
+            "condition": ["admin"],
+        },
+    ]
+
+
+class ExternalBatchSearchAccessPolicy(AccessPolicy):
+    """
+    Batch lookups fan out to the billed external provider: signed-in users only.
+    """
+    statements = [
+        {
+            "action": "*",
+            "principal": ["authenticated"],
+            "effect": "allow",
+        },
+    ]
@@ -0,0 +1,220 @@
+# apps/search/reindex.py
+import contextlib
+import json
+import multiprocessing
+import os
+import pickle
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+import django
+from django.db import connections
+
+from .backends import get_search_backend
+from .backends.base import BulkIndexer
+
+KINDS = ("program", "episode")
+
+# Primary keys are random UUIDs, so equal slices of the UUID space hold about as many rows.
+UUID_SPACE = 2 ** 128
+
+
+class RangeTask(NamedTuple):
+    """
+    One slice of one table: primary keys in [lower, upper), None meaning unbounded.
+    """
+    kind: str
+    part: int
+    lower: Optional[str]
+    upper: Optional[str]
+
+    @property
+    def name(self) -> str:
+        return f"{self.kind}-{self.part:03d}"
+
+
+class RangeResult(NamedTuple):
+    task: RangeTask
+    documents: int
+    seconds: float
+    state: Any
+
+
+def uuid_bounds(parts: int) -> List[Optional[str]]:
+    """
+    parts + 1 boundaries splitting the UUID space evenly, the outer ones unbounded.
+    """
+    inner = [str(uuid.UUID(int=UUID_SPACE * part // parts)) for part in range(1, parts)]
+    return [None] + inner + [None]
+
+
+def range_tasks(parts: int) -> List[RangeTask]:
+    bounds = uuid_bounds(parts)
+    return [
+        RangeTask(kind, part, bounds[part], bounds[part + 1])
+        for kind in KINDS
+        for part in range(parts)
+    ]
+
+
+class Checkpoint:
+    """
+    Progress of one range in `directory`: the last primary key done, written
+    together with the worker state so a resumed run restarts right after it.
+    Files are replaced atomically; a crash loses at most one checkpoint interval.
+    """
+
+    def __init__(self, directory: Optional[str], task: RangeTask) -> None:
+        self.directory = directory
+        self.task = task
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f"{self.task.name}.json")
+
+    @property
+    def state_path(self) -> str:
+        return os.path.join(self.directory, f"{self.task.name}.pickle")
+
+    def load(self) -> Dict[str, Any]:
+        progress = {"after": None, "documents": 0, "done": False}
+        if self.directory is None:
+            return progress
+        with contextlib.suppress(OSError, ValueError):
+            with open(self.path, encoding="utf-8") as handle:
+                progress.update(json.load(handle))
+        return progress
+
+    def load_state(self) -> Any:
+        with contextlib.suppress(OSError, EOFError, pickle.UnpicklingError):
+            with open(self.state_path, "rb") as handle:
+                return pickle.load(handle)
+        return None
+
+    def save(self, after: Optional[str], documents: int, done: bool, state: Any) -> None:
+        if self.directory is None:
+            return
+        if state is not None:
+            self._write(self.state_path, "wb", lambda handle: pickle.dump(state, handle, pickle.HIGHEST_PROTOCOL))
+        progress = {"after": after, "documents": documents, "done": done}
+        self._write(self.path, "w", lambda handle: json.dump(progress, handle))
+
+    def _write(self, path: str, mode: str, dump: Callable) -> None:
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".checkpoint-")
+        try:
+            with os.fdopen(descriptor, mode) as handle:
+                dump(handle)
+            os.replace(temp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+            raise
+
+
+def iter_batches(queryset, fields, task: RangeTask, after: Optional[str], chunk_size: int, batch_size: int):
+    """
+    Stream the rows of the range in primary key order, as values() dicts, by batches.
+    """
+    if task.lower is not None:
+        queryset = queryset.filter(pk__gte=task.lower)
+    if task.upper is not None:
+        queryset = queryset.filter(pk__lt=task.upper)
+    if after is not None:
+        queryset = queryset.filter(pk__gt=after)
+
+    batch = []
+    for row in queryset.order_by("pk").values(*fields).iterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def reindex_range(
+    task: RangeTask,
+    checkpoint_dir: Optional[str],
+    chunk_size: int,
+    batch_size: int,
+    checkpoint_every: int,
+) -> RangeResult:
+    """
+    Index one range, resuming from its checkpoint. Runs in a pool worker or inline.
+    """
+    started = time.monotonic()
+    backend = get_search_backend()
+    checkpoint = Checkpoint(checkpoint_dir, task)
+    progress = checkpoint.load()
+
+    state = checkpoint.load_state() if progress["after"] is not None else None
+    indexer: BulkIndexer = backend.bulk_indexer(state)
+    if progress["done"]:
+        return RangeResult(task, 0, 0.0, indexer.state())
+
+    if task.kind == "program":
+        queryset, fields, add = indexer.programs(), indexer.program_values, indexer.add_programs
+    else:
+        queryset, fields, add = indexer.episodes(), indexer.episode_values, indexer.add_episodes
+
+    after, documents, since_checkpoint = progress["after"], progress["documents"], 0
+    indexed = 0
+    for rows in iter_batches(queryset, fields, task, after, chunk_size, batch_size):
+        add(rows)
+        after = str(rows[-1]["id"])
+        documents += len(rows)
+        indexed += len(rows)
+        since_checkpoint += len(rows)
+        if since_checkpoint >= checkpoint_every:
+            checkpoint.save(after, documents, False, indexer.state())
+            since_checkpoint = 0
+
+    state = indexer.state()
+    checkpoint.save(after, documents, True, state)
+    return RangeResult(task, indexed, time.monotonic() - started, state)
+
+
+def init_worker() -> None:
+    # A no-op after fork; spawned workers have to load the apps first.
+    django.setup()
+
+
+def run(
+    workers: int = 1,
+    parts: int = 1,
+    chunk_size: int = 2000,
+    batch_size: int = 1000,
+    checkpoint_dir: Optional[str] = None,
+    checkpoint_every: int = 50000,
+) -> Iterator[RangeResult]:
+    """
+    Reindex every range and publish the result through the backend, yielding
+    each range as it completes. `workers` > 1 spreads the ranges over a process pool.
+    """
+    backend = get_search_backend()
+    collector = backend.bulk_indexer()
+    arguments = (checkpoint_dir, chunk_size, batch_size, checkpoint_every)
+    tasks = range_tasks(parts)
+
+    if workers <= 1:
+        for task in tasks:
+            result = reindex_range(task, *arguments)
+            if result.state is not None:
+                collector.merge(result.state)
+            yield result._replace(state=None)
+    else:
+        # Forked workers must not share the parent's database connections.
+        connections.close_all()
+        context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_worker) as pool:
+            futures = [pool.submit(reindex_range, task, *arguments) for task in tasks]
+            for future in as_completed(futures):
+                result = future.result()
+                if result.state is not None:
+                    collector.merge(result.state)
+                yield result._replace(state=None)
+
+    backend.finish_reindex(collector)
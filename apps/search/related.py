@@ -0,0 +1,260 @@
+# apps/search/related.py
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.episode.models import Episode
+from apps.program import SearchEntityChoices
+from apps.program.models import Program
+
+from .app_settings import app_settings
+from .backends import get_search_backend
+from .index import tokenize
+from .models import RelatedItems
+from .normalization import normalize
+from .tfidf import Bag, TfidfMatrix
+
+logger = logging.getLogger(__name__)
+
+PROGRAM = SearchEntityChoices.PROGRAM.value
+EPISODE = SearchEntityChoices.EPISODE.value
+
+# Weight of one occurrence of a term, per field; a tag counts as one term.
+FIELD_WEIGHTS = {"search_title": 3.0, "search_summary": 1.5, "search_body": 1.0}
+TAG_WEIGHT = 2.0
+
+WRITE_BATCH_SIZE = 1000
+
+Key = Tuple[str, str]
+
+
+def make_bag(row: Dict[str, Any], tags: List[str]) -> Bag:
+    bag: Bag = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in tokenize(row[field] or ""):
+            bag[term] = bag.get(term, 0.0) + weight
+    for tag in tags:
+        term = "#" + normalize(tag).strip()
+        bag[term] = bag.get(term, 0.0) + TAG_WEIGHT
+    return bag
+
+
+def tag_names(through, owner_field: str) -> Dict[str, List[str]]:
+    names: Dict[str, List[str]] = {}
+    rows = through.objects.filter(tag__is_active=True).values_list(owner_field, "tag__name")
+    for owner_id, name in rows.iterator(chunk_size=5000):
+        names.setdefault(str(owner_id), []).append(name)
+    return names
+
+
+class Catalog:
+    """
+    Every visible program then every visible episode, as matrix rows:
+    their key, the payload stored in neighbour lists and their bag of terms.
+    """
+
+    def __init__(self) -> None:
+        self.keys: List[Key] = []
+        self.payloads: List[Dict[str, Any]] = []
+        self.bags: List[Bag] = []
+        self.parents: Dict[int, int] = {}
+        self.n_programs = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def load(cls, chunk_size: int = 2000) -> "Catalog":
+        backend = get_search_backend()
+        catalog = cls()
+        rows_by_program: Dict[str, int] = {}
+
+        tags = tag_names(Program.tags.through, "program_id")
+        programs = backend.published_programs().order_by("pk").values(
+            "id", "title", "slug", "cover_image_url", *FIELD_WEIGHTS
+        )
+        for row in programs.iterator(chunk_size=chunk_size):
+            program_id = str(row["id"])
+            rows_by_program[program_id] = len(catalog.keys)
+            catalog.add(
+                (PROGRAM, program_id),
+                {"id": program_id, "title": row["title"], "slug": row["slug"], "cover_image_url": row["cover_image_url"]},
+                make_bag(row, tags.get(program_id, ())),
+            )
+        catalog.n_programs = len(catalog.keys)
+
+        tags = tag_names(Episode.tags.through, "episode_id")
+        episodes = backend.published_episodes().order_by("pk").values(
+            "id", "title", "slug", "thumbnail_url", "program_id", *FIELD_WEIGHTS
+        )
+        for row in episodes.iterator(chunk_size=chunk_size):
+            episode_id = str(row["id"])
+            parent = rows_by_program.get(str(row["program_id"]))
+            if parent is not None:
+                catalog.parents[len(catalog.keys)] = parent
+            catalog.add(
+                (EPISODE, episode_id),
+                {"id": episode_id, "title": row["title"], "slug": row["slug"], "thumbnail_url": row["thumbnail_url"]},
+                make_bag(row, tags.get(episode_id, ())),
+            )
+        return catalog
+
+    def add(self, key: Key, payload: Dict[str, Any], bag: Bag) -> None:
+        self.keys.append(key)
+        self.payloads.append(payload)
+        self.bags.append(bag)
+
+    @property
+    def groups(self) -> Dict[str, Tuple[int, int]]:
+        return {"programs": (0, self.n_programs), "episodes": (self.n_programs, len(self.keys))}
+
+    def neighbour(self, row: int, score: float) -> Dict[str, Any]:
+        return {**self.payloads[row], "score": round(score, 4)}
+
+
+def compute_lists(catalog: Catalog, matrix: TfidfMatrix, rows: List[int], k: int) -> Dict[int, Dict[str, list]]:
+    """
+    Neighbour lists of `rows`; an episode never lists its own program.
+    """
+    lists = {}
+    for row, found in matrix.nearest(
+        rows,
+        catalog.groups,
+        k + 1,
+        min_score=app_settings.SEARCH_RELATED_MIN_SCORE,
+        block_budget=app_settings.SEARCH_RELATED_BLOCK_BUDGET,
+    ):
+        parent = catalog.parents.get(row)
+        lists[row] = {
+            "episodes": found["episodes"][:k],
+            "programs": [(column, score) for column, score in found["programs"] if column != parent][:k],
+        }
+    return lists
+
+
+def save_lists(catalog: Catalog, lists: Dict[int, Dict[str, list]]) -> None:
+    rows = list(lists)
+    now = timezone.now()
+    for start in range(0, len(rows), WRITE_BATCH_SIZE):
+        objects = []
+        for row in rows[start:start + WRITE_BATCH_SIZE]:
+            kind, object_id = catalog.keys[row]
+            objects.append(RelatedItems(
+                kind=kind,
+                object_id=object_id,
+                episodes=[catalog.neighbour(column, score) for column, score in lists[row]["episodes"]],
+                programs=[catalog.neighbour(column, score) for column, score in lists[row]["programs"]],
+                updated_at=now,
+            ))
+        RelatedItems.objects.bulk_create(
+            objects,
+            update_conflicts=True,
+            unique_fields=["kind", "object_id"],
+            update_fields=["episodes", "programs", "updated_at"],
+        )
+
+
+def link_new_items(catalog: Catalog, lists: Dict[int, Dict[str, list]], k: int) -> int:
+    """
+    Similarity is symmetric: a new item goes into the lists of its own
+    neighbours when it beats their weakest entry. Returns the lists changed.
+    """
+    inserts: Dict[int, List[Tuple[str, int, float]]] = {}
+    for row, found in lists.items():
+        group = "episodes" if catalog.keys[row][0] == EPISODE else "programs"
+        for column, score in found["episodes"] + found["programs"]:
+            if catalog.parents.get(column) != row and column not in lists:
+                inserts.setdefault(column, []).append((group, row, score))
+    if not inserts:
+        return 0
+
+    rows_by_key = {catalog.keys[row]: row for row in inserts}
+    changed = []
+    with transaction.atomic():
+        for kind in (PROGRAM, EPISODE):
+            object_ids = [object_id for key_kind, object_id in rows_by_key if key_kind == kind]
+            for start in range(0, len(object_ids), WRITE_BATCH_SIZE):
+                batch = object_ids[start:start + WRITE_BATCH_SIZE]
+                for items in RelatedItems.objects.select_for_update().filter(kind=kind, object_id__in=batch):
+                    row = rows_by_key[(kind, str(items.object_id))]
+                    for group, new_row, score in inserts[row]:
+                        new_id = catalog.payloads[new_row]["id"]
+                        entries = [entry for entry in getattr(items, group) if entry["id"] != new_id]
+                        entries.append(catalog.neighbour(new_row, score))
+                        entries.sort(key=lambda entry: -entry["score"])
+                        setattr(items, group, entries[:k])
+                    items.updated_at = timezone.now()
+                    changed.append(items)
+        RelatedItems.objects.bulk_update(changed, ["episodes", "programs", "updated_at"], batch_size=WRITE_BATCH_SIZE)
+    return len(changed)
+
+
+def prune(catalog: Catalog, keep_lists: bool) -> int:
+    """
+    Delete the lists of items that are no longer visible and, unless the
+    lists were all just recomputed, drop such items from the other lists.
+    Returns the rows deleted or changed.
+    """
+    visible: Dict[str, Set[str]] = {PROGRAM: set(), EPISODE: set()}
+    for kind, object_id in catalog.keys:
+        visible[kind].add(object_id)
+
+    stale, changed = [], []
+    rows = RelatedItems.objects.values_list("pk", "kind", "object_id", "episodes", "programs")
+    for pk, kind, object_id, episodes, programs in rows.iterator(chunk_size=5000):
+        if str(object_id) not in visible[kind]:
+            stale.append(pk)
+            continue
+        if keep_lists:
+            continue
+        kept_episodes = [entry for entry in episodes if entry["id"] in visible[EPISODE]]
+        kept_programs = [entry for entry in programs if entry["id"] in visible[PROGRAM]]
+        if len(kept_episodes) != len(episodes) or len(kept_programs) != len(programs):
+            changed.append(RelatedItems(pk=pk, episodes=kept_episodes, programs=kept_programs))
+
+    for start in range(0, len(stale), WRITE_BATCH_SIZE):
+        RelatedItems.objects.filter(pk__in=stale[start:start + WRITE_BATCH_SIZE]).delete()
+    RelatedItems.objects.bulk_update(changed, ["episodes", "programs"], batch_size=WRITE_BATCH_SIZE)
+    return len(stale) + len(changed)
+
+
+def build_related(full: bool = False, k: Optional[int] = None) -> Dict[str, int]:
+    """
+    Recompute "more like this" lists.
+
+    - full: every visible item gets a fresh list.
+    - otherwise only items without a list yet (newly published ones); they
+      are linked into the lists of their neighbours, and hidden items are
+      dropped from every list. IDF drifts slowly, a periodic full run resets it.
+    """
+    k = app_settings.SEARCH_RELATED_TOP_K if k is None else k
+    catalog = Catalog.load()
+    matrix = TfidfMatrix(catalog.bags, max_df=app_settings.SEARCH_RELATED_MAX_DF)
+
+    if full:
+        rows = list(range(len(catalog)))
+    else:
+        known = {
+            (kind, str(object_id))
+            for kind, object_id in RelatedItems.objects.values_list("kind", "object_id").iterator(chunk_size=5000)
+        }
+        rows = [row for row, key in enumerate(catalog.keys) if key not in known]
+
+    lists = compute_lists(catalog, matrix, rows, k)
+    save_lists(catalog, lists)
+    linked = 0 if full else link_new_items(catalog, lists, k)
+    pruned = prune(catalog, keep_lists=full)
+
+    stats = {"items": len(catalog), "computed": len(lists), "linked": linked, "pruned": pruned}
+    logger.info("Related content built: %s", stats)
+    return stats
+
+
+def get_related(kind: str, object_id) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Stored (episodes, programs) neighbour lists of an item, empty when not computed yet.
+    """
+    related = RelatedItems.objects.filter(kind=kind, object_id=object_id).values_list("episodes", "programs").first()
+    return related or ([], [])
@@ -0,0 +1,224 @@
+# apps/search/resilience.py
+import bisect
+import random
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+
+class ExternalProviderUnavailable(requests.RequestException):
+    """
+    Raised without calling the provider while its circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Closed -> open when the error rate of the last `window` seconds reaches
+    `failure_threshold` (with at least `minimum_calls` calls).
+    Open -> half-open after `reset_timeout`: one trial call decides whether
+    the circuit closes again or stays open for another `reset_timeout`.
+
+    `allow()` hands out a permit that the call passes back to `record()`, and
+    to `release()` in a `finally` so an unrecorded trial never blocks the
+    circuit. Only the permit of the trial changes a half-open circuit: calls
+    let through while it was closed cannot decide or cancel the trial.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # Permit of the calls let through while the circuit is closed.
+    PASS = object()
+
+    def __init__(self, failure_threshold: float = 0.5, minimum_calls: int = 10, window: float = 60.0, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.minimum_calls = minimum_calls
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._calls: Deque[Tuple[float, bool]] = deque()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial: Optional[object] = None
+
+    def _trim(self, now: float) -> None:
+        while self._calls and self._calls[0][0] < now - self.window:
+            self._calls.popleft()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> Optional[object]:
+        """
+        Permit for one call, or None while the circuit rejects calls.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return self.PASS
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial is not None:
+                return None
+            self._state = self.HALF_OPEN
+            self._trial = object()
+            return self._trial
+
+    def record(self, permit: object, success: bool) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if permit is not None and permit is self._trial:
+                self._trial = None
+                if success:
+                    self._state = self.CLOSED
+                    self._calls.clear()
+                else:
+                    self._state = self.OPEN
+                    self._opened_at = now
+                return
+            if self._state != self.CLOSED:
+                # Let through before the circuit opened: the trial decides, not this call.
+                return
+
+            self._calls.append((now, success))
+            self._trim(now)
+            failures = sum(1 for _, ok in self._calls if not ok)
+            if len(self._calls) >= self.minimum_calls and failures / len(self._calls) >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = now
+
+    def release(self, permit: object) -> None:
+        """
+        Free the half-open trial of a call that ended without `record`
+        (an unexpected error or a cancellation), so the next call is tried.
+        A no-op once the call was recorded, and for any other permit.
+        """
+        with self._lock:
+            if permit is not None and permit is self._trial:
+                self._trial = None
+                self._state = self.OPEN
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            self._trim(time.monotonic())
+            calls = len(self._calls)
+            failures = sum(1 for _, ok in self._calls if not ok)
+        return {
+            "state": self.state,
+            "calls": calls,
+            "failures": failures,
+            "error_rate": failures / calls if calls else 0.0,
+        }
+
+
+class RetryBudget:
+    """
+    Retries may add at most `ratio` extra calls per first attempt over the last
+    `window` seconds (plus `minimum` per window), so a failing provider
+    is not hit with a multiple of the normal traffic.
+    """
+
+    def __init__(self, ratio: float = 0.2, minimum: int = 3, window: float = 10.0):
+        self.ratio = ratio
+        self.minimum = minimum
+        self.window = window
+        self._lock = threading.Lock()
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+
+    def _trim(self, now: float) -> None:
+        for events in (self._requests, self._retries):
+            while events and events[0] < now - self.window:
+                events.popleft()
+
+    def record_request(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._requests.append(now)
+            self._trim(now)
+
+    def try_spend(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            if len(self._retries) >= self.minimum + self.ratio * len(self._requests):
+                return False
+            self._retries.append(now)
+            return True
+
+
+class RateLimiter:
+    """
+    Token bucket shared by threads: `rate` calls per second on average,
+    bursts of at most `burst`. `acquire` blocks until a call is allowed;
+    a rate of 0 does not limit.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self._lock = threading.Lock()
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class LatencyHistogram:
+    """
+    Cumulative latency histogram (seconds) with fixed upper bounds, Prometheus style.
+    """
+
+    DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0)
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counts: List[int] = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._outcomes: Dict[str, int] = {}
+
+    def observe(self, seconds: float, outcome: str = "success") -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+            self._outcomes[outcome] = self._outcomes.get(outcome, 0) + 1
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+            outcomes = dict(self._outcomes)
+
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+
+        return {"buckets": cumulative, "count": running, "sum": total, "outcomes": outcomes}
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    "Full jitter" exponential backoff: uniform in [0, min(cap, base * 2 ** attempt)].
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
@@ -0,0 +1,97 @@
+# apps/search/results.py
+import base64
+import binascii
+import heapq
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class InvalidCursor(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded.
+    """
+
+
+class SortKey(NamedTuple):
+    """
+    Position of a hit in the global ordering:
+    relevance first, then publish date (unix seconds), then the document key as tie-breaker.
+    """
+    score: float
+    published: int
+    key: str
+
+    def ordering(self) -> Tuple[float, int, str]:
+        return -self.score, -self.published, self.key
+
+    def is_after(self, other: "SortKey") -> bool:
+        return self.ordering() > other.ordering()
+
+
+class SearchHit(NamedTuple):
+    sort_key: SortKey
+    payload: Dict[str, Any]
+
+
+@dataclass
+class SearchResultPage:
+    """
+    One page of the merged Program/Episode result stream.
+
+    - next_cursor: opaque search-after token for the next page, None on the last page.
+    - total: number of matching documents, None when the backend only counts it on the first page.
+    - fuzzy: True when the page comes from typo-tolerant matching.
+    - cached: True when the page was served from the result cache.
+    - facets: match counts per facet value (see `apps.search.facets`), first page only.
+    - did_you_mean: spelling correction of a query without match (see `apps.search.spelling`).
+    - corrected: True when the results are those of `did_you_mean`.
+    """
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    fuzzy: bool = False
+    cached: bool = False
+    facets: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    did_you_mean: Optional[str] = None
+    corrected: bool = False
+
+    def __bool__(self):
+        return bool(self.results)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self):
+        return len(self.results)
+
+
+def encode_cursor(sort_key: SortKey) -> str:
+    raw = json.dumps(list(sort_key), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, published, key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return SortKey(float(score), int(published), str(key))
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as exc:
+        raise InvalidCursor("Invalid pagination cursor.") from exc
+
+
+def paginate_hits(hits: Iterable[SearchHit], limit: int, total: Optional[int] = None) -> SearchResultPage:
+    """
+    Keep the `limit` first hits of the global ordering and emit the cursor of the last one.
+    `hits` must already be restricted to what comes after the previous cursor.
+    """
+    limit = max(limit, 1)
+    window = heapq.nsmallest(limit + 1, hits, key=lambda hit: hit.sort_key.ordering())
+    page_hits = window[:limit]
+    next_cursor = encode_cursor(page_hits[-1].sort_key) if len(window) > limit else None
+
+    return SearchResultPage(
+        results=[hit.payload for hit in page_hits],
+        next_cursor=next_cursor,
+        total=total,
+    )
@@ -1,8 +1,69 @@
 # apps/search/services/serpapi_client.py
+import asyncio
+import threading
+import time
 from typing import Any, Dict, Optional
 
+import aiohttp
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from .app_settings import app_settings
+from .resilience import (
+    CircuitBreaker,
+    ExternalProviderUnavailable,
+    LatencyHistogram,
+    RetryBudget,
+    backoff_delay,
+)
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# Shared by every client of the process, exposed through `metrics()`.
+circuit_breaker = CircuitBreaker(
+    failure_threshold=app_settings.SEARCH_EXTERNAL_BREAKER_FAILURE_RATE,
+    minimum_calls=app_settings.SEARCH_EXTERNAL_BREAKER_MINIMUM_CALLS,
+    window=app_settings.SEARCH_EXTERNAL_BREAKER_WINDOW,
+    reset_timeout=app_settings.SEARCH_EXTERNAL_BREAKER_RESET_TIMEOUT,
+)
+retry_budget = RetryBudget(ratio=app_settings.SEARCH_EXTERNAL_RETRY_BUDGET_RATIO)
+latency_histogram = LatencyHistogram()
+
+
+def get_session() -> requests.Session:
+    """
+    Process-wide session: connections to SerpApi are pooled and kept alive.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=app_settings.SEARCH_EXTERNAL_POOL_SIZE,
+                max_retries=0,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def is_retryable(exc: requests.RequestException) -> bool:
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is not None and exc.response.status_code in RETRYABLE_STATUS_CODES
+    return True
+
+
+def metrics() -> Dict[str, Any]:
+    return {
+        "circuit_breaker": circuit_breaker.snapshot(),
+        "latency_seconds": latency_histogram.snapshot(),
+    }
 
 
 class SerpApiClient:
@@ -10,12 +71,17 @@ class SerpApiClient:
     Generic client for SerpApi.
     - Knows how to call SerpApi with any engine.
     - Does not know anything about YouTube, videos, etc.
+    - Calls go through a pooled keep-alive session, are retried with jittered
+      backoff within a retry budget, and fail fast with ExternalProviderUnavailable
+      while the circuit breaker is open.
     """
 
     BASE_URL = "https://serpapi.com/search"
 
-    def __init__(self, api_key: Optional[str] = None) -> None:
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None) -> None:
         self.api_key = api_key or getattr(settings, "SERPAPI_API_KEY", "")
+        # SERPAPI_BASE_URL points the client to a local stub of the endpoint.
+        self.base_url = base_url or getattr(settings, "SERPAPI_BASE_URL", self.BASE_URL)
         if not self.api_key:
             raise ValueError("SERPAPI_API_KEY is not configured")
 
@@ -29,6 +95,94 @@ class SerpApiClient:
             **engine_params,
         }
 
-        response = requests.get(self.BASE_URL, params=request_params, timeout=3)
-        response.raise_for_status()
-        return response.json()
\ No newline at end of file
+        retry_budget.record_request()
+        attempt = 0
+
+        while True:
+            permit = circuit_breaker.allow()
+            if permit is None:
+                latency_histogram.observe(0.0, outcome="rejected")
+                raise ExternalProviderUnavailable("External search provider unavailable.")
+
+            started = time.monotonic()
+            try:
+                response = get_session().get(
+                    self.base_url,
+                    params=request_params,
+                    timeout=(
+                        app_settings.SEARCH_EXTERNAL_CONNECT_TIMEOUT,
+                        app_settings.SEARCH_EXTERNAL_READ_TIMEOUT,
+                    ),
+                )
+                response.raise_for_status()
+                payload = response.json()
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as exc:
+                latency_histogram.observe(time.monotonic() - started, outcome="error")
+                retryable = is_retryable(exc)
+                # Other 4xx are our fault: they are neither retried nor held against the provider.
+                circuit_breaker.record(permit, not retryable)
+
+                if not retryable or attempt >= app_settings.SEARCH_EXTERNAL_MAX_RETRIES or not retry_budget.try_spend():
+                    raise
+                time.sleep(backoff_delay(
+                    attempt,
+                    app_settings.SEARCH_EXTERNAL_BACKOFF_BASE,
+                    app_settings.SEARCH_EXTERNAL_BACKOFF_CAP,
+                ))
+                attempt += 1
+                continue
+            except ValueError:
+                # A body that is not JSON, an upstream failure like any other.
+                latency_histogram.observe(time.monotonic() - started, outcome="error")
+                circuit_breaker.record(permit, False)
+                raise
+            else:
+                latency_histogram.observe(time.monotonic() - started)
+                circuit_breaker.record(permit, True)
+            finally:
+                # Any other error (or an interrupt) ends the call unrecorded.
+                circuit_breaker.release(permit)
+            return payload
+
+    async def async_search(
+        self,
+        http: aiohttp.ClientSession,
+        engine_name: str,
+        engine_params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Same call as `search` on an aiohttp session, for fan-out lookups.
+        It is not retried: the caller's deadline bounds it instead.
+        """
+        permit = circuit_breaker.allow()
+        if permit is None:
+            latency_histogram.observe(0.0, outcome="rejected")
+            raise ExternalProviderUnavailable("External search provider unavailable.")
+
+        request_params = {
+            "engine": engine_name,
+            "api_key": self.api_key,
+            **engine_params,
+        }
+
+        started = time.monotonic()
+        try:
+            async with http.get(self.base_url, params=request_params) as response:
+                response.raise_for_status()
+                payload = await response.json(content_type=None)
+        except aiohttp.ClientResponseError as exc:
+            latency_histogram.observe(time.monotonic() - started, outcome="error")
+            circuit_breaker.record(permit, exc.status not in RETRYABLE_STATUS_CODES)
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            # ValueError: a body that is not JSON, an upstream failure like any other.
+            latency_histogram.observe(time.monotonic() - started, outcome="error")
+            circuit_breaker.record(permit, False)
+            raise
+        else:
+            latency_histogram.observe(time.monotonic() - started)
+            circuit_breaker.record(permit, True)
+        finally:
+            # Cancelled by the caller's deadline.
+            circuit_breaker.release(permit)
+        return payload
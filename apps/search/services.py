@@ -1,7 +1,24 @@
 # apps/search/services.py
 from __future__ import annotations
 
-from typing import Protocol, runtime_checkable
+from typing import Iterable, List, Protocol, Set, Tuple, runtime_checkable
+
+from apps.category.models import Category
+from apps.episode.models import Episode
+from apps.program.models import Program
+from apps.tag.models import Tag
+
+from .backends import get_search_backend
+from .cache import result_cache
+from .documents import document_key
+from .indexing import index_changes, index_queue
+from .suggest import (
+    SuggestionService,
+    category_suggestion,
+    episode_suggestion,
+    program_suggestion,
+    tag_suggestion,
+)
 
 
 @runtime_checkable
@@ -27,40 +44,167 @@ class SearchService:
     """
     Boundary between domain models (Program/Episode) and the search subsystem.
 
-    For the assignment:
-      - In a real system, these methods would push to Algolia/Elastic/etc.
+    - Receivers only `schedule_*` a row: the update is deferred to the commit,
+      coalesced per id and applied in batches by a Celery worker (see `apps.search.indexing`).
+    - `sync` then forwards the batch to the configured search backend
+      (see `apps.search.backends`), so swapping engines never touches the receivers,
+      and to the autocomplete table (see `apps.search.suggest`); other
+      processes follow it through `refresh_local`.
+    - Program/Episode changes also bump the catalog generation of the result cache.
+    - The `index_*`/`remove_*` methods apply one change right away.
     """
 
+    @classmethod
+    def schedule_program(cls, program_id) -> None:
+        """
+        Bring a Program up to date in search once the current transaction commits.
+        """
+        index_queue.add("program", program_id)
+
+    @classmethod
+    def schedule_episode(cls, episode_id) -> None:
+        """
+        Bring an Episode up to date in search once the current transaction commits.
+        """
+        index_queue.add("episode", episode_id)
+
+    @classmethod
+    def read_batch(cls, program_ids: List, episode_ids: List) -> Tuple[List, Set[str], List, Set[str]]:
+        """
+        Current rows of a batch: (visible programs, removed program ids, visible episodes, removed episode ids).
+        """
+        programs, removed_programs, episodes, removed_episodes = [], set(), [], set()
+
+        if program_ids:
+            rows = Program.objects.in_bulk(program_ids).values()
+            programs = [program for program in rows if program.is_active and program.is_published]
+            removed_programs = set(map(str, program_ids)) - {str(program.pk) for program in programs}
+
+        if episode_ids:
+            rows = Episode.objects.select_related("program").in_bulk(episode_ids).values()
+            episodes = [episode for episode in rows if episode.is_active and episode.is_published]
+            removed_episodes = set(map(str, episode_ids)) - {str(episode.pk) for episode in episodes}
+
+        return programs, removed_programs, episodes, removed_episodes
+
+    @classmethod
+    def sync(cls, program_ids: Iterable, episode_ids: Iterable) -> None:
+        """
+        Apply a batch of scheduled updates from the current rows:
+        visible rows are (re)indexed, hidden or deleted ones removed.
+        The batch is then published to the other processes (see `IndexChangeFeed`).
+        """
+        backend = get_search_backend()
+        program_ids, episode_ids = list(program_ids), list(episode_ids)
+        if not program_ids and not episode_ids:
+            return
+
+        programs, removed_programs, episodes, removed_episodes = cls.read_batch(program_ids, episode_ids)
+        if program_ids:
+            backend.index_programs(programs)
+            backend.remove_programs(removed_programs)
+        if episode_ids:
+            backend.index_episodes(episodes)
+            backend.remove_episodes(removed_episodes)
+        cls._update_suggestions(programs, removed_programs, episodes, removed_episodes)
+
+        result_cache.bump_generation()
+        index_changes.publish(program_ids, episode_ids)
+
+    @classmethod
+    def refresh_local(cls, program_ids: Iterable, episode_ids: Iterable) -> None:
+        """
+        Follow a batch applied by another process: only the in-process
+        structures are updated, the index itself already is.
+        """
+        batch = cls.read_batch(list(program_ids), list(episode_ids))
+        get_search_backend().refresh_local(*batch)
+        cls._update_suggestions(*batch)
+
+    @classmethod
+    def reload_local(cls) -> None:
+        """
+        Rebuild the in-process structures from the database.
+        """
+        get_search_backend().reload_local()
+        SuggestionService.expire()
+
+    @classmethod
+    def _update_suggestions(cls, programs, removed_programs, episodes, removed_episodes) -> None:
+        for program in programs:
+            SuggestionService.update(document_key("program", program.pk), program_suggestion(program))
+        for program_id in removed_programs:
+            SuggestionService.update(document_key("program", program_id), None)
+        for episode in episodes:
+            cls._update_episode_suggestion(episode)
+        for episode_id in removed_episodes:
+            SuggestionService.update(document_key("episode", episode_id), None)
+
     @classmethod
     def index_program(cls, program: IndexableProgram) -> None:
         """
         Index or update a Program in the search index.
-
         """
-        # Example stub implementation:
-        #  logger.info("Indexing program in search", extra={"program_id": program.id})
-        return None
+        get_search_backend().index_program(program)
+        result_cache.bump_generation()
+        SuggestionService.update(document_key("program", program.id), program_suggestion(program))
 
     @classmethod
     def remove_program(cls, program_id: int) -> None:
         """
         Remove a Program from the search index by ID.
         """
-        # logger.info("Removing program from search", extra={"program_id": program_id})
-        return None
+        get_search_backend().remove_program(program_id)
+        result_cache.bump_generation()
+        SuggestionService.update(document_key("program", program_id), None)
 
     @classmethod
     def index_episode(cls, episode: IndexableEpisode) -> None:
         """
         Index or update an Episode in the search index.
         """
-        # logger.info("Indexing episode in search", extra={"episode_id": episode.id})
-        return None
+        get_search_backend().index_episode(episode)
+        result_cache.bump_generation()
+        cls._update_episode_suggestion(episode)
 
     @classmethod
     def remove_episode(cls, episode_id: int) -> None:
         """
         Remove an Episode from the search index by ID.
         """
-        # logger.info("Removing episode from search", extra={"episode_id": episode_id})
-        return None
\ No newline at end of file
+        get_search_backend().remove_episode(episode_id)
+        result_cache.bump_generation()
+        SuggestionService.update(document_key("episode", episode_id), None)
+
+    @classmethod
+    def _update_episode_suggestion(cls, episode: IndexableEpisode) -> None:
+        key = document_key("episode", episode.id)
+        program = episode.program
+        if program.is_active and program.is_published:
+            SuggestionService.update(key, episode_suggestion(episode))
+        else:
+            SuggestionService.update(key, None)
+
+    @classmethod
+    def index_category(cls, category: Category) -> None:
+        """
+        Keep an active Category name in the autocomplete table.
+        """
+        key = document_key("category", category.pk)
+        SuggestionService.update(key, category_suggestion(category) if category.is_active else None)
+
+    @classmethod
+    def remove_category(cls, category_id) -> None:
+        SuggestionService.update(document_key("category", category_id), None)
+
+    @classmethod
+    def index_tag(cls, tag: Tag) -> None:
+        """
+        Keep an active Tag name in the autocomplete table.
+        """
+        key = document_key("tag", tag.pk)
+        SuggestionService.update(key, tag_suggestion(tag) if tag.is_active else None)
+
+    @classmethod
+    def remove_tag(cls, tag_id) -> None:
+        SuggestionService.update(document_key("tag", tag_id), None)
@@ -0,0 +1,210 @@
+# apps/search/spelling.py
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from apps.tag.models import Tag
+
+from .app_settings import app_settings
+from .backends import get_search_backend
+from .index import tokenize
+
+
+class Correction(NamedTuple):
+    term: str
+    distance: int
+    count: int
+
+
+def edit_distance(source: str, target: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent transpositions),
+    or -1 as soon as it is known to exceed `max_distance`.
+    """
+    if abs(len(source) - len(target)) > max_distance:
+        return -1
+
+    previous_previous: List[int] = []
+    previous = list(range(len(target) + 1))
+    for i in range(1, len(source) + 1):
+        current = [i] + [0] * len(target)
+        row_minimum = i
+        for j in range(1, len(target) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and source[i - 1] == target[j - 2] and source[i - 2] == target[j - 1]:
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_minimum = min(row_minimum, value)
+        if row_minimum > max_distance:
+            return -1
+        previous_previous, previous = previous, current
+
+    distance = previous[-1]
+    return distance if distance <= max_distance else -1
+
+
+class SymSpellDictionary:
+    """
+    Symmetric delete spelling dictionary (SymSpell).
+
+    - words: indexed term -> number of titles/tags it appears in.
+    - deletes: every string obtained by deleting up to `max_distance`
+      characters from the first `prefix_length` characters of a word -> those words.
+
+    A lookup generates the deletes of the misspelled term only and checks
+    the few words sharing one of them, so no edit distance is computed
+    against the rest of the vocabulary.
+    """
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = max(prefix_length, max_distance + 1)
+        self.words: Dict[str, int] = {}
+        self.deletes: Dict[str, List[str]] = {}
+        self.longest = 0
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, term):
+        return term in self.words
+
+    def edits(self, term: str, distance: int) -> Set[str]:
+        """
+        `term` and every string `distance` deletions or less away from it.
+        """
+        found = {term}
+        frontier = [term]
+        for _ in range(distance):
+            following = []
+            for candidate in frontier:
+                for position in range(len(candidate)):
+                    deleted = candidate[:position] + candidate[position + 1:]
+                    if deleted not in found:
+                        found.add(deleted)
+                        following.append(deleted)
+            frontier = following
+        return found
+
+    def add(self, term: str, count: int = 1) -> None:
+        if term in self.words:
+            self.words[term] += count
+            return
+
+        self.words[term] = count
+        self.longest = max(self.longest, len(term))
+        for deleted in self.edits(term[:self.prefix_length], self.max_distance):
+            self.deletes.setdefault(deleted, []).append(term)
+
+    def add_text(self, text: str) -> None:
+        for term in set(tokenize(text)):
+            if len(term) > 1 and not term.isdigit():
+                self.add(term)
+
+    def lookup(self, term: str, max_distance: Optional[int] = None) -> Optional[Correction]:
+        """
+        Closest known word to `term`; the most frequent one among equally close words.
+        """
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        if term in self.words:
+            return Correction(term, 0, self.words[term])
+        if len(term) - max_distance > self.longest:
+            return None
+
+        prefix = term[:self.prefix_length]
+        best: Optional[Correction] = None
+        checked: Set[str] = set()
+        # Fewer deletions first: once a word is found, farther deletes cannot beat it.
+        for deleted in sorted(self.edits(prefix, max_distance), key=len, reverse=True):
+            if best is not None and len(prefix) - len(deleted) > best.distance:
+                break
+            for word in self.deletes.get(deleted, ()):
+                if word in checked:
+                    continue
+                checked.add(word)
+                limit = max_distance if best is None else best.distance
+                distance = edit_distance(term, word, limit)
+                if distance < 0:
+                    continue
+                candidate = Correction(word, distance, self.words[word])
+                if best is None or (candidate.distance, -candidate.count) < (best.distance, -best.count):
+                    best = candidate
+        return best
+
+    def correct(self, query: str) -> Optional[str]:
+        """
+        `query` with each unknown term replaced by its closest known word,
+        as normalized terms; None when no term could be corrected.
+
+        Terms of four characters or less allow a single edit, shorter than
+        three characters and numbers are left as they are.
+        """
+        terms = tokenize(query)
+        corrected = []
+        for term in terms:
+            correction = None
+            if len(term) > 2 and not term.isdigit() and term not in self.words:
+                correction = self.lookup(term, 1 if len(term) <= 4 else self.max_distance)
+            corrected.append(correction.term if correction is not None else term)
+
+        if corrected == terms:
+            return None
+        return " ".join(corrected)
+
+
+def vocabulary_texts() -> Iterable[str]:
+    """
+    Titles of the searchable programs and episodes and names of the active tags.
+    """
+    backend = get_search_backend()
+    yield from backend.published_programs().values_list("title", flat=True).iterator(chunk_size=5000)
+    yield from backend.published_episodes().values_list("title", flat=True).iterator(
+        chunk_size=5000
+    )
+    yield from Tag.objects.filter(is_active=True).values_list("name", flat=True).iterator(chunk_size=5000)
+
+
+class SpellingService:
+    """
+    Process-wide SymSpellDictionary, built from the database on first use
+    and again every SEARCH_SPELLING_REBUILD_INTERVAL seconds. Lookups read
+    it without locking; a rebuild replaces it at once.
+    """
+
+    _lock = threading.Lock()
+    _dictionary: Optional[SymSpellDictionary] = None
+    _built_at: float = 0.0
+
+    @classmethod
+    def build(cls) -> SymSpellDictionary:
+        dictionary = SymSpellDictionary(
+            max_distance=app_settings.SEARCH_SPELLING_MAX_EDIT_DISTANCE,
+            prefix_length=app_settings.SEARCH_SPELLING_PREFIX_LENGTH,
+        )
+        for text in vocabulary_texts():
+            dictionary.add_text(text)
+        return dictionary
+
+    @classmethod
+    def get_dictionary(cls) -> SymSpellDictionary:
+        dictionary = cls._dictionary
+        if dictionary is not None and time.monotonic() - cls._built_at <= app_settings.SEARCH_SPELLING_REBUILD_INTERVAL:
+            return dictionary
+
+        # While another thread rebuilds, keep answering from the expired dictionary.
+        if not cls._lock.acquire(blocking=dictionary is None):
+            return dictionary
+        try:
+            if cls._dictionary is dictionary:
+                cls._dictionary = cls.build()
+                cls._built_at = time.monotonic()
+            return cls._dictionary
+        finally:
+            cls._lock.release()
+
+    @classmethod
+    def correct(cls, query: str) -> Optional[str]:
+        if not app_settings.SEARCH_SPELLING_ENABLED:
+            return None
+        return cls.get_dictionary().correct(query)
@@ -0,0 +1,320 @@
+# apps/search/suggest.py
+import heapq
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+
+from django.db import connections
+
+from apps.category.models import Category
+from apps.episode.models import Episode
+from apps.program.models import Program
+from apps.tag.models import Tag
+
+from .app_settings import app_settings
+from .backends import get_search_backend
+from .documents import document_key, sort_timestamp
+from .index import tokenize
+from .indexing import index_changes
+
+logger = logging.getLogger(__name__)
+
+# Base weight of each kind of suggestion, before the featured/recency boosts.
+KIND_WEIGHTS = {
+    "program": 4.0,
+    "episode": 2.0,
+    "category": 3.0,
+    "tag": 1.0,
+}
+
+
+class Suggestion(NamedTuple):
+    key: str
+    kind: str
+    text: str
+    weight: float
+    payload: Dict[str, Any]
+
+
+class SuggestionIndex:
+    """
+    Edge n-gram table used by the autocomplete endpoint.
+
+    - prefixes: prefix of every word of a suggestion -> keys of the suggestions.
+    - The best keys of a prefix are cached after the first lookup and dropped
+      as soon as a suggestion sharing that prefix changes, so a keystroke is
+      a couple of dict lookups.
+    """
+
+    def __init__(self, max_prefix_length: int = 20, cache_size: int = 20):
+        self.max_prefix_length = max_prefix_length
+        self.cache_size = cache_size
+        self.suggestions: Dict[str, Suggestion] = {}
+        self.prefixes: Dict[str, Set[str]] = {}
+        self._prefixes_of: Dict[str, Set[str]] = {}
+        self._top: Dict[str, List[str]] = {}
+
+    def __len__(self):
+        return len(self.suggestions)
+
+    def __contains__(self, key):
+        return key in self.suggestions
+
+    def edge_ngrams(self, text: str) -> Set[str]:
+        grams = set()
+        for word in tokenize(text):
+            grams.update(word[:size] for size in range(1, min(len(word), self.max_prefix_length) + 1))
+        return grams
+
+    def add(self, suggestion: Suggestion) -> None:
+        self.remove(suggestion.key)
+
+        grams = self.edge_ngrams(suggestion.text)
+        if not grams:
+            return
+
+        self.suggestions[suggestion.key] = suggestion
+        self._prefixes_of[suggestion.key] = grams
+        for gram in grams:
+            self.prefixes.setdefault(gram, set()).add(suggestion.key)
+            self._top.pop(gram, None)
+
+    def remove(self, key: str) -> None:
+        if self.suggestions.pop(key, None) is None:
+            return
+
+        for gram in self._prefixes_of.pop(key, ()):
+            keys = self.prefixes.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.prefixes[gram]
+            self._top.pop(gram, None)
+
+    def top(self, prefix: str) -> List[str]:
+        keys = self._top.get(prefix)
+        if keys is None:
+            candidates = self.prefixes.get(prefix, ())
+            keys = heapq.nlargest(self.cache_size, candidates, key=self._rank)
+            self._top[prefix] = keys
+        return keys
+
+    def _rank(self, key: str):
+        suggestion = self.suggestions[key]
+        return suggestion.weight, -len(suggestion.text), key
+
+    def suggest(self, query: str, limit: int = 8) -> List[Suggestion]:
+        """
+        Suggestions having a word starting with every word of `query`, best first.
+        """
+        words = [word[:self.max_prefix_length] for word in tokenize(query)]
+        if not words:
+            return []
+
+        if len(words) == 1 and limit <= self.cache_size:
+            return [self.suggestions[key] for key in self.top(words[0])[:limit]]
+
+        # Start from the rarest prefix and check the others against it.
+        postings = sorted((self.prefixes.get(word, set()) for word in words), key=len)
+        candidates = set.intersection(*postings) if postings[0] else set()
+        keys = heapq.nlargest(limit, candidates, key=self._rank)
+        return [self.suggestions[key] for key in keys]
+
+
+def recency_boost(published_at: int, now: Optional[float] = None) -> float:
+    """
+    1.0 for content published now, halving every SEARCH_SUGGEST_RECENCY_HALF_LIFE days.
+    """
+    if not published_at:
+        return 0.5
+    now = time.time() if now is None else now
+    age_days = max(now - published_at, 0) / 86400
+    return 0.5 + 0.5 * math.pow(0.5, age_days / app_settings.SEARCH_SUGGEST_RECENCY_HALF_LIFE)
+
+
+def content_weight(kind: str, is_featured: bool, publish_date) -> float:
+    weight = KIND_WEIGHTS[kind] * recency_boost(sort_timestamp(publish_date))
+    if is_featured:
+        weight *= app_settings.SEARCH_SUGGEST_FEATURED_BOOST
+    return weight
+
+
+def program_suggestion(program: Program) -> Suggestion:
+    return Suggestion(
+        key=document_key("program", program.pk),
+        kind="program",
+        text=program.title,
+        weight=content_weight("program", program.is_featured, program.publish_date),
+        payload={"id": str(program.pk), "slug": program.slug},
+    )
+
+
+def episode_suggestion(episode: Episode) -> Suggestion:
+    return Suggestion(
+        key=document_key("episode", episode.pk),
+        kind="episode",
+        text=episode.title,
+        weight=content_weight("episode", episode.is_featured, episode.publish_date),
+        payload={"id": str(episode.pk), "slug": episode.slug},
+    )
+
+
+def category_suggestion(category: Category) -> Suggestion:
+    return Suggestion(
+        key=document_key("category", category.pk),
+        kind="category",
+        text=category.name,
+        weight=KIND_WEIGHTS["category"],
+        payload={"id": str(category.pk), "slug": category.slug},
+    )
+
+
+def tag_suggestion(tag: Tag) -> Suggestion:
+    return Suggestion(
+        key=document_key("tag", tag.pk),
+        kind="tag",
+        text=tag.name,
+        weight=KIND_WEIGHTS["tag"],
+        payload={"id": str(tag.pk)},
+    )
+
+
+class SuggestionService:
+    """
+    Process-wide SuggestionIndex.
+
+    - Built from the database on first use (the first callers wait for it)
+      and again every SEARCH_SUGGEST_REBUILD_INTERVAL seconds, which bounds
+      how long other worker processes keep serving stale suggestions.
+    - Rebuilds run on a background thread: requests keep being answered
+      from the current table until the new one is swapped in.
+    - Kept up to date by the SearchService hooks, in the process that
+      applies index updates and in the others (see `IndexChangeFeed`);
+      changes made while a build runs are replayed on the new table.
+    """
+
+    _lock = threading.RLock()
+    _build_lock = threading.Lock()
+    _index: Optional[SuggestionIndex] = None
+    _built_at: float = 0.0
+    _changes: Optional[Dict[str, Optional[Suggestion]]] = None
+
+    @classmethod
+    def build(cls) -> SuggestionIndex:
+        backend = get_search_backend()
+        index = SuggestionIndex(
+            max_prefix_length=app_settings.SEARCH_SUGGEST_MAX_PREFIX_LENGTH,
+            cache_size=app_settings.SEARCH_SUGGEST_MAX_LIMIT,
+        )
+
+        programs = backend.published_programs().only("id", "title", "slug", "is_featured", "publish_date")
+        for program in programs.iterator(chunk_size=2000):
+            index.add(program_suggestion(program))
+
+        episodes = backend.published_episodes().only(
+            "id", "title", "slug", "is_featured", "publish_date"
+        )
+        for episode in episodes.iterator(chunk_size=2000):
+            index.add(episode_suggestion(episode))
+
+        for category in Category.objects.filter(is_active=True).only("id", "name", "slug").iterator():
+            index.add(category_suggestion(category))
+
+        for tag in Tag.objects.filter(is_active=True).only("id", "name").iterator():
+            index.add(tag_suggestion(tag))
+
+        return index
+
+    @classmethod
+    def rebuild(cls) -> None:
+        """
+        Build a new table and swap it in; the caller holds `_build_lock`.
+        """
+        with cls._lock:
+            cls._changes = {}
+        try:
+            index = cls.build()
+        except BaseException:
+            with cls._lock:
+                cls._changes = None
+            raise
+
+        with cls._lock:
+            for key, suggestion in cls._changes.items():
+                cls._apply(index, key, suggestion)
+            cls._changes = None
+            cls._index = index
+            cls._built_at = time.monotonic()
+
+    @classmethod
+    def _rebuild_in_background(cls) -> None:
+        try:
+            cls.rebuild()
+        except Exception:
+            logger.exception("Could not rebuild the suggestion table.")
+            # Retried after the next interval, not on every request.
+            cls._built_at = time.monotonic()
+        finally:
+            cls._build_lock.release()
+            connections.close_all()
+
+    @classmethod
+    def get_index(cls) -> SuggestionIndex:
+        index = cls._index
+        if index is not None and time.monotonic() - cls._built_at <= app_settings.SEARCH_SUGGEST_REBUILD_INTERVAL:
+            return index
+
+        if index is None:
+            # Nothing to answer from yet: wait for the first build.
+            with cls._build_lock:
+                if cls._index is None:
+                    cls.rebuild()
+                return cls._index
+
+        # Expired: keep answering from it while a background thread rebuilds.
+        if cls._build_lock.acquire(blocking=False):
+            try:
+                threading.Thread(target=cls._rebuild_in_background, name="suggest-rebuild", daemon=True).start()
+            except BaseException:
+                cls._build_lock.release()
+                raise
+        return index
+
+    @classmethod
+    def expire(cls) -> None:
+        """
+        Have the table rebuilt at the next lookup (in the background, as on expiry).
+        """
+        cls._built_at = float("-inf")
+
+    @classmethod
+    def suggest(cls, query: str, limit: int = 8) -> List[Dict[str, Any]]:
+        index_changes.poll()
+        index = cls.get_index()
+        with cls._lock:
+            suggestions = index.suggest(query, limit=limit)
+        return [
+            {"text": suggestion.text, "kind": suggestion.kind, **suggestion.payload}
+            for suggestion in suggestions
+        ]
+
+    @classmethod
+    def _apply(cls, index: SuggestionIndex, key: str, suggestion: Optional[Suggestion]) -> None:
+        if suggestion is None:
+            index.remove(key)
+        else:
+            index.add(suggestion)
+
+    @classmethod
+    def update(cls, key: str, suggestion: Optional[Suggestion]) -> None:
+        """
+        Apply one change to the current table, and to the one being built if any.
+        Skipped while no table exists and none is being built.
+        """
+        with cls._lock:
+            if cls._changes is not None:
+                cls._changes[key] = suggestion
+            if cls._index is not None:
+                cls._apply(cls._index, key, suggestion)
@@ -0,0 +1,74 @@
+# apps/search/tasks.py
+import logging
+from typing import Dict, List, Optional
+
+from celery import shared_task
+
+from . import analytics
+from .app_settings import app_settings
+from .cache import result_cache
+from .internal_search import warm_internal_content
+from .related import build_related
+from .services import SearchService
+
+logger = logging.getLogger(__name__)
+
+PREWARM_PAGE_SIZE = 10
+
+
+@shared_task(ignore_result=True)
+def apply_index_updates(program_ids: List[str], episode_ids: List[str]) -> None:
+    """
+    Apply a batch of coalesced search index updates (see `apps.search.indexing`).
+    """
+    SearchService.sync(program_ids, episode_ids)
+
+
+@shared_task
+def prewarm_search_cache(top: Optional[int] = None) -> int:
+    """
+    Nightly: put the first page of the most searched queries in the result cache.
+    Returns the number of queries warmed.
+
+    Skipped when SEARCH_RESULT_CACHE_ENABLED is off. On a process-local cache
+    alias the pages land in the memory of the process that runs it.
+    """
+    if not result_cache.enabled:
+        logger.info("Search result cache disabled, nothing pre-warmed.")
+        return 0
+
+    top = app_settings.SEARCH_ANALYTICS_PREWARM_TOP if top is None else top
+    warmed = 0
+    for row in analytics.top_queries(top):
+        warm_internal_content(
+            row["query"], limit=PREWARM_PAGE_SIZE, timeout=app_settings.SEARCH_ANALYTICS_PREWARM_TIMEOUT
+        )
+        warmed += 1
+
+    logger.info("Pre-warmed the search cache for %d queries.", warmed)
+    return warmed
+
+
+@shared_task
+def report_zero_result_queries(top: Optional[int] = None) -> List[Dict]:
+    """
+    Nightly: log the queries internal search most often could not answer,
+    i.e. the content gaps that cost external lookups.
+    """
+    top = app_settings.SEARCH_ANALYTICS_REPORT_TOP if top is None else top
+    rows = analytics.zero_result_queries(top)
+
+    for row in rows:
+        logger.info(
+            "Zero-result search query %r: %d searches, %d external lookups.",
+            row["query"], row["searches"], row["external"] or 0,
+        )
+    return rows
+
+
+@shared_task
+def build_related_content(full: bool = False) -> Dict[str, int]:
+    """
+    Recompute the "more like this" lists; incremental unless `full`.
+    """
+    return build_related(full=full)
@@ -0,0 +1,143 @@
+# apps/search/tests.py
+import threading
+import time
+from concurrent.futures import Future
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from .external_cache import StaleWhileRevalidateCache
+from .external_search_api import YouTubeVideoSearchService
+from .serpapi_client import SerpApiClient
+
+LOCAL_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "search-tests",
+    }
+}
+
+
+class StubResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class StubSession:
+    """
+    Stands in for the pooled requests.Session: answers every lookup with
+    the current `title`, optionally holding the call until `release` is set.
+    """
+
+    def __init__(self, title="First title", release=None):
+        self.title = title
+        self.release = release
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        with self.lock:
+            self.calls += 1
+        if self.release is not None:
+            self.release.wait(5)
+        return StubResponse({
+            "search_metadata": {"status": "Success"},
+            "title": self.title,
+            "channel": {"name": "Channel"},
+        })
+
+
+class ImmediateExecutor:
+    def submit(self, function, *args):
+        future = Future()
+        future.set_result(function(*args))
+        return future
+
+
+@override_settings(CACHES=LOCAL_CACHES, SEARCH_CACHE_ALIAS="default")
+class SerpApiCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.session = StubSession()
+        patcher = mock.patch("apps.search.serpapi_client.get_session", return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_service(self, ttl=60, stale_ttl=60, wait_timeout=5.0):
+        cache = StaleWhileRevalidateCache("serpapi-test", ttl=ttl, stale_ttl=stale_ttl, wait_timeout=wait_timeout)
+        cache.cache.clear()
+        return YouTubeVideoSearchService(serpapi_client=SerpApiClient(api_key="test"), cache=cache), cache
+
+    def test_fresh_entry_is_served_from_the_cache(self):
+        service, _ = self.make_service()
+
+        first = service.get_video_by_id("abc", country_code="us")
+        second = service.get_video_by_id("abc", country_code="us")
+
+        self.assertEqual(first, second)
+        self.assertEqual(first.title, "First title")
+        self.assertEqual(self.session.calls, 1)
+
+    def test_keys_include_country_and_language(self):
+        service, _ = self.make_service()
+
+        service.get_video_by_id("abc", country_code="us")
+        service.get_video_by_id("abc", country_code="fr", language_code="fr")
+
+        self.assertEqual(self.session.calls, 2)
+
+    def test_stale_entry_is_served_while_it_is_refreshed(self):
+        # ttl=0: entries are stale as soon as they are stored.
+        service, cache = self.make_service(ttl=0)
+        service.get_video_by_id("abc")
+        self.session.title = "Second title"
+
+        with mock.patch.object(StaleWhileRevalidateCache, "refresh_executor", ImmediateExecutor()):
+            stale = service.get_video_by_id("abc")
+
+        self.assertEqual(stale.title, "First title")
+        self.assertEqual(self.session.calls, 2)
+        self.assertEqual(cache.peek(("youtube_video", "abc", None, None)).title, "Second title")
+
+    def test_concurrent_misses_make_a_single_upstream_call(self):
+        self.session.release = threading.Event()
+        service, _ = self.make_service()
+        results = []
+
+        def lookup():
+            results.append(service.get_video_by_id("abc"))
+
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        self.session.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(results), 8)
+        self.assertEqual({video.title for video in results}, {"First title"})
+        self.assertEqual(self.session.calls, 1)
+
+    def test_miss_waits_for_the_worker_holding_the_lock(self):
+        service, cache = self.make_service()
+        key = ("youtube_video", "abc", None, None)
+        # Another worker is fetching this entry.
+        cache.cache.add(f"{cache.make_key(key)}:lock", "other-worker", timeout=10)
+        results = []
+
+        thread = threading.Thread(target=lambda: results.append(service.get_video_by_id("abc")))
+        thread.start()
+        time.sleep(0.1)
+        cache.put(key, service.parse_video("abc", {"search_metadata": {"status": "Success"}, "title": "Theirs"}))
+        thread.join(5)
+
+        self.assertEqual(results[0].title, "Theirs")
+        self.assertEqual(self.session.calls, 0)
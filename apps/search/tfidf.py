@@ -0,0 +1,131 @@
+# apps/search/tfidf.py
+import math
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+# One weighted bag of terms per item: {term: weight}.
+Bag = Dict[str, float]
+
+
+class TfidfMatrix:
+    """
+    L2-normalized TF-IDF vectors of a set of items, as a CSR matrix in plain NumPy arrays.
+
+    - tf is sublinear (1 + log of the weighted count), idf is smoothed.
+    - Terms found in a single item cannot relate two items and terms found in
+      more than `max_df` of them relate everything; both still count in the
+      norms but are left out of the postings, which keeps the products small.
+    - `postings` is the same matrix by column (CSC): the items of every term.
+    """
+
+    def __init__(self, bags: List[Bag], max_df: float = 0.5) -> None:
+        vocabulary: Dict[str, int] = {}
+        indptr = np.zeros(len(bags) + 1, dtype=np.int64)
+        indices: List[int] = []
+        counts: List[float] = []
+
+        for row, bag in enumerate(bags):
+            for term, count in bag.items():
+                indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                counts.append(count)
+            indptr[row + 1] = len(indices)
+
+        self.shape = (len(bags), len(vocabulary))
+        self.indptr = indptr
+        self.indices = np.asarray(indices, dtype=np.int32)
+
+        document_frequency = np.bincount(self.indices, minlength=len(vocabulary))
+        idf = np.log((1.0 + len(bags)) / (1.0 + document_frequency)) + 1.0
+        data = (1.0 + np.log(np.maximum(np.asarray(counts, dtype=np.float64), 1e-9))) * idf[self.indices]
+        data = np.maximum(data, 0.0)
+
+        row_of_entry = np.repeat(np.arange(len(bags)), np.diff(indptr))
+        norms = np.sqrt(np.bincount(row_of_entry, weights=data ** 2, minlength=len(bags)))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.data = np.where(norms[row_of_entry] > 0, data / norms[row_of_entry], 0.0).astype(np.float32)
+
+        max_items = max(math.floor(max_df * len(bags)), 2)
+        self.useful_terms = (document_frequency >= 2) & (document_frequency <= max_items)
+        self._build_postings(row_of_entry)
+
+    def _build_postings(self, row_of_entry: np.ndarray) -> None:
+        keep = self.useful_terms[self.indices]
+        terms, rows, data = self.indices[keep], row_of_entry[keep], self.data[keep]
+        order = np.argsort(terms, kind="stable")
+        self.postings_rows = rows[order].astype(np.int32)
+        self.postings_data = data[order]
+        self.postings_indptr = np.zeros(self.shape[1] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=self.shape[1]), out=self.postings_indptr[1:])
+
+    def scores(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of `rows` with every item, as a dense (len(rows), n_items) block.
+        Only the postings of the terms of `rows` are touched.
+        """
+        n_items = self.shape[0]
+        starts, ends = self.indptr[rows], self.indptr[rows + 1]
+        entry_lengths = ends - starts
+        entries = np.repeat(starts - np.cumsum(entry_lengths) + entry_lengths, entry_lengths) + np.arange(entry_lengths.sum())
+        entry_block_rows = np.repeat(np.arange(len(rows)), entry_lengths)
+        terms, weights = self.indices[entries], self.data[entries]
+
+        keep = self.useful_terms[terms]
+        terms, weights, entry_block_rows = terms[keep], weights[keep], entry_block_rows[keep]
+
+        posting_starts = self.postings_indptr[terms]
+        posting_lengths = self.postings_indptr[terms + 1] - posting_starts
+        positions = (
+            np.repeat(posting_starts - np.cumsum(posting_lengths) + posting_lengths, posting_lengths)
+            + np.arange(posting_lengths.sum())
+        )
+        targets = self.postings_rows[positions].astype(np.int64)
+        contributions = np.repeat(weights, posting_lengths) * self.postings_data[positions]
+        cells = np.repeat(entry_block_rows, posting_lengths).astype(np.int64) * n_items + targets
+
+        return np.bincount(cells, weights=contributions, minlength=len(rows) * n_items).reshape(len(rows), n_items)
+
+    def nearest(
+        self,
+        rows: Iterable[int],
+        groups: Dict[str, Tuple[int, int]],
+        k: int,
+        min_score: float = 0.0,
+        block_budget: int = 8_000_000,
+    ) -> Iterator[Tuple[int, Dict[str, List[Tuple[int, float]]]]]:
+        """
+        Top-`k` most similar items of every row, per group of columns
+        (`groups`: name -> [start, end) item range), the row itself excluded.
+        Rows are processed in blocks of at most `block_budget` scores.
+        """
+        rows = np.asarray(list(rows), dtype=np.int64)
+        block_size = max(1, block_budget // max(self.shape[0], 1))
+
+        for block_start in range(0, len(rows), block_size):
+            block = rows[block_start:block_start + block_size]
+            scores = self.scores(block)
+            scores[np.arange(len(block)), block] = 0.0
+
+            neighbours = {name: top_k(scores[:, start:end], k, min_score, start) for name, (start, end) in groups.items()}
+            for position, row in enumerate(block):
+                yield int(row), {name: found[position] for name, found in neighbours.items()}
+
+
+def top_k(scores: np.ndarray, k: int, min_score: float, offset: int = 0) -> List[List[Tuple[int, float]]]:
+    """
+    Best `k` columns of every row above `min_score`, best first, as (column + offset, score).
+    """
+    if scores.shape[1] == 0:
+        return [[] for _ in range(scores.shape[0])]
+
+    k = min(k, scores.shape[1])
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    candidates = np.take_along_axis(candidates, order, axis=1)
+    candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+    return [
+        [(int(column) + offset, float(score)) for column, score in zip(columns, values) if score > min_score]
+        for columns, values in zip(candidates, candidate_scores)
+    ]
@@ -0,0 +1,15 @@
+# apps/search/throttling.py
+from rest_framework.throttling import UserRateThrottle
+
+from .app_settings import app_settings
+
+
+class ExternalBatchSearchRateThrottle(UserRateThrottle):
+    """
+    Per-user rate of batch lookups (SEARCH_EXTERNAL_BATCH_THROTTLE_RATE),
+    each of which may cost up to SEARCH_EXTERNAL_BATCH_MAX_SIZE provider calls.
+    """
+    scope = "search_external_batch"
+
+    def get_rate(self):
+        return app_settings.SEARCH_EXTERNAL_BATCH_THROTTLE_RATE
@@ -1,10 +1,14 @@
 # apps/search/urls.py
 from django.urls import path
 
-from apps.search.views.restful_apis import SearchAPIView
+from apps.search.views.async_views import AsyncSearchView
+from apps.search.views.restful_apis import SearchAPIView, SearchMetricsAPIView, SuggestAPIView
 
 app_name = "search"
 
 urlpatterns = [
     path("api/searches/", SearchAPIView.as_view(), name="search"),
+    path("api/searches/async/", AsyncSearchView.as_view(), name="search-async"),
+    path("api/searches/metrics/", SearchMetricsAPIView.as_view(), name="search-metrics"),
+    path("api/suggest/", SuggestAPIView.as_view(), name="suggest"),
 ]
\ No newline at end of file
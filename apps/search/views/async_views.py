@@ -0,0 +1,201 @@
+# apps/search/views/async_views.py
+import asyncio
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+from django.views import View
+
+from .. import analytics, ingest
+from ..app_settings import app_settings
+from ..external_search_api import YouTubeVideoSearchService
+from ..internal_search import asearch_internal_content
+from ..resilience import ExternalProviderUnavailable
+from ..results import InvalidCursor
+
+
+class AsyncSearchView(View):
+    """
+    GET /search/api/searches/async/
+
+    Async-native twin of SearchAPIView (same query parameters and response
+    shapes) for deployments served through `project/asgi.py`:
+
+    - Internal search runs on the async ORM.
+    - With a `video_id`, the external lookup is hedged: it starts after
+      SEARCH_ASYNC_HEDGE_DELAY seconds if internal search has not answered
+      yet, runs in parallel, and is cancelled as soon as internal results arrive.
+    - The whole request runs under SEARCH_ASYNC_DEADLINE seconds; past it,
+      pending work is cancelled and 504 is returned.
+    - A video found externally is queued for import (see `apps.search.ingest`);
+      once imported, it is answered from the catalog without the external call.
+    """
+
+    external_video_service_class = YouTubeVideoSearchService
+    default_limit = 10
+    max_limit = 50
+
+    def get_limit(self, request) -> int:
+        try:
+            limit = int(request.GET.get("limit", self.default_limit))
+        except (TypeError, ValueError):
+            return self.default_limit
+        return min(max(limit, 1), self.max_limit)
+
+    def respond(self, data, status=200, **kwargs):
+        response = JsonResponse(data, status=status, encoder=DjangoJSONEncoder, **kwargs)
+        # Kept for the analytics, which would otherwise have to parse the body back.
+        response.search_data = data
+        return response
+
+    async def get(self, request, *args, **kwargs):
+        started = time.monotonic()
+        response = await self.search(request)
+        self.record_search(request, response, started)
+        return response
+
+    def record_search(self, request, response, started) -> None:
+        if request.GET.get("cursor"):
+            return
+        analytics.record_response(request.GET.get("q", "").strip(), response.search_data, started)
+
+    async def search(self, request):
+        search_text = request.GET.get("q", "").strip()
+        video_id = request.GET.get("video_id", "").strip()
+        country_code = request.GET.get("country_code", "").strip() or None
+        language_code = request.GET.get("language_code", "").strip() or None
+        cursor = request.GET.get("cursor", "").strip() or None
+
+        deadline = time.monotonic() + app_settings.SEARCH_ASYNC_DEADLINE
+        internal = asyncio.ensure_future(asearch_internal_content(
+            search_text, limit=self.get_limit(request), cursor=cursor, language=language_code
+        ))
+        external = None
+
+        try:
+            # 1) Give internal search a head start, then hedge with the external lookup.
+            if video_id:
+                await asyncio.wait({internal}, timeout=app_settings.SEARCH_ASYNC_HEDGE_DELAY)
+                if not internal.done():
+                    external = asyncio.ensure_future(self.lookup_video(video_id, country_code, language_code))
+
+            await asyncio.wait({internal}, timeout=max(deadline - time.monotonic(), 0))
+            if not internal.done():
+                return self.deadline_exceeded(search_text)
+
+            try:
+                internal_page = internal.result()
+            except InvalidCursor as exc:
+                return self.respond({"cursor": [str(exc)]}, status=400)
+
+            if internal_page.results:
+                return self.respond(
+                    {
+                        "query": search_text,
+                        "source": "internal",
+                        "results": internal_page.results,
+                        "next_cursor": internal_page.next_cursor,
+                        "total": internal_page.total,
+                        "fuzzy": internal_page.fuzzy,
+                        "facets": internal_page.facets,
+                        "did_you_mean": internal_page.did_you_mean,
+                        "corrected": internal_page.corrected,
+                    },
+                    headers={"X-Search-Cache": "hit" if internal_page.cached else "miss"},
+                )
+
+            if not video_id:
+                return self.respond({
+                    "query": search_text,
+                    "source": "none",
+                    "results": [],
+                    "did_you_mean": internal_page.did_you_mean,
+                })
+
+            # 2) A video already imported is answered from the catalog.
+            imported = await sync_to_async(ingest.imported_video)(video_id)
+            if imported is not None:
+                return self.respond(
+                    {"query": search_text, "video_id": video_id, "source": "internal", "results": [imported]}
+                )
+
+            # 3) External fallback, already in flight when internal search was slow.
+            if external is None:
+                external = asyncio.ensure_future(self.lookup_video(video_id, country_code, language_code))
+            await asyncio.wait({external}, timeout=max(deadline - time.monotonic(), 0))
+            if not external.done():
+                return self.deadline_exceeded(search_text)
+
+            if external.exception() is None:
+                await sync_to_async(ingest.queue_external_videos)([external.result()])
+            return self.external_response(search_text, video_id, external)
+        finally:
+            for task in (internal, external):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def lookup_video(self, video_id, country_code, language_code):
+        external_service = self.external_video_service_class()
+        return await external_service.aget_video_by_id(
+            video_id=video_id,
+            country_code=country_code,
+            language_code=language_code,
+        )
+
+    def external_response(self, search_text, video_id, external):
+        try:
+            video_metadata = external.result()
+        except ExternalProviderUnavailable:
+            return self.respond(
+                {
+                    "query": search_text,
+                    "video_id": video_id,
+                    "source": "external",
+                    "results": [],
+                    "error": "External search provider unavailable.",
+                },
+                status=503,
+            )
+
+        if video_metadata is None:
+            return self.respond(
+                {
+                    "query": search_text,
+                    "video_id": video_id,
+                    "source": "external",
+                    "results": [],
+                    "error": "External search provider did not return a result.",
+                },
+                status=502,
+            )
+
+        return self.respond(
+            {
+                "query": search_text,
+                "video_id": video_metadata.video_id,
+                "source": "external",
+                "results": [
+                    {
+                        "id": video_metadata.video_id,
+                        "title": video_metadata.title,
+                        "thumbnail_url": video_metadata.thumbnail_url,
+                        "view_count": video_metadata.view_count,
+                        "like_count": video_metadata.like_count,
+                        "description": video_metadata.description,
+                        "channel_name": video_metadata.channel_name,
+                    }
+                ],
+            }
+        )
+
+    def deadline_exceeded(self, search_text):
+        return self.respond(
+            {
+                "query": search_text,
+                "source": "none",
+                "results": [],
+                "error": "Search deadline exceeded.",
+            },
+            status=504,
+        )
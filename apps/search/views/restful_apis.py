@@ -1,10 +1,19 @@
 # apps/search/views.py
+import time
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
+from .. import analytics, ingest, permissions, serpapi_client
 from ..internal_search import search_internal_content
 from ..external_search_api import YouTubeVideoSearchService
+from ..app_settings import app_settings
+from ..cache import result_cache
+from ..resilience import ExternalProviderUnavailable
+from ..results import InvalidCursor
+from ..suggest import SuggestionService
+from ..throttling import ExternalBatchSearchRateThrottle
 
 
 class SearchAPIView(APIView):
@@ -13,47 +22,223 @@ class SearchAPIView(APIView):
 
     Query parameters:
       - q: text query for internal search (optional)
+      - limit: page size for internal results (default 10, max 50)
+      - cursor: `next_cursor` returned by the previous page (optional)
       - video_id: optional YouTube video ID for external fallback
+      - video_ids: optional comma-separated YouTube video IDs (batch external fallback)
       - country_code: optional ISO country code for SerpApi (e.g., 'us', 'sa')
       - language_code: optional language code for SerpApi (e.g., 'en', 'ar')
 
     Flow:
       1) Try internal DB search using `q`.
-      2) If internal results exist → return them with source="internal".
-      3) If internal results are empty and video_id is provided → call external.
+      2) If internal results exist → return them with source="internal",
+         together with `next_cursor` (null on the last page) and `total`.
+         `fuzzy` is true when the results come from typo-tolerant matching.
+         `facets` (first page only) counts matches per category, program type,
+         language and episode media type: `{facet: [{value, label, count}]}`.
+         Each result has `highlight`: `{title: [[start, end]], snippet: {text, offsets}}`,
+         character offsets of the matched words (snippet null when only the title matches).
+         The `X-Search-Cache` header tells whether the page came from the result cache.
+         When nothing matched `q`, `did_you_mean` is its spelling correction;
+         `corrected` is true when the results are those of the corrected query
+         (tried before any external call, SEARCH_SPELLING_AUTO_RETRY).
+      3) If internal results are empty and video_id is provided → answer the
+         episode the video was imported as (source="internal") when there is
+         one, else call external (503 at once while the provider's circuit
+         breaker is open).
       4) If external returns video → return it with source="external".
-      5) If both fail → return empty results.
+         Videos found externally are queued for import into the catalog
+         (see `apps.search.ingest`), so the next searches answer them internally.
+      5) If both fail → return empty results (with `did_you_mean`).
+
+    First-page searches are counted (query, source, result count, latency)
+    in the search analytics, see `apps.search.analytics`.
+
+    POST /api/search/ with {"video_ids": [...], "country_code", "language_code"}
+    runs the batch lookup directly. Batch lookups run concurrently under a
+    deadline; ids that did not answer in time are listed in `timed_out`.
+    They are billed per id, so they need a signed-in user and are throttled
+    per user (SEARCH_EXTERNAL_BATCH_THROTTLE_RATE); internal search stays public.
     """
 
     external_video_service_class = YouTubeVideoSearchService
+    batch_permission_classes = (permissions.ExternalBatchSearchAccessPolicy,)
+    batch_throttle_classes = (ExternalBatchSearchRateThrottle,)
+    default_limit = 10
+    max_limit = 50
+
+    def get_limit(self, request) -> int:
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except (TypeError, ValueError):
+            return self.default_limit
+        return min(max(limit, 1), self.max_limit)
+
+    def get_video_ids(self, value) -> list:
+        """
+        Video ids from a comma-separated string or a list, without blanks and duplicates.
+        """
+        if isinstance(value, str):
+            value = value.split(",")
+        if not isinstance(value, (list, tuple)):
+            raise ValueError("Expected a list of video ids.")
+
+        video_ids = list(dict.fromkeys(str(video_id).strip() for video_id in value if str(video_id).strip()))
+        if len(video_ids) > app_settings.SEARCH_EXTERNAL_BATCH_MAX_SIZE:
+            raise ValueError(f"At most {app_settings.SEARCH_EXTERNAL_BATCH_MAX_SIZE} video ids per request.")
+        return video_ids
+
+    def video_result(self, video_metadata) -> dict:
+        return {
+            "id": video_metadata.video_id,
+            "title": video_metadata.title,
+            "thumbnail_url": video_metadata.thumbnail_url,
+            "view_count": video_metadata.view_count,
+            "like_count": video_metadata.like_count,
+            "description": video_metadata.description,
+            "channel_name": video_metadata.channel_name,
+        }
+
+    def check_batch_access(self, request) -> None:
+        """
+        `check_permissions` / `check_throttles` of the batch lookup only.
+        """
+        for permission in (permission_class() for permission_class in self.batch_permission_classes):
+            if not permission.has_permission(request, self):
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, "message", None),
+                    code=getattr(permission, "code", None),
+                )
+
+        for throttle in (throttle_class() for throttle_class in self.batch_throttle_classes):
+            if not throttle.allow_request(request, self):
+                self.throttled(request, throttle.wait())
+
+    def batch_response(self, search_text, video_ids, country_code, language_code) -> Response:
+        external_service = self.external_video_service_class()
+        batch = external_service.get_videos_by_ids(
+            video_ids,
+            country_code=country_code,
+            language_code=language_code,
+            concurrency=app_settings.SEARCH_EXTERNAL_BATCH_CONCURRENCY,
+            deadline=app_settings.SEARCH_EXTERNAL_BATCH_DEADLINE,
+        )
+        ingest.queue_external_videos(batch.videos)
+
+        return Response(
+            {
+                "query": search_text,
+                "video_ids": video_ids,
+                "source": "external",
+                "results": [self.video_result(video) for video in batch.videos],
+                "missing": batch.missing,
+                "timed_out": batch.timed_out,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    def post(self, request, *args, **kwargs):
+        self.check_batch_access(request)
+        data = request.data if isinstance(request.data, dict) else {}
+        country_code = str(data.get("country_code") or "").strip() or None
+        language_code = str(data.get("language_code") or "").strip() or None
+
+        try:
+            video_ids = self.get_video_ids(data.get("video_ids") or [])
+        except ValueError as exc:
+            return Response({"video_ids": [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not video_ids:
+            return Response({"video_ids": ["This field is required."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        return self.batch_response("", video_ids, country_code, language_code)
 
     def get(self, request, *args, **kwargs):
+        started = time.monotonic()
+        response = self.search(request)
+        self.record_search(request, response, started)
+        return response
+
+    def record_search(self, request, response, started) -> None:
+        """
+        Count the search in the analytics buffer (no database write here).
+        Next pages of a result stream are not counted again.
+        """
+        if request.query_params.get("cursor") or not isinstance(response.data, dict):
+            return
+        analytics.record_response(request.query_params.get("q", "").strip(), response.data, started)
+
+    def search(self, request):
         search_text = request.query_params.get("q", "").strip()
         video_id = request.query_params.get("video_id", "").strip()
         country_code = request.query_params.get("country_code", "").strip() or None
         language_code = request.query_params.get("language_code", "").strip() or None
+        cursor = request.query_params.get("cursor", "").strip() or None
+
+        try:
+            video_ids = self.get_video_ids(request.query_params.get("video_ids", ""))
+        except ValueError as exc:
+            return Response({"video_ids": [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
 
         # 1) Internal search (CMS/DB)
-        internal_results = search_internal_content(search_text)
+        try:
+            internal_page = search_internal_content(
+                search_text, limit=self.get_limit(request), cursor=cursor, language=language_code
+            )
+        except InvalidCursor as exc:
+            return Response({"cursor": [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
 
-        if internal_results:
+        if internal_page.results:
             return Response(
                 {
                     "query": search_text,
                     "source": "internal",
-                    "results": internal_results,
+                    "results": internal_page.results,
+                    "next_cursor": internal_page.next_cursor,
+                    "total": internal_page.total,
+                    "fuzzy": internal_page.fuzzy,
+                    "facets": internal_page.facets,
+                    "did_you_mean": internal_page.did_you_mean,
+                    "corrected": internal_page.corrected,
                 },
                 status=status.HTTP_200_OK,
+                headers={"X-Search-Cache": "hit" if internal_page.cached else "miss"},
             )
 
         # 2) External search (SerpApi YouTube) as fallback
+        if video_ids:
+            self.check_batch_access(request)
+            return self.batch_response(search_text, video_ids, country_code, language_code)
+
         if video_id:
+            # Already imported (see `apps.search.ingest`): answered from the catalog.
+            imported = ingest.imported_video(video_id)
+            if imported is not None:
+                return Response(
+                    {"query": search_text, "video_id": video_id, "source": "internal", "results": [imported]},
+                    status=status.HTTP_200_OK,
+                )
+
             external_service = self.external_video_service_class()
-            video_metadata = external_service.get_video_by_id(
-                video_id=video_id,
-                country_code=country_code,
-                language_code=language_code,
-            )
+            try:
+                video_metadata = external_service.get_video_by_id(
+                    video_id=video_id,
+                    country_code=country_code,
+                    language_code=language_code,
+                )
+            except ExternalProviderUnavailable:
+                # Circuit breaker is open: answer right away instead of waiting on the provider.
+                return Response(
+                    {
+                        "query": search_text,
+                        "video_id": video_id,
+                        "source": "external",
+                        "results": [],
+                        "error": "External search provider unavailable.",
+                    },
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                )
 
             if video_metadata is None:
                 return Response(
@@ -67,22 +252,13 @@ class SearchAPIView(APIView):
                     status=status.HTTP_502_BAD_GATEWAY,
                 )
 
+            ingest.queue_external_videos([video_metadata])
             return Response(
                 {
                     "query": search_text,
                     "video_id": video_metadata.video_id,
                     "source": "external",
-                    "results": [
-                        {
-                            "id": video_metadata.video_id,
-                            "title": video_metadata.title,
-                            "thumbnail_url": video_metadata.thumbnail_url,
-                            "view_count": video_metadata.view_count,
-                            "like_count": video_metadata.like_count,
-                            "description": video_metadata.description,
-                            "channel_name": video_metadata.channel_name,
-                        }
-                    ],
+                    "results": [self.video_result(video_metadata)],
                 },
                 status=status.HTTP_200_OK,
             )
@@ -93,6 +269,62 @@ class SearchAPIView(APIView):
                 "query": search_text,
                 "source": "none",
                 "results": [],
+                "did_you_mean": internal_page.did_you_mean,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class SuggestAPIView(APIView):
+    """
+    GET /search/api/suggest/
+
+    Query parameters:
+      - q: what the user typed so far
+      - limit: number of suggestions (default 8, max 20)
+
+    Answered from the in-process autocomplete table (see `apps.search.suggest`):
+    Program/Episode titles, tag and category names whose words start with
+    every word of `q`, ranked by kind, `is_featured` and recency.
+    The database is never queried per keystroke.
+    """
+
+    def get_limit(self, request) -> int:
+        default = app_settings.SEARCH_SUGGEST_DEFAULT_LIMIT
+        try:
+            limit = int(request.query_params.get("limit", default))
+        except (TypeError, ValueError):
+            return default
+        return min(max(limit, 1), app_settings.SEARCH_SUGGEST_MAX_LIMIT)
+
+    def get(self, request, *args, **kwargs):
+        search_text = request.query_params.get("q", "").strip()
+
+        return Response(
+            {
+                "query": search_text,
+                "results": SuggestionService.suggest(search_text, limit=self.get_limit(request)),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class SearchMetricsAPIView(APIView):
+    """
+    GET /search/api/searches/metrics/
+
+    Monitoring counters of the search app: result cache hits/misses,
+    external provider circuit breaker state and latency histogram.
+    The breaker and histogram are per process.
+    """
+    permission_classes = (permissions.SearchMetricsAccessPolicy,)
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            {
+                "result_cache": result_cache.stats(),
+                "external_provider": serpapi_client.metrics(),
+                "analytics": {"pending": analytics.analytics_buffer.pending()},
             },
             status=status.HTTP_200_OK,
-        )
\ No newline at end of file
+        )
@@ -1,7 +1,8 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from . import models
+from ..search.services import SearchService
 
 """
  ============================================================== 
@@ -13,3 +14,23 @@ from . import models
 @receiver(post_save, sender=models.Tag)
 def receiver_tag_created(sender, instance, created, *args, **kwargs):
     pass
+
+
+"""
+ ==============================================================
+     Django Receiver for Search
+ ==============================================================
+"""
+
+
+@receiver(post_save, sender=models.Tag)
+def receiver_tag_saved(sender, instance, created, **kwargs):
+    """
+    Keep the tag name in the autocomplete table while it is active.
+    """
+    SearchService.index_tag(instance)
+
+
+@receiver(post_delete, sender=models.Tag)
+def receiver_tag_deleted(sender, instance, **kwargs):
+    SearchService.remove_tag(instance.id)
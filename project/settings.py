@@ -3,6 +3,7 @@ import os
 import platform
 
 import firebase_admin
+from celery.schedules import crontab
 from django.urls import reverse_lazy
 from django.utils.encoding import smart_str
 from django.utils.translation import gettext_lazy as _
@@ -349,6 +350,35 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_ENABLE_UTC = True
 
+# Periodic tasks run by `celery beat`, next to the ones managed through django_celery_beat.
+CELERY_BEAT_SCHEDULE = {
+    'search-prewarm-cache': {
+        'task': 'apps.search.tasks.prewarm_search_cache',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'search-report-zero-result-queries': {
+        'task': 'apps.search.tasks.report_zero_result_queries',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'search-related-content': {
+        'task': 'apps.search.tasks.build_related_content',
+        'schedule': crontab(minute=20),
+    },
+    'search-related-content-full': {
+        'task': 'apps.search.tasks.build_related_content',
+        'schedule': crontab(hour=4, minute=0, day_of_week='sunday'),
+        'kwargs': {'full': True},
+    },
+    'importer-poll-rss-feeds': {
+        'task': 'apps.importer.tasks.poll_rss_feeds',
+        'schedule': crontab(minute='*/15'),
+    },
+    'importer-ingest-youtube-channels': {
+        'task': 'apps.importer.tasks.ingest_youtube_channels',
+        'schedule': crontab(minute=40),
+    },
+}
+
 # The modeltranslation application is used to translate dynamic content of existing Django models
 # to an arbitrary number of languages without having to change the original model classes.
 # It uses a registration approach (comparable to Django’s admin app) to be able to add translations to existing